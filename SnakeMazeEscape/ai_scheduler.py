@@ -0,0 +1,94 @@
+import heapq
+from sim_clock import WALL_CLOCK
+
+class AIScheduler:
+    """Updates a group of enemies each frame within a fixed pathfinding budget.
+
+    Enemies ask for replans through request_path() instead of searching inline.
+    Requests wait in a priority queue (nearest enemies first) and are run for at
+    most BUDGET_SLICES slices of work per frame; an A* search that runs out of
+    budget is paused and resumed on the next frame, so many replans never land in
+    the same frame. Enemies far from the snake are also updated, and replan, less
+    often. The budget counts work rather than time so a replayed tick always
+    finishes the same searches, however fast the machine is.
+    """
+
+    BUDGET_SLICES = 16       # Search slices allowed per frame (about 4 ms of A*)
+    SLICE_EXPANSIONS = 256   # A* expansions per slice; a junction search counts as one slice
+    LOD_DISTANCES = (12, 24) # Cell distance to the snake where the mid and far tiers start
+    LOD_INTERVALS = (1, 2, 4) # Frames between updates for the near, mid and far tiers
+
+    def __init__(self):
+        self.frame = 0
+        self.pending = []    # Heap of (priority, sequence, enemy)
+        self.queued = set()  # ids of enemies waiting in pending or being searched
+        self.sequence = 0
+        self.active = None   # (enemy, search generator, maze generation) being resumed
+        self.searches_completed = 0
+
+    def level_of_detail(self, enemy, snake_x, snake_y, maze):
+        """Return the LOD tier (0 = near) for an enemy from its cell distance to the snake"""
+        distance = (abs(enemy.x - snake_x) + abs(enemy.y - snake_y)) // maze.CELL_SIZE
+        tier = 0
+        while tier < len(self.LOD_DISTANCES) and distance >= self.LOD_DISTANCES[tier]:
+            tier += 1
+        return tier
+
+    def update(self, enemies, snake_x, snake_y, maze, clock=WALL_CLOCK):
+        """Update every enemy at its LOD rate, then spend the frame's search budget"""
+        self.frame += 1
+        for index, enemy in enumerate(enemies):
+            tier = self.level_of_detail(enemy, snake_x, snake_y, maze)
+            enemy.scheduler = self
+            enemy.lod_tier = tier
+            enemy.update_interval = self.LOD_INTERVALS[tier]
+            # Offset by index so a tier's enemies don't all update on the same frame
+            if (self.frame + index) % enemy.update_interval == 0:
+                enemy.update(snake_x, snake_y, maze, clock)
+            else:
+                enemy.update_bullets_only(maze)
+        self.run_searches(snake_x, snake_y, maze)
+
+    def request_path(self, enemy):
+        """Queue a replan toward the snake; ignored while one is already queued"""
+        if id(enemy) in self.queued:
+            return
+        self.queued.add(id(enemy))
+        self.sequence += 1
+        heapq.heappush(self.pending, (getattr(enemy, 'lod_tier', 0), self.sequence, enemy))
+
+    def run_searches(self, snake_x, snake_y, maze):
+        for _ in range(self.BUDGET_SLICES):
+            if self.active is None:
+                if not self.pending:
+                    return
+                enemy = heapq.heappop(self.pending)[2]
+                if enemy.PATHFINDING == 'junction':
+                    # Junction searches are short enough to run in one go
+                    self.deliver(enemy, maze.get_junction_graph().find_path(
+                        int(enemy.x) // maze.CELL_SIZE, int(enemy.y) // maze.CELL_SIZE,
+                        int(snake_x) // maze.CELL_SIZE, int(snake_y) // maze.CELL_SIZE), maze)
+                    continue
+                search = enemy.search_path(snake_x, snake_y, maze, self.SLICE_EXPANSIONS)
+                self.active = (enemy, search, None)
+
+            enemy, search, generation = self.active
+            if generation is not None and generation != maze.search_generation:
+                # Someone else searched since the pause and reused the A* buffers: restart
+                search = enemy.search_path(snake_x, snake_y, maze, self.SLICE_EXPANSIONS)
+            path = next(search)
+            if path is None:
+                self.active = (enemy, search, maze.search_generation)
+            else:
+                self.active = None
+                self.deliver(enemy, path, maze)
+
+    def deliver(self, enemy, path, maze):
+        # The enemy may have moved on while the search ran: skip waypoints it has passed
+        cell = (int(enemy.x) // maze.CELL_SIZE, int(enemy.y) // maze.CELL_SIZE)
+        if cell in path:
+            while path.popleft() != cell:
+                pass
+        enemy.path = path
+        self.queued.discard(id(enemy))
+        self.searches_completed += 1
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from flow_field import FlowField
+from game_state import GameState, NOOP, LEFT, RIGHT, UP, DOWN, SHOOT
+
+DIFFICULTIES = ('easy', 'normal', 'advanced')
+# (GameState mode, profile) each main menu entry starts; 'normal' runs NormalMode, which applies no profile
+MENU_GAMES = {'easy': ('classic', 'easy'), 'normal': ('normal', None), 'advanced': ('classic', 'advanced')}
+STEP_ACTIONS = {(-1, 0): LEFT, (1, 0): RIGHT, (0, -1): UP, (0, 1): DOWN}
+
+class ExitSeeker:
+    """Scripted snake: forages food until the enemies start moving, then follows the
+    shortest route to the exit, firing back at nearby enemies.
+
+    Heading straight for the exit wins before any enemy has left its head start,
+    which would leave enemy pressure out of the balance numbers.
+    """
+
+    SHOOT_RANGE = 160  # Manhattan pixels
+
+    def __init__(self, state):
+        self.route = FlowField(state.maze)  # Its own field, separate from the enemies' one
+
+    def target(self, state, col, row):
+        """The exit once an enemy is chasing (or the food is gone), else the nearest food"""
+        maze = state.maze
+        if (state.enemies and not state.head_start_left()) or not maze.food_cells:
+            return maze.exit_pos
+        return min(maze.food_cells, key=lambda cell: abs(cell[0] - col) + abs(cell[1] - row))
+
+    def action(self, state):
+        snake, cell_size = state.snake, state.maze.CELL_SIZE
+        col, row = int(snake.head_x) // cell_size, int(snake.head_y) // cell_size
+        self.route.set_target(*self.target(state, col, row))
+        next_pos = self.route.next_step(col, row)
+        action = STEP_ACTIONS.get((next_pos[0] - col, next_pos[1] - row), NOOP) if next_pos else NOOP
+        if snake.ammo and any(not enemy.stunned and
+                              abs(enemy.x - snake.head_x) + abs(enemy.y - snake.head_y) < self.SHOOT_RANGE
+                              for enemy in state.enemies):
+            action |= SHOOT
+        return action
+
+def play_match(mode, difficulty, seed, timer_minutes):
+    """Run one seeded match to the end and return its result record.
+
+    mode 'menu' plays the difficulty the way the main menu starts it (MENU_GAMES);
+    'classic' or 'normal' plays that mode with the difficulty's profile applied.
+    """
+    mode, profile = MENU_GAMES[difficulty] if mode == 'menu' else (mode, difficulty)
+    state = GameState(mode, timer_minutes, seed=seed, difficulty=profile)
+    policy = ExitSeeker(state)
+    counts = {}
+    while state.status == 'playing':
+        for event in state.step(policy.action(state)):
+            counts[event] = counts.get(event, 0) + 1
+
+    result = {'difficulty': difficulty, 'mode': mode, 'seed': seed, 'status': state.status,
+              'time_ms': state.clock.now, 'food': counts.get('food', 0), 'shots': counts.get('shoot', 0),
+              'snake_hits': counts.get('snake_hit', 0), 'stuns': counts.get('stun', 0),
+              'before_chase': not state.enemies or state.head_start_left() > 0}
+    if state.status == 'game_over':
+        # Time from the first enemy spawning to the catch (classic enemies catch during their head start too)
+        result['catch_ms'] = state.clock.now - state.enemy_start_time
+    return result
+
+def play_matches(mode, difficulty, seeds, timer_minutes):
+    # One task per chunk of seeds keeps pickling and scheduling cost negligible
+    return [play_match(mode, difficulty, seed, timer_minutes) for seed in seeds]
+
+def median_seconds(values):
+    return f"{statistics.median(values) / 1000:7.1f} s" if values else "      - "
+
+def report(results):
+    print(f"{'difficulty':>12} {'matches':>8} {'win rate':>9} {'exit (median)':>14} "
+          f"{'caught':>7} {'catch (median)':>15} {'time up':>8} {'pre-chase':>10}")
+    for difficulty in DIFFICULTIES:
+        matches = [result for result in results if result['difficulty'] == difficulty]
+        if not matches:
+            continue
+        wins = [result['time_ms'] for result in matches if result['status'] == 'victory']
+        catches = [result['catch_ms'] for result in matches if result['status'] == 'game_over']
+        time_ups = sum(1 for result in matches if result['status'] == 'time_up')
+        # Matches over before any enemy left its head start say nothing about enemy pressure
+        before_chase = sum(1 for result in matches if result['before_chase'])
+        print(f"{difficulty:>12} {len(matches):>8} {len(wins) / len(matches):>9.1%} {median_seconds(wins):>14} "
+              f"{len(catches):>7} {median_seconds(catches):>15} {time_ups:>8} {before_chase:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many seeded matches per difficulty with a scripted snake")
+    parser.add_argument('--matches', type=int, default=1000, help="Matches per difficulty")
+    parser.add_argument('--difficulties', nargs='+', choices=DIFFICULTIES, default=list(DIFFICULTIES))
+    parser.add_argument('--mode', choices=['menu', 'classic', 'normal'], default='menu',
+                        help="'menu' plays each difficulty as the main menu starts it")
+    parser.add_argument('--timer', type=int, default=3, help="Match length in minutes, 0 for no timer")
+    parser.add_argument('--seed', type=int, default=0, help="First seed; every difficulty plays the same seeds")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--chunk', type=int, default=16, help="Matches per worker task")
+    parser.add_argument('--out', default='batch_results.jsonl', help="Per-match results, one JSON object per line")
+    args = parser.parse_args()
+
+    seeds = list(range(args.seed, args.seed + args.matches))
+    print(f"{args.matches} {args.mode} matches per difficulty, {args.workers} workers, seeds from {args.seed}")
+    results = []
+    begin = time.perf_counter()
+    with open(args.out, 'w') as out, ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(play_matches, args.mode, difficulty, seeds[start:start + args.chunk], args.timer)
+                   for difficulty in args.difficulties
+                   for start in range(0, len(seeds), args.chunk)]
+        # Stream each chunk to the file as soon as it finishes
+        for future in as_completed(futures):
+            for result in future.result():
+                out.write(json.dumps(result) + '\n')
+                results.append(result)
+            out.flush()
+    elapsed = time.perf_counter() - begin
+
+    report(results)
+    print(f"{len(results)} matches in {elapsed:.1f} s ({len(results) / elapsed:.1f} matches/s), "
+          f"results in {args.out}")
+
+if __name__ == "__main__":
+    main()
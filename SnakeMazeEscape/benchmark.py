@@ -0,0 +1,531 @@
+import argparse
+import heapq
+import os
+import random
+import time
+from maze import Maze
+from enemy import Enemy, IncrementalPlanner
+from ai_scheduler import AIScheduler
+from bullet_pool import BulletPool
+from broadphase import Broadphase
+from snake import Snake
+from sim_clock import SimClock
+
+MATCH_TICKS = 3 * 60 * SimClock.TICK_RATE  # One 3-minute match, the default run for ticks and env
+
+def random_step(maze, col, row):
+    options = [(col + dx, row + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+               if not maze.is_wall((col + dx) * maze.CELL_SIZE, (row + dy) * maze.CELL_SIZE)]
+    return random.choice(options) if options else (col, row)
+
+def bench_replanning(size, steps, seed):
+    """Full A* replans vs. incremental D* Lite repairs while the snake wanders"""
+    random.seed(seed)
+    maze = Maze(size * 20, size * 20)
+    # Snake wanders near the entrance while the enemy closes in from the exit
+    snake_start = maze.entrance_pos
+    enemy_start = maze.exit_pos
+
+    # Pre-roll the snake's walk so both planners see identical targets
+    snake_walk = [snake_start]
+    for _ in range(steps):
+        snake_walk.append(random_step(maze, *snake_walk[-1]))
+
+    results = {}
+    for name in ('astar', 'incremental'):
+        enemy = Enemy(0, 0)
+        planner = IncrementalPlanner(maze)
+        col, row = enemy_start
+        elapsed = 0.0
+        for step, (snake_col, snake_row) in enumerate(snake_walk):
+            begin = time.perf_counter()
+            if name in ('manhattan', 'landmarks'):
+                enemy.x = col * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                enemy.y = row * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                path = enemy.find_path_to_target(snake_col * maze.CELL_SIZE + maze.CELL_SIZE // 2,
+                                                 snake_row * maze.CELL_SIZE + maze.CELL_SIZE // 2, maze)
+                next_pos = path[0] if path else None
+            else:
+                next_pos = planner.next_step(col, row, snake_col, snake_row)
+            elapsed += time.perf_counter() - begin
+            # Enemy moves every other snake step, as it does in game
+            if next_pos and step % 2:
+                col, row = next_pos
+        results[name] = elapsed
+        extra = f", {planner.expanded} expansions" if name == 'incremental' else ""
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms total, "
+              f"{elapsed * 1000 / len(snake_walk):6.3f} ms per replan{extra}")
+    print(f"{'speedup':>12}: {results['astar'] / results['incremental']:.1f}x")
+
+def reference_find_path(start_col, start_row, target_col, target_row, maze):
+    """The original dict-and-tuple A* from Enemy.find_path_to_target, kept as a baseline"""
+    open_set = [(0, start_col, start_row)]
+    came_from = {}
+    g_score = {(start_col, start_row): 0}
+    
+    while open_set:
+        current_f, current_col, current_row = heapq.heappop(open_set)
+        
+        if current_col == target_col and current_row == target_row:
+            path = []
+            while (current_col, current_row) in came_from:
+                path.append((current_col, current_row))
+                current_col, current_row = came_from[(current_col, current_row)]
+            return path[::-1]
+        
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            neighbor_col, neighbor_row = current_col + dx, current_row + dy
+            
+            if (0 <= neighbor_col < maze.cols and 0 <= neighbor_row < maze.rows and 
+                not maze.grid[neighbor_row][neighbor_col]):
+                
+                tentative_g = g_score[(current_col, current_row)] + 1
+                
+                if (neighbor_col, neighbor_row) not in g_score or tentative_g < g_score[(neighbor_col, neighbor_row)]:
+                    came_from[(neighbor_col, neighbor_row)] = (current_col, current_row)
+                    g_score[(neighbor_col, neighbor_row)] = tentative_g
+                    h = abs(neighbor_col - target_col) + abs(neighbor_row - target_row)
+                    heapq.heappush(open_set, (tentative_g + h, neighbor_col, neighbor_row))
+    
+    return []
+
+def random_open_cell(maze):
+    while True:
+        col = random.randrange(1, maze.cols - 1)
+        row = random.randrange(1, maze.rows - 1)
+        if not maze.grid[row][col]:
+            return col, row
+
+ASTAR_TARGET = 5.0  # Speedup over the dict-based search asked of the flat A*
+
+def bench_astar(size, steps, seed):
+    """Original dict-based A* vs. flat-index A* (Manhattan, then ALT landmarks) over the open-neighbour table.
+
+    The landmark tables are built once per maze; that build is timed on its
+    own and also reported folded into the search time.
+    """
+    random.seed(seed)
+    maze = Maze(size * 20, size * 20)
+    queries = [(random_open_cell(maze), random_open_cell(maze)) for _ in range(steps)]
+    enemy = Enemy(0, 0)
+    maze.search_buffers()  # Allocated on first search; not part of any one search's cost
+
+    results = {}
+    lengths = {}
+    build = 0.0
+    for name in ('reference', 'manhattan', 'landmarks'):
+        if name == 'landmarks':
+            begin = time.perf_counter()
+            maze.get_landmarks()
+            build = time.perf_counter() - begin
+            print(f"{'build':>12}: {build * 1000:8.1f} ms for the landmark tables")
+        enemy.USE_LANDMARKS = name == 'landmarks'
+        begin = time.perf_counter()
+        lengths[name] = []
+        for (start_col, start_row), (target_col, target_row) in queries:
+            if name == 'reference':
+                path = reference_find_path(start_col, start_row, target_col, target_row, maze)
+            else:
+                enemy.x = start_col * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                enemy.y = start_row * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                path = enemy.find_path_to_target(target_col * maze.CELL_SIZE + maze.CELL_SIZE // 2,
+                                                 target_row * maze.CELL_SIZE + maze.CELL_SIZE // 2, maze)
+            lengths[name].append(len(path))
+        results[name] = time.perf_counter() - begin
+        print(f"{name:>12}: {results[name] * 1000:8.1f} ms total, "
+              f"{results[name] * 1000 / len(queries):6.3f} ms per search")
+    assert lengths['reference'] == lengths['manhattan'] == lengths['landmarks'], "path lengths differ"
+
+    speedups = {'manhattan': results['reference'] / results['manhattan'],
+                'landmarks': results['reference'] / results['landmarks'],
+                'landmarks + build': results['reference'] / (results['landmarks'] + build)}
+    for name, speedup in speedups.items():
+        verdict = "meets" if speedup >= ASTAR_TARGET else "misses"
+        print(f"{'speedup':>12}: {speedup:4.1f}x {name} ({verdict} the {ASTAR_TARGET:.0f}x target)")
+
+def bench_junction(size, steps, seed):
+    """Flat cell A* (Manhattan and landmark bounds) vs. the junction graph vs. its region layer"""
+    random.seed(seed)
+    maze = Maze(size * 20, size * 20)
+    queries = [(random_open_cell(maze), random_open_cell(maze)) for _ in range(steps)]
+    enemy = Enemy(0, 0)
+
+    begin = time.perf_counter()
+    graph = maze.get_junction_graph()
+    print(f"{'build':>12}: {(time.perf_counter() - begin) * 1000:8.1f} ms, "
+          f"{len(graph.node_cells)} nodes, {len(graph.edge_nodes)} edges, "
+          f"region layer {'on' if graph.hierarchy else 'off'}")
+    hierarchy = graph.hierarchy
+    graph.hierarchy = None  # Exact junction search first
+
+    results = {}
+    lengths = {}
+    for name in ('manhattan', 'landmarks', 'junction', 'hierarchical'):
+        enemy.USE_LANDMARKS = name == 'landmarks'
+        if name == 'hierarchical':
+            if not hierarchy:
+                break
+            graph.hierarchy = hierarchy
+        elapsed = 0.0
+        expanded = 0
+        lengths[name] = []
+        for (start_col, start_row), (target_col, target_row) in queries:
+            graph.expanded = 0
+            if hierarchy:
+                hierarchy.expanded = 0
+            begin = time.perf_counter()
+            if name in ('manhattan', 'landmarks'):
+                enemy.x = start_col * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                enemy.y = start_row * maze.CELL_SIZE + maze.CELL_SIZE // 2
+                path = enemy.find_path_to_target(target_col * maze.CELL_SIZE + maze.CELL_SIZE // 2,
+                                                 target_row * maze.CELL_SIZE + maze.CELL_SIZE // 2, maze)
+            else:
+                path = graph.find_path(start_col, start_row, target_col, target_row)
+            elapsed += time.perf_counter() - begin
+            if name in ('manhattan', 'landmarks'):
+                expanded += maze.search_closed.count(maze.search_generation)
+            else:
+                expanded += graph.expanded + (hierarchy.expanded if name == 'hierarchical' else 0)
+            lengths[name].append(len(path))
+        results[name] = elapsed
+        stretch = sum(lengths[name]) / max(1, sum(lengths['manhattan']))
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms total, {elapsed * 1000 / len(queries):7.3f} ms per search, "
+              f"{expanded // len(queries):7d} nodes expanded, path length x{stretch:.3f}")
+    assert lengths['manhattan'] == lengths['landmarks'] == lengths['junction'], "junction paths are not shortest paths"
+    for name in ('junction', 'hierarchical'):
+        if name in results:
+            print(f"{name + ' speedup':>24}: {results['manhattan'] / results[name]:.1f}x over Manhattan A*, "
+                  f"{results['landmarks'] / results[name]:.1f}x over landmark A* (the enemies' default)")
+
+def bench_landmarks(size, steps, seed):
+    """Flat A* with the Manhattan heuristic vs. the ALT landmark bound"""
+    random.seed(seed)
+    maze = Maze(size * 20, size * 20)
+    queries = [(random_open_cell(maze), random_open_cell(maze)) for _ in range(steps)]
+    enemy = Enemy(0, 0)
+
+    begin = time.perf_counter()
+    landmarks = maze.get_landmarks()
+    print(f"{'build':>12}: {(time.perf_counter() - begin) * 1000:8.1f} ms, "
+          f"{len(landmarks.cells)} landmarks, '{landmarks.typecode}' arrays")
+
+    results = {}
+    lengths = {}
+    for name in ('manhattan', 'landmarks'):
+        enemy.USE_LANDMARKS = name == 'landmarks'
+        elapsed = 0.0
+        expanded = 0
+        lengths[name] = []
+        for (start_col, start_row), (target_col, target_row) in queries:
+            enemy.x = start_col * maze.CELL_SIZE + maze.CELL_SIZE // 2
+            enemy.y = start_row * maze.CELL_SIZE + maze.CELL_SIZE // 2
+            begin = time.perf_counter()
+            path = enemy.find_path_to_target(target_col * maze.CELL_SIZE + maze.CELL_SIZE // 2,
+                                             target_row * maze.CELL_SIZE + maze.CELL_SIZE // 2, maze)
+            elapsed += time.perf_counter() - begin
+            expanded += maze.search_closed.count(maze.search_generation)
+            lengths[name].append(len(path))
+        results[name] = elapsed
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms total, {elapsed * 1000 / len(queries):7.3f} ms per search, "
+              f"{expanded // len(queries):7d} nodes expanded")
+    assert lengths['manhattan'] == lengths['landmarks'], "path lengths differ"
+    print(f"{'speedup':>12}: {results['manhattan'] / results['landmarks']:.1f}x")
+
+def bench_enemies(enemy_count, frames, seed):
+    """Per-frame AI cost of many A* enemies updated directly vs. through the AIScheduler"""
+    frame_time = 1 / 60
+
+    results = {}
+    for name in ('direct', 'scheduled'):
+        random.seed(seed)
+        maze = Maze(800, 600)  # Enemies are clamped to the 800x600 play area
+        enemies = []
+        for _ in range(enemy_count):
+            col, row = random_open_cell(maze)
+            enemy = Enemy(col * maze.CELL_SIZE + maze.CELL_SIZE // 2, row * maze.CELL_SIZE + maze.CELL_SIZE // 2)
+            enemy.PATHFINDING = 'astar'
+            enemy.SHOOT_DELAY = float('inf')  # Measure pathing and movement only
+            enemies.append(enemy)
+        scheduler = AIScheduler()
+        clock = SimClock()  # Replan and move timers see game time without pacing the loop
+        snake_col, snake_row = maze.entrance_pos
+
+        costs = []
+        for frame in range(frames):
+            if frame % 8 == 0:
+                snake_col, snake_row = random_step(maze, snake_col, snake_row)
+            snake_x = snake_col * maze.CELL_SIZE + maze.CELL_SIZE // 2
+            snake_y = snake_row * maze.CELL_SIZE + maze.CELL_SIZE // 2
+            begin = time.perf_counter()
+            if name == 'direct':
+                for enemy in enemies:
+                    enemy.update(snake_x, snake_y, maze, clock)
+            else:
+                scheduler.update(enemies, snake_x, snake_y, maze, clock)
+            cost = time.perf_counter() - begin
+            costs.append(cost)
+            clock.advance()
+        costs.sort()
+        results[name] = costs
+        over = sum(1 for cost in costs if cost > frame_time)
+        print(f"{name:>12}: {sum(costs) * 1000 / frames:6.2f} ms mean, "
+              f"{costs[int(frames * 0.99) - 1] * 1000:6.2f} ms p99, {costs[-1] * 1000:6.2f} ms worst, "
+              f"{over} of {frames} frames over {frame_time * 1000:.1f} ms")
+    print(f"{'worst frame':>12}: {results['direct'][-1] / results['scheduled'][-1]:.1f}x lower")
+
+def bench_bullets(bullet_count, frames, seed, speed=1.0):
+    """Per-bullet dicts in a list vs. the struct-of-arrays BulletPool, refilled as bullets die.
+
+    The dict loop only tests each bullet's new point, so at higher speeds it lets
+    bullets tunnel through walls; the pool sweeps every step. Tunnelled steps are
+    counted (outside the timing) to show the difference.
+    """
+    random.seed(seed)
+    maze = Maze(800, 600)
+    spawns = []
+    for _ in range(bullet_count * 4):
+        col, row = random_open_cell(maze)
+        speed_x, speed_y = random.choice([(6, 0), (-6, 0), (0, 6), (0, -6), (2.8, 2.8), (-2.8, 2.8)])
+        spawns.append((col * maze.CELL_SIZE + 10, row * maze.CELL_SIZE + 10, speed_x * speed, speed_y * speed))
+
+    results = {}
+    for name in ('dicts', 'pool'):
+        bullets = [] if name == 'dicts' else BulletPool()
+        next_spawn = 0
+        tunnelled = 0
+        elapsed = 0.0
+        for _ in range(frames):
+            if name == 'dicts':
+                tunnelled += sum(1 for bullet in bullets
+                                 if maze.sweep(bullet['x'], bullet['y'], bullet['dx'], bullet['dy']) is not None and
+                                 not maze.is_wall(bullet['x'] + bullet['dx'], bullet['y'] + bullet['dy']))
+            begin = time.perf_counter()
+            # Top the population back up, as a busy firefight would
+            while len(bullets) < bullet_count:
+                x, y, dx, dy = spawns[next_spawn % len(spawns)]
+                next_spawn += 1
+                if name == 'dicts':
+                    bullets.append({'x': x, 'y': y, 'dx': dx, 'dy': dy})
+                else:
+                    bullets.spawn(x, y, dx, dy)
+            if name == 'dicts':
+                # The loop Snake.update and Enemy.update used to run
+                for bullet in bullets[:]:
+                    bullet['x'] += bullet['dx']
+                    bullet['y'] += bullet['dy']
+                    if (maze.is_wall(bullet['x'], bullet['y']) or
+                        bullet['x'] < 0 or bullet['x'] > 800 or
+                        bullet['y'] < 0 or bullet['y'] > 600):
+                        bullets.remove(bullet)
+            else:
+                bullets.update(maze)
+            elapsed += time.perf_counter() - begin
+        results[name] = elapsed
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms total, {elapsed * 1000 / frames:6.3f} ms per frame, "
+              f"{next_spawn} bullets spawned, {tunnelled} wall tunnelling steps")
+    print(f"{'speedup':>12}: {results['dicts'] / results['pool']:.1f}x")
+
+def bench_collisions(enemy_count, bullet_count, frames, seed):
+    """Every-bullet-vs-every-enemy distance loops vs. the uniform-grid Broadphase"""
+    random.seed(seed)
+    enemies = [Enemy(random.uniform(0, 800), random.uniform(0, 600)) for _ in range(enemy_count)]
+    snake_bullets = BulletPool()
+    for _ in range(bullet_count):
+        snake_bullets.spawn(random.uniform(0, 800), random.uniform(0, 600), 0, 0)
+    grid = Broadphase()
+
+    results = {}
+    hits = {}
+    for name in ('nested', 'broadphase'):
+        hits[name] = 0
+        begin = time.perf_counter()
+        for _ in range(frames):
+            if name == 'nested':
+                # The shape of the old game loops: each enemy scans every bullet
+                x, y = snake_bullets.x, snake_bullets.y
+                for enemy in enemies:
+                    for slot in snake_bullets.live_slots():
+                        if ((x[slot] - enemy.x)**2 + (y[slot] - enemy.y)**2)**0.5 < 15:
+                            hits[name] += 1
+            else:
+                grid.clear()
+                for enemy in enemies:
+                    grid.insert('enemy', enemy, enemy.x, enemy.y)
+                grid.insert_bullets('snake_bullet', snake_bullets)
+                for enemy in enemies:
+                    hits[name] += len(grid.query('snake_bullet', enemy.x, enemy.y, 15))
+        results[name] = time.perf_counter() - begin
+        print(f"{name:>12}: {results[name] * 1000:8.1f} ms total, "
+              f"{results[name] * 1000 / frames:7.3f} ms per frame, {hits[name] // frames} hits per frame")
+    assert hits['nested'] == hits['broadphase'], "broadphase missed or invented hits"
+    print(f"{'speedup':>12}: {results['nested'] / results['broadphase']:.1f}x")
+
+def bench_snake(length, steps, seed):
+    """List body with insert(0)/pop and linear scans vs. the deque body with an occupancy map"""
+    random.seed(seed)
+    # A long snake laid out in a serpentine over a large open field
+    width = 200
+    segments = [((index % width if (index // width) % 2 == 0 else width - 1 - index % width) * 20 + 10,
+                 (index // width) * 20 + 10) for index in range(length)]
+    probes = [(random.randrange(width) * 20 + 10, random.randrange(length // width + 1) * 20 + 10)
+              for _ in range(steps)]
+
+    results = {}
+    answers = {}
+    for name in ('list', 'deque'):
+        snake = Snake(*segments[0])
+        if name == 'list':
+            body = list(segments)
+        else:
+            snake.body.clear()
+            snake.occupied.clear()
+            for x, y in segments:
+                snake.body.append((x, y))
+                snake.occupy(x, y, 1)
+        answers[name] = []
+        begin = time.perf_counter()
+        for step, (probe_x, probe_y) in enumerate(probes):
+            # Move the head one cell further down, then ask whether a cell is occupied
+            head_x, head_y = (body[0] if name == 'list' else snake.body[0])
+            new_head = (head_x, head_y + 20)
+            if name == 'list':
+                body.insert(0, new_head)
+                body.pop()
+                answers[name].append((probe_x, probe_y) in body)
+            else:
+                snake.advance(*new_head)
+                answers[name].append(snake.occupies(probe_x, probe_y))
+            if step % 64 == 0:
+                if name == 'list':
+                    body.append(body[-1])
+                else:
+                    snake.grow()
+        results[name] = time.perf_counter() - begin
+        print(f"{name:>12}: {results[name] * 1000:8.1f} ms total, "
+              f"{results[name] * 1e6 / steps:8.2f} us per move + occupancy query")
+    assert answers['list'] == answers['deque'], "occupancy answers differ"
+    print(f"{'speedup':>12}: {results['list'] / results['deque']:.1f}x")
+
+def bench_ticks(ticks, seed):
+    """GameState stepped headless vs. stepped and drawn through the pygame front end.
+
+    The snake turns at random every half second; matches that end (caught,
+    timed out or escaped) are restarted so every tick does real work. The
+    default run is a whole match, so the enemy AI's share of it is counted.
+    """
+    from game_state import GameState, LEFT, DOWN
+
+    results = {}
+    for name in ('headless', 'rendered'):
+        if name == 'rendered':
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            import pygame
+            from frontend import Renderer
+            pygame.init()
+            screen = pygame.display.set_mode((800, 600))
+            renderer = Renderer()
+        policy = random.Random(seed)
+        state = None
+        games = 0
+        action = LEFT
+        begin = time.perf_counter()
+        for tick in range(ticks):
+            if state is None or state.status != 'playing':
+                state = GameState('normal', 3, seed=seed + games)
+                games += 1
+            if tick % 30 == 0:
+                action = policy.randint(LEFT, DOWN)
+            state.step(action)
+            if name == 'rendered':
+                renderer.draw_maze(screen, state.maze)
+                renderer.draw_snake(screen, state.snake)
+                for enemy in state.enemies:
+                    renderer.draw_enemy(screen, enemy)
+        results[name] = time.perf_counter() - begin
+        print(f"{name:>12}: {ticks / results[name]:8.0f} ticks/s, "
+              f"{results[name] * 1000 * MATCH_TICKS / ticks:8.1f} ms per 3-minute match, {games} games")
+    print(f"{'speedup':>12}: {results['rendered'] / results['headless']:.1f}x")
+
+def bench_env(steps, seed, num_envs=16):
+    """Env-steps per second for one SnakeEnv and for a VectorSnakeEnv batch, random actions.
+
+    Every env first plays untimed until its first enemy has spawned and served
+    its head start, so the timed steps include enemy AI.
+    """
+    from game_state import GameState
+    from snake_env import SnakeEnv, VectorSnakeEnv, ACTIONS
+    policy = random.Random(seed)
+    warmup = (GameState.ENEMY_SPAWN_DELAY + GameState.ENEMY_HEAD_START) * SimClock.TICK_RATE // 1000 + 1
+
+    env = SnakeEnv(seed=seed)
+    env.reset()
+    for _ in range(warmup):
+        env.step(policy.choice(ACTIONS))
+    begin = time.perf_counter()
+    for _ in range(steps):
+        observation, reward, done, info = env.step(policy.choice(ACTIONS))
+        if done:
+            env.reset(env.seed + 1)
+    elapsed = time.perf_counter() - begin
+    print(f"{'single':>12}: {steps / elapsed:8.0f} env-steps/s")
+
+    vector = VectorSnakeEnv(num_envs, seed=seed)
+    vector.reset()
+    for _ in range(warmup):
+        vector.step([policy.choice(ACTIONS) for _ in range(num_envs)])
+    batches = max(1, steps // num_envs)
+    begin = time.perf_counter()
+    for _ in range(batches):
+        vector.step([policy.choice(ACTIONS) for _ in range(num_envs)])
+    elapsed = time.perf_counter() - begin
+    print(f"{f'vector x{num_envs}':>12}: {batches * num_envs / elapsed:8.0f} env-steps/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="SnakeMazeEscape performance benchmarks")
+    parser.add_argument('benchmark', choices=['replanning', 'astar', 'junction', 'landmarks', 'enemies', 'bullets', 'collisions', 'snake', 'ticks', 'env'])
+    parser.add_argument('--size', type=int, default=201, help="Maze size in cells")
+    parser.add_argument('--steps', type=int, help="Snake moves or searches to run (default 300, a whole match for ticks and env)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--enemies', type=int, default=120, help="Enemy count for the enemies benchmark")
+    parser.add_argument('--bullets', type=int, default=3000, help="Live bullets for the bullets benchmark")
+    parser.add_argument('--length', type=int, default=10000, help="Snake segments for the snake benchmark")
+    parser.add_argument('--bullet-speed', type=float, default=1.0, help="Bullet speed multiplier for the bullets benchmark")
+    args = parser.parse_args()
+    if args.steps is None:
+        args.steps = MATCH_TICKS if args.benchmark in ('ticks', 'env') else 300
+
+    if args.benchmark == 'enemies':
+        print(f"{args.enemies} enemies, {args.steps} frames, seed {args.seed}")
+    elif args.benchmark == 'bullets':
+        print(f"{args.bullets} bullets, {args.steps} frames, seed {args.seed}")
+    elif args.benchmark == 'snake':
+        print(f"{args.length} segments, {args.steps} moves, seed {args.seed}")
+    elif args.benchmark in ('ticks', 'env'):
+        print(f"{args.steps} ticks, seed {args.seed}")
+    elif args.benchmark == 'collisions':
+        print(f"{args.enemies} enemies, {args.bullets} bullets, {args.steps} frames, seed {args.seed}")
+    else:
+        print(f"Maze {args.size}x{args.size}, {args.steps} steps, seed {args.seed}")
+    if args.benchmark == 'replanning':
+        bench_replanning(args.size, args.steps, args.seed)
+    elif args.benchmark == 'astar':
+        bench_astar(args.size, args.steps, args.seed)
+    elif args.benchmark == 'junction':
+        bench_junction(args.size, args.steps, args.seed)
+    elif args.benchmark == 'landmarks':
+        bench_landmarks(args.size, args.steps, args.seed)
+    elif args.benchmark == 'enemies':
+        bench_enemies(args.enemies, args.steps, args.seed)
+    elif args.benchmark == 'bullets':
+        bench_bullets(args.bullets, args.steps, args.seed, args.bullet_speed)
+    elif args.benchmark == 'collisions':
+        bench_collisions(args.enemies, args.bullets, args.steps, args.seed)
+    elif args.benchmark == 'snake':
+        bench_snake(args.length, args.steps, args.seed)
+    elif args.benchmark == 'ticks':
+        bench_ticks(args.steps, args.seed)
+    elif args.benchmark == 'env':
+        bench_env(args.steps, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+class Broadphase:
+    """Uniform grid that bins collidable points into buckets once per tick.
+
+    Everything that can collide (snake head, enemies, bullets, power-ups) is
+    inserted under a kind, and queries only look at the buckets their shape
+    overlaps. Collision cost then grows with the number of nearby objects
+    instead of with every bullet times every entity.
+    """
+
+    CELL_SIZE = 40  # Bucket size in pixels, about the largest collision reach
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size or self.CELL_SIZE
+        self.buckets = {}  # kind -> {(bucket_x, bucket_y): [(key, x, y)]}
+
+    def clear(self):
+        self.buckets = {}
+
+    def insert(self, kind, key, x, y):
+        size = self.cell_size
+        bucket = (int(x // size), int(y // size))
+        kind_buckets = self.buckets.get(kind)
+        if kind_buckets is None:
+            kind_buckets = self.buckets[kind] = {}
+        entries = kind_buckets.get(bucket)
+        if entries is None:
+            kind_buckets[bucket] = [(key, x, y)]
+        else:
+            entries.append((key, x, y))
+
+    def insert_bullets(self, kind, pool):
+        """Bin every live bullet of a BulletPool under the key (pool, slot)"""
+        x, y = pool.x, pool.y
+        for slot in pool.live_slots():
+            self.insert(kind, (pool, slot), x[slot], y[slot])
+
+    def candidates(self, kind, left, top, right, bottom):
+        """Entries of one kind in every bucket the box overlaps"""
+        kind_buckets = self.buckets.get(kind)
+        if not kind_buckets:
+            return []
+        size = self.cell_size
+        first_x, last_x = int(left // size), int(right // size)
+        first_y, last_y = int(top // size), int(bottom // size)
+        found = []
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(kind_buckets):
+            # Box covers more buckets than this kind occupies: scan the occupied ones
+            for (bucket_x, bucket_y), entries in kind_buckets.items():
+                if first_x <= bucket_x <= last_x and first_y <= bucket_y <= last_y:
+                    found.extend(entries)
+            return found
+        for bucket_y in range(first_y, last_y + 1):
+            for bucket_x in range(first_x, last_x + 1):
+                entries = kind_buckets.get((bucket_x, bucket_y))
+                if entries:
+                    found.extend(entries)
+        return found
+
+    def query(self, kind, x, y, radius):
+        """Keys of one kind closer than radius to (x, y)"""
+        limit = radius * radius
+        return [key for key, key_x, key_y in self.candidates(kind, x - radius, y - radius, x + radius, y + radius)
+                if (key_x - x) ** 2 + (key_y - y) ** 2 < limit]
+
+    def query_box(self, kind, x, y, half_width, half_height):
+        """Keys of one kind strictly inside the box centred on (x, y)"""
+        return [key for key, key_x, key_y in
+                self.candidates(kind, x - half_width, y - half_height, x + half_width, y + half_height)
+                if abs(key_x - x) < half_width and abs(key_y - y) < half_height]
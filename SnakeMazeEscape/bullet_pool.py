@@ -0,0 +1,129 @@
+from array import array
+
+OWNER_SNAKE = 0
+OWNER_ENEMY = 1
+INFINITY = float('inf')
+
+class BulletPool:
+    """Bullets stored as parallel arrays (struct of arrays) with a free list of slots.
+
+    Spawning reuses a dead slot instead of allocating a dict, killing a bullet just
+    clears its alive flag and pushes the slot on the free list, and update() moves,
+    bounds-culls and wall-tests every bullet in a single pass over the columns.
+    The columns only grow (doubling) when every slot is in use.
+
+    Bullets fly in straight lines, so each one's flight is swept through the maze
+    once (Maze.sweep) when it is first updated, giving the exact number of steps
+    until it enters a wall. Per-frame work is then a countdown, and fast bullets
+    cannot tunnel through walls. Flights are retraced if the maze's walls change.
+    """
+
+    def __init__(self, capacity=64, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.x = array('d', [0.0]) * capacity
+        self.y = array('d', [0.0]) * capacity
+        self.dx = array('d', [0.0]) * capacity
+        self.dy = array('d', [0.0]) * capacity
+        self.owner = array('b', [0]) * capacity
+        self.steps_left = array('d', [-1.0]) * capacity  # Steps until impact, -1 = not traced yet
+        self.alive = bytearray(capacity)
+        self.free = list(range(capacity - 1, -1, -1))  # Lowest slots handed out first
+        self.high = 0   # One past the highest slot ever used; passes stop here
+        self.count = 0  # Live bullets
+        self.maze = None       # Maze the flights were traced against
+        self.edits_seen = 0
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        capacity = len(self.alive)
+        for column in (self.x, self.y, self.dx, self.dy, self.owner, self.steps_left):
+            column.extend(array(column.typecode, [0]) * capacity)
+        self.alive.extend(bytearray(capacity))
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def spawn(self, x, y, dx, dy, owner=OWNER_SNAKE):
+        """Add a bullet and return its slot"""
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.owner[slot] = owner
+        self.steps_left[slot] = -1.0
+        self.alive[slot] = 1
+        self.count += 1
+        if slot >= self.high:
+            self.high = slot + 1
+        return slot
+
+    def kill(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = 0
+            self.free.append(slot)
+            self.count -= 1
+
+    def clear(self):
+        for slot in self.live_slots():
+            self.kill(slot)
+
+    def live_slots(self):
+        """Snapshot of live slots, safe to kill from while iterating"""
+        alive = self.alive
+        return [slot for slot in range(self.high) if alive[slot]]
+
+    def trace(self, slot, maze):
+        """Steps until this bullet's straight flight enters a wall or leaves the world"""
+        x, y, dx, dy = self.x[slot], self.y[slot], self.dx[slot], self.dy[slot]
+        speed = max(abs(dx), abs(dy))
+        if not speed:
+            return 0.0 if maze and maze.is_wall(x, y) else INFINITY
+        # World edges (the old per-step bounds test): the maze's, or the pool's own without one
+        width, height = (maze.width, maze.height) if maze else (self.width, self.height)
+        steps = INFINITY
+        if dx:
+            steps = min(steps, ((width if dx > 0 else 0) - x) / dx)
+        if dy:
+            steps = min(steps, ((height if dy > 0 else 0) - y) / dy)
+        if maze:
+            # One swept ray over the whole flight; it always leaves the grid eventually
+            reach = (maze.cols + maze.rows + 2) * maze.CELL_SIZE / speed
+            hit = maze.sweep(x, y, dx * reach, dy * reach)
+            if hit is not None:
+                steps = min(steps, hit * reach)
+        return max(steps, 0.0)
+
+    def update(self, maze=None):
+        """Move every bullet one step and kill those off screen or inside a wall"""
+        if not self.count:
+            return
+        x, y, dx, dy, alive, steps_left = self.x, self.y, self.dx, self.dy, self.alive, self.steps_left
+        if maze is not self.maze or (maze and self.edits_seen != len(maze.cell_edits)):
+            # Walls changed since the flights were traced: retrace every bullet
+            self.maze = maze
+            self.edits_seen = len(maze.cell_edits) if maze else 0
+            for slot in range(self.high):
+                steps_left[slot] = -1.0
+        for slot in range(self.high):
+            if not alive[slot]:
+                continue
+            left = steps_left[slot]
+            if left < 0:
+                left = self.trace(slot, maze)
+            if left <= 1.0:
+                # Stop at the exact point the bullet enters the wall (or screen edge)
+                x[slot] += left * dx[slot]
+                y[slot] += left * dy[slot]
+                self.kill(slot)
+            else:
+                x[slot] += dx[slot]
+                y[slot] += dy[slot]
+                steps_left[slot] = left - 1.0
+
+        # Trim the pass range back past trailing dead slots
+        while self.high and not alive[self.high - 1]:
+            self.high -= 1
@@ -1,6 +1,8 @@
 # Advanced Difficulty Configuration
 DIFFICULTY_NAME = "Advanced"
 
+# Speeds are milliseconds per move: higher is slower
+
 # Snake Settings
 SNAKE_SPEED = 100  # Faster movement
 SNAKE_START_AMMO = 0  # No starting ammo
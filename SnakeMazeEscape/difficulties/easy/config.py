@@ -1,13 +1,15 @@
 # Easy Difficulty Configuration
 DIFFICULTY_NAME = "Easy"
 
+# Speeds are milliseconds per move: higher is slower
+
 # Snake Settings
 SNAKE_SPEED = 200  # Slower movement
 SNAKE_START_AMMO = 5  # Start with ammo
 
 # Enemy Settings
 ENEMY_HEALTH = 2  # Less health
-ENEMY_SPEED = 60  # Slower enemy
+ENEMY_SPEED = 100  # Slower enemy
 ENEMY_HEAD_START = 15000  # 15 seconds head start
 ENEMY_SHOOT_DELAY = 3000  # Shoots less frequently
 
@@ -1,6 +1,8 @@
 # Normal Difficulty Configuration (Current Base Game)
 DIFFICULTY_NAME = "Normal"
 
+# Speeds are milliseconds per move: higher is slower
+
 # Snake Settings
 SNAKE_SPEED = 150  # Current speed
 SNAKE_START_AMMO = 0  # No starting ammo
@@ -1,12 +1,14 @@
-import pygame
 import math
 import heapq
+from collections import deque
+from bullet_pool import BulletPool, OWNER_ENEMY
+from sim_clock import WALL_CLOCK
 
 class Enemy:
-    def __init__(self, x, y, sound_manager=None):
+    def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.sound_manager = sound_manager
+        self.events = []  # Names of things that happened ('enemy_hit', 'stun'), drained by the owner
         self.SIZE = 12
         self.SPEED = 2.0
         self.RED_COLOR = (255, 0, 0)
@@ -18,21 +20,36 @@ class Enemy:
         self.stun_timer = 0
         self.STUN_DURATION = 10000  # 10 seconds
         
-        self.bullets = []
+        self.bullets = BulletPool()
         self.shoot_timer = 0
         self.SHOOT_DELAY = 1500
         
-        # A* pathfinding
-        self.path = []
+        # Pathfinding - next waypoint from the maze's shared flow field,
+        # a per-enemy incremental D* Lite planner ('incremental'),
+        # or a full replan every PATH_UPDATE_DELAY ms with A* ('astar')
+        # or the maze's corridor-contracted junction graph ('junction')
+        self.path = deque()
+        self.PATHFINDING = 'flow_field'
+        self.planner = None
         self.path_timer = 0
-        self.PATH_UPDATE_DELAY = 500  # Update path every 0.5 seconds
+        self.PATH_UPDATE_DELAY = 500
+        self.USE_LANDMARKS = True  # A* uses the maze's ALT landmark bound instead of Manhattan
+        
+        # Set by an AIScheduler: replans go through its per-frame budget, and far
+        # enemies (higher lod_tier) are updated every update_interval frames
+        self.scheduler = None
+        self.lod_tier = 0
+        self.update_interval = 1
         
         # Movement
         self.move_timer = 0
         self.MOVE_DELAY = 80
+        self.prev_x = x  # Position before the last tick, for render interpolation
+        self.prev_y = y
         
-    def update(self, snake_x=None, snake_y=None, maze=None):
-        current_time = pygame.time.get_ticks()
+    def update(self, snake_x=None, snake_y=None, maze=None, clock=WALL_CLOCK):
+        current_time = clock.now
+        self.prev_x, self.prev_y = self.x, self.y
         
         # Handle stun
         if self.stunned:
@@ -42,13 +59,37 @@ class Enemy:
             else:
                 return  # Don't move or shoot while stunned
         
-        # Update path using A*
-        if snake_x and snake_y and maze and current_time - self.path_timer > self.PATH_UPDATE_DELAY:
-            self.path = self.find_path_to_target(snake_x, snake_y, maze)
-            self.path_timer = current_time
+        # The snake's cell is the pathfinding target
+        target_cell = None
+        if snake_x and snake_y and maze:
+            target_cell = (int(snake_x) // maze.CELL_SIZE, int(snake_y) // maze.CELL_SIZE)
+            if self.PATHFINDING == 'flow_field':
+                # Point the shared flow field at the snake (rebuilt only when it changes cell)
+                maze.flow_field.set_target(*target_cell)
+            elif (self.PATHFINDING in ('astar', 'junction') and
+                  current_time - self.path_timer > self.PATH_UPDATE_DELAY * self.update_interval):
+                if self.scheduler:
+                    self.scheduler.request_path(self)
+                elif self.PATHFINDING == 'junction':
+                    self.path = maze.get_junction_graph().find_path(
+                        int(self.x) // maze.CELL_SIZE, int(self.y) // maze.CELL_SIZE, *target_cell)
+                else:
+                    self.path = self.find_path_to_target(snake_x, snake_y, maze)
+                self.path_timer = current_time
         
-        # Move along path using A*
+        # Move along the planned route one waypoint at a time
         if current_time - self.move_timer > self.MOVE_DELAY:
+            if not self.path and target_cell and self.PATHFINDING in ('flow_field', 'incremental'):
+                col, row = int(self.x) // maze.CELL_SIZE, int(self.y) // maze.CELL_SIZE
+                if self.PATHFINDING == 'incremental':
+                    if self.planner is None or self.planner.maze is not maze:
+                        self.planner = IncrementalPlanner(maze)
+                    next_pos = self.planner.next_step(col, row, *target_cell)
+                else:
+                    next_pos = maze.flow_field.next_step(col, row)
+                if next_pos:
+                    self.path.append(next_pos)
+            
             if self.path:
                 next_pos = self.path[0]
                 target_x, target_y = next_pos[0] * maze.CELL_SIZE + maze.CELL_SIZE // 2, next_pos[1] * maze.CELL_SIZE + maze.CELL_SIZE // 2
@@ -58,7 +99,7 @@ class Enemy:
                 dy = target_y - self.y
                 
                 if abs(dx) < 5 and abs(dy) < 5:  # Reached waypoint
-                    self.path.pop(0)
+                    self.path.popleft()
                 else:
                     # Move towards target
                     if abs(dx) > abs(dy):
@@ -69,8 +110,9 @@ class Enemy:
             self.move_timer = current_time
                 
         # Keep enemy in bounds
-        self.x = max(self.SIZE, min(800 - self.SIZE, self.x))
-        self.y = max(self.SIZE, min(600 - self.SIZE, self.y))
+        width, height = (maze.width, maze.height) if maze else (800, 600)
+        self.x = max(self.SIZE, min(width - self.SIZE, self.x))
+        self.y = max(self.SIZE, min(height - self.SIZE, self.y))
         
         # Shooting
         if not self.stunned and current_time - self.shoot_timer > self.SHOOT_DELAY:
@@ -79,14 +121,7 @@ class Enemy:
             self.shoot_timer = current_time
             
         # Update bullets
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            
-            if (bullet['x'] < 0 or bullet['x'] > 800 or 
-                bullet['y'] < 0 or bullet['y'] > 600 or
-                (maze and maze.is_wall(bullet['x'], bullet['y']))):
-                self.bullets.remove(bullet)
+        self.bullets.update(maze)
                 
     def shoot_at_target(self, target_x, target_y):
         dx = target_x - self.x
@@ -94,114 +129,291 @@ class Enemy:
         distance = math.sqrt(dx*dx + dy*dy)
         
         if distance > 0:
-            bullet = {
-                'x': self.x,
-                'y': self.y,
-                'dx': (dx / distance) * 4,
-                'dy': (dy / distance) * 4
-            }
-            self.bullets.append(bullet)
+            self.bullets.spawn(self.x, self.y, (dx / distance) * 4, (dy / distance) * 4, OWNER_ENEMY)
             
-    def take_damage(self):
+    def take_damage(self, clock=WALL_CLOCK):
         if not self.stunned:
             self.health -= 1
-            if self.sound_manager:
-                self.sound_manager.play('hit')
-            print(f"Enemy hit! Health: {self.health}/{self.MAX_HEALTH}")
+            self.events.append('enemy_hit')
             if self.health <= 0:
                 self.stunned = True
-                self.stun_timer = pygame.time.get_ticks()
-                if self.sound_manager:
-                    self.sound_manager.play('stun')
-                print("Enemy stunned for 10 seconds!")
+                self.stun_timer = clock.now
+                self.events.append('stun')
                 return True
         return False
     
     def find_path_to_target(self, target_x, target_y, maze):
-        # Convert positions to grid coordinates
+        # Run the search to completion; its only yield is the finished path
+        for path in self.search_path(target_x, target_y, maze):
+            pass
+        return path
+    
+    def search_path(self, target_x, target_y, maze, slice_size=0):
+        """A* from this enemy's cell toward (target_x, target_y), as a resumable generator.
+        
+        Yields None after every slice_size expansions (never if slice_size is 0) so
+        the AI scheduler can spread one search over several frames, then yields the
+        finished path as a deque of (col, row), empty if there is none.
+        """
+        # Convert positions to flat cell ids
+        cols = maze.cols
         start_col = int(self.x) // maze.CELL_SIZE
         start_row = int(self.y) // maze.CELL_SIZE
         target_col = int(target_x) // maze.CELL_SIZE
         target_row = int(target_y) // maze.CELL_SIZE
+        if not (0 <= start_col < cols and 0 <= start_row < maze.rows and
+                0 <= target_col < cols and 0 <= target_row < maze.rows):
+            yield deque()
+            return
+        start = start_row * cols + start_col
+        target = target_row * cols + target_col
         
-        # A* pathfinding
-        open_set = [(0, start_col, start_row)]
-        came_from = {}
-        g_score = {(start_col, start_row): 0}
+        # A* over the maze's open-neighbour table with shared, generation-stamped buffers.
+        # With unit steps and a Manhattan or landmark heuristic a move keeps f or raises
+        # it by 2 (the maze grid is bipartite, so h changes by exactly 1 per step),
+        # so the open set is a bucket queue indexed by (f - f_start) // 2 instead of a heap.
+        # The landmark bound is only ±1 per step between open cells, so an enemy
+        # standing in a wall (or a target no landmark reaches) falls back to Manhattan
+        heuristic = None
+        if self.USE_LANDMARKS and not maze.cells[start]:
+            heuristic = maze.get_landmarks().heuristic_to(target)
+        g_score, came_from, stamp, closed, generation = maze.search_buffers()
+        open_directions, neighbor_steps = maze.open_directions, maze.neighbor_steps
+        g_score[start] = 0
+        came_from[start] = -1
+        stamp[start] = generation
+        bucket = [start]
+        next_bucket = None
+        f_score = heuristic(start) if heuristic else 0  # f of the current bucket
+        countdown = slice_size or -1  # Expansions left in this slice; negative never pauses
         
-        while open_set:
-            current_f, current_col, current_row = heapq.heappop(open_set)
-            
-            if current_col == target_col and current_row == target_row:
-                # Reconstruct path
-                path = []
-                while (current_col, current_row) in came_from:
-                    path.append((current_col, current_row))
-                    current_col, current_row = came_from[(current_col, current_row)]
-                return path[::-1]  # Reverse path
+        while True:
+            if not bucket:
+                # Current f exhausted: move on to the next bucket (f + 2)
+                if next_bucket is None:
+                    break
+                bucket, next_bucket = next_bucket, None
+                f_score += 2
+                continue
+            current = bucket.pop()  # LIFO favours the deepest node on f ties
+            if closed[current] == generation:
+                continue  # Already expanded via a shorter route
+            closed[current] = generation
             
-            # Check neighbors
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                neighbor_col, neighbor_row = current_col + dx, current_row + dy
-                
-                if (0 <= neighbor_col < maze.cols and 0 <= neighbor_row < maze.rows and 
-                    not maze.grid[neighbor_row][neighbor_col]):
-                    
-                    tentative_g = g_score[(current_col, current_row)] + 1
-                    
-                    if (neighbor_col, neighbor_row) not in g_score or tentative_g < g_score[(neighbor_col, neighbor_row)]:
-                        came_from[(neighbor_col, neighbor_row)] = (current_col, current_row)
-                        g_score[(neighbor_col, neighbor_row)] = tentative_g
-                        
-                        # Heuristic: Manhattan distance
-                        h = abs(neighbor_col - target_col) + abs(neighbor_row - target_row)
-                        f = tentative_g + h
-                        
-                        heapq.heappush(open_set, (f, neighbor_col, neighbor_row))
-        
-        return []  # No path found
-    
-    def draw(self, screen):
-        if self.stunned:
-            # Flash white when stunned
-            flash_color = (255, 255, 255) if (pygame.time.get_ticks() // 200) % 2 else (100, 100, 100)
-            pygame.draw.rect(screen, flash_color, 
-                            (self.x - self.SIZE, self.y - self.SIZE, 
-                             self.SIZE * 2, self.SIZE * 2))
-        else:
-            # Always red, darker when damaged
-            health_ratio = self.health / self.MAX_HEALTH
-            red_intensity = int(255 * (0.6 + 0.4 * health_ratio))
-            enemy_color = (red_intensity, 0, 0)
+            if current == target:
+                # Reconstruct path (start cell excluded)
+                path = deque()
+                while current != start:
+                    path.appendleft(divmod(current, cols)[::-1])
+                    current = came_from[current]
+                yield path
+                return
             
-            pygame.draw.rect(screen, enemy_color, 
-                            (self.x - self.SIZE, self.y - self.SIZE, 
-                             self.SIZE * 2, self.SIZE * 2))
-        
-        # Health bar
-        if not self.stunned:
-            bar_width = 30
-            bar_height = 4
-            bar_x = self.x - bar_width // 2
-            bar_y = self.y - self.SIZE - 10
+            countdown -= 1
+            if not countdown:
+                yield None  # Slice used up; resume here next time
+                countdown = slice_size
             
-            health_ratio = self.health / self.MAX_HEALTH
-            pygame.draw.rect(screen, (255, 0, 0), (bar_x, bar_y, bar_width, bar_height))
-            health_width = int(bar_width * health_ratio)
-            pygame.draw.rect(screen, (0, 255, 0), (bar_x, bar_y, health_width, bar_height))
+            if heuristic:
+                current_h = f_score - g_score[current]
+            else:
+                current_row, current_col = divmod(current, cols)
+            tentative_g = g_score[current] + 1
+            for step in neighbor_steps[open_directions[current]]:
+                neighbor = current + step
+                if stamp[neighbor] == generation and g_score[neighbor] <= tentative_g:
+                    continue  # Already reached at least as cheaply this search
+                stamp[neighbor] = generation
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                
+                # Stepping toward the target (h drops by one) keeps f unchanged
+                if heuristic:
+                    toward = heuristic(neighbor) < current_h
+                elif step == 1:
+                    toward = current_col < target_col
+                elif step == -1:
+                    toward = current_col > target_col
+                elif step > 0:
+                    toward = current_row < target_row
+                else:
+                    toward = current_row > target_row
+                
+                if toward:
+                    bucket.append(neighbor)
+                elif next_bucket is None:
+                    next_bucket = [neighbor]
+                else:
+                    next_bucket.append(neighbor)
         
-        # Bullets
-        for bullet in self.bullets:
-            pygame.draw.circle(screen, (255, 100, 100), 
-                             (int(bullet['x']), int(bullet['y'])), 3)
+        yield deque()  # No path found
     
     def update_bullets_only(self, maze):
         """Update only bullets during head start period"""
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            
-            if (bullet['x'] < 0 or bullet['x'] > 800 or 
-                bullet['y'] < 0 or bullet['y'] > 600 or
-                (maze and maze.is_wall(bullet['x'], bullet['y']))):
-                self.bullets.remove(bullet)
\ No newline at end of file
+        self.prev_x, self.prev_y = self.x, self.y
+        self.bullets.update(maze)
+
+INFINITY = float('inf')
+
+class IncrementalPlanner:
+    """D* Lite planner that repairs its previous search instead of replanning from scratch.
+
+    The search tree is rooted at the enemy's cell and grows toward the snake, so a
+    snake move is just a new D* Lite start (a km bump) and the tree is kept. Cells
+    edited through Maze.set_wall are replayed as ordinary edge cost changes. The
+    tree is only re-rooted when the enemy drifts off the current shortest path.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.root = None   # Enemy cell the search tree grows from
+        self.start = None  # Snake cell (the D* Lite "start")
+        self.path = []     # Flat cells from root to start, rebuilt after each search
+        self.expanded = 0  # Nodes expanded so far, for benchmarking
+        self.reset(None, None)
+
+    def reset(self, root, start):
+        self.root = root
+        self.start = start
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.open_keys = {}  # node -> key currently valid in the heap
+        self.open_heap = []
+        self.path = []
+        self.edits_seen = len(self.maze.cell_edits)
+        if root is not None:
+            self.rhs[root] = 0
+            self.update_vertex(root)
+
+    def heuristic(self, node):
+        # Manhattan distance from the current start cell
+        start_row, start_col = divmod(self.start, self.maze.cols)
+        row, col = divmod(node, self.maze.cols)
+        return abs(start_col - col) + abs(start_row - row)
+
+    def calculate_key(self, node):
+        best = min(self.g.get(node, INFINITY), self.rhs.get(node, INFINITY))
+        return (best + self.heuristic(node) + self.km, best)
+
+    def neighbors(self, node):
+        # Open neighbours; the root always counts as open so enemies spawned in walls can leave
+        maze = self.maze
+        cols, cells, root = maze.cols, maze.cells, self.root
+        if cells[node] and node != root:
+            return []
+        row, col = divmod(node, cols)
+        result = []
+        if col > 0 and (not cells[node - 1] or node - 1 == root):
+            result.append(node - 1)
+        if col < cols - 1 and (not cells[node + 1] or node + 1 == root):
+            result.append(node + 1)
+        if row > 0 and (not cells[node - cols] or node - cols == root):
+            result.append(node - cols)
+        if row < maze.rows - 1 and (not cells[node + cols] or node + cols == root):
+            result.append(node + cols)
+        return result
+
+    def update_vertex(self, node):
+        if node != self.root:
+            best = INFINITY
+            for neighbor in self.neighbors(node):
+                value = self.g.get(neighbor, INFINITY) + 1
+                if value < best:
+                    best = value
+            self.rhs[node] = best
+        self.open_keys.pop(node, None)
+        if self.g.get(node, INFINITY) != self.rhs.get(node, INFINITY):
+            key = self.calculate_key(node)
+            self.open_keys[node] = key
+            heapq.heappush(self.open_heap, (key, node))
+
+    def top(self):
+        # Drop heap entries made stale by later updates
+        while self.open_heap:
+            key, node = self.open_heap[0]
+            if self.open_keys.get(node) == key:
+                return key, node
+            heapq.heappop(self.open_heap)
+        return None, None
+
+    def compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        start = self.start
+        while True:
+            top_key, node = self.top()
+            if node is None:
+                break
+            if (top_key >= self.calculate_key(start) and
+                    rhs.get(start, INFINITY) == g.get(start, INFINITY)):
+                break
+            self.expanded += 1
+            new_key = self.calculate_key(node)
+            if top_key < new_key:
+                self.open_keys[node] = new_key
+                heapq.heapreplace(self.open_heap, (new_key, node))
+            elif g.get(node, INFINITY) > rhs[node]:
+                # Overconsistent: settle it and relax its neighbours
+                g[node] = rhs[node]
+                del self.open_keys[node]
+                heapq.heappop(self.open_heap)
+                for neighbor in self.neighbors(node):
+                    self.update_vertex(neighbor)
+            else:
+                # Underconsistent: invalidate it and let neighbours re-derive their values
+                g[node] = INFINITY
+                for neighbor in self.neighbors(node) + [node]:
+                    self.update_vertex(neighbor)
+
+    def apply_maze_edits(self):
+        maze = self.maze
+        edits = maze.cell_edits[self.edits_seen:]
+        self.edits_seen = len(maze.cell_edits)
+        for col, row in edits:
+            node = row * maze.cols + col
+            if maze.cells[node]:
+                self.g[node] = INFINITY  # A closed cell can no longer carry a path
+            self.update_vertex(node)
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                neighbor_col, neighbor_row = col + dx, row + dy
+                if 0 <= neighbor_col < maze.cols and 0 <= neighbor_row < maze.rows:
+                    self.update_vertex(neighbor_row * maze.cols + neighbor_col)
+
+    def search(self, start):
+        self.km += self.heuristic(start)  # Keep queued keys valid lower bounds
+        self.start = start
+        self.apply_maze_edits()
+        self.compute_shortest_path()
+
+        # Walk downhill from the snake back to the root
+        g = self.g
+        self.path = []
+        if g.get(start, INFINITY) == INFINITY:
+            return
+        node = start
+        path = [node]
+        while node != self.root:
+            node = min(self.neighbors(node), key=lambda neighbor: g.get(neighbor, INFINITY))
+            path.append(node)
+        path.reverse()
+        self.path = path
+
+    def next_step(self, enemy_col, enemy_row, goal_col, goal_row):
+        """Return the (col, row) to move to next toward the goal, or None if unreachable"""
+        maze = self.maze
+        enemy = enemy_row * maze.cols + enemy_col
+        goal = goal_row * maze.cols + goal_col
+        if enemy == goal or maze.cells[goal]:
+            return None
+
+        if self.root is None or (maze.cells[self.root] and self.root != enemy):
+            self.reset(enemy, goal)
+        if goal != self.start or self.edits_seen != len(maze.cell_edits) or not self.path:
+            self.search(goal)
+        if enemy not in self.path:
+            # Enemy left the tree's best route (snake doubled back): re-root here
+            self.reset(enemy, goal)
+            self.search(goal)
+        if enemy not in self.path:
+            return None
+        return divmod(self.path[self.path.index(enemy) + 1], maze.cols)[::-1]
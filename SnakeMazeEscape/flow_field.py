@@ -0,0 +1,76 @@
+from array import array
+
+class FlowField:
+    """Breadth-first distance field pointing every open maze cell toward one target cell.
+
+    All enemies chase the same snake, so one BFS per snake cell change replaces
+    a full A* per enemy; each enemy then reads its next step in O(1).
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.target = None
+        self.edits_seen = 0  # Entries of maze.cell_edits already reflected in the field
+        size = maze.cols * maze.rows
+        self.distance = array('i', [-1]) * size   # Steps to target, -1 = unreached
+        self.next_cell = array('i', [-1]) * size  # Flat index of the next cell toward target
+
+    def set_target(self, col, row):
+        """Point the field at (col, row); only rebuilds when the target cell or maze changes"""
+        if self.target == (col, row) and self.edits_seen == len(self.maze.cell_edits):
+            return
+        self.target = (col, row)
+        self.rebuild()
+
+    def rebuild(self):
+        cols, rows = self.maze.cols, self.maze.rows
+        cells = self.maze.cells
+        size = cols * rows
+        self.edits_seen = len(self.maze.cell_edits)
+        distance = array('i', [-1]) * size
+        next_cell = array('i', [-1]) * size
+        self.distance, self.next_cell = distance, next_cell
+
+        col, row = self.target
+        if not (0 <= col < cols and 0 <= row < rows) or cells[row * cols + col]:
+            return  # Target outside the maze or inside a wall
+
+        # Level-by-level BFS over the maze's open-neighbour table
+        open_directions, neighbor_steps = self.maze.open_directions, self.maze.neighbor_steps
+        start = row * cols + col
+        distance[start] = 0
+        frontier = [start]
+        step = 0
+        while frontier:
+            step += 1
+            next_frontier = []
+            for current in frontier:
+                for offset in neighbor_steps[open_directions[current]]:
+                    neighbor = current + offset
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = step
+                        next_cell[neighbor] = current
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+    def next_step(self, col, row):
+        """Return the (col, row) one step closer to the target, or None if there is none"""
+        cols, rows = self.maze.cols, self.maze.rows
+        if not (0 <= col < cols and 0 <= row < rows):
+            return None
+
+        index = row * cols + col
+        if self.distance[index] > 0:
+            return divmod(self.next_cell[index], cols)[::-1]
+        if self.distance[index] == 0:
+            return None  # Already at the target
+
+        # Off the field (e.g. spawned inside a wall): step to the best reached neighbour
+        best = None
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            neighbor_col, neighbor_row = col + dx, row + dy
+            if 0 <= neighbor_col < cols and 0 <= neighbor_row < rows:
+                neighbor_distance = self.distance[neighbor_row * cols + neighbor_col]
+                if neighbor_distance >= 0 and (best is None or neighbor_distance < best[0]):
+                    best = (neighbor_distance, neighbor_col, neighbor_row)
+        return (best[1], best[2]) if best else None
@@ -0,0 +1,382 @@
+import pygame
+from itertools import islice
+from game_state import NOOP, LEFT, RIGHT, UP, DOWN, SHOOT
+from text_cache import TEXT
+
+# Game events that play a sound under another name
+EVENT_SOUNDS = {'snake_hit': 'hit', 'enemy_hit': 'hit', 'stun_shot': 'stun', 'time_up': 'game_over'}
+
+def action_from_keys(keys):
+    """GameState action for the keys currently held (pygame.key.get_pressed())"""
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        action = LEFT
+    elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        action = RIGHT
+    elif keys[pygame.K_UP] or keys[pygame.K_w]:
+        action = UP
+    elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        action = DOWN
+    else:
+        action = NOOP
+    if keys[pygame.K_SPACE]:
+        action |= SHOOT
+    return action
+
+def play_events(sound_manager, events):
+    for event in events:
+        sound_manager.play(EVENT_SOUNDS.get(event, event))
+
+class FullscreenPresenter:
+    """Letterboxes a fixed-size frame onto a larger display with no per-frame allocation.
+
+    The game draws on `frame`, allocated once in the display's pixel format,
+    and present() scales it straight into the subsurface of the display it
+    covers through pygame.transform.scale's destination argument. Build a new
+    presenter whenever the display mode changes.
+    """
+
+    def __init__(self, display, size):
+        width, height = size
+        display_width, display_height = display.get_size()
+        scale = min(display_width / width, display_height / height)  # Uniform, keeps the aspect ratio
+        self.rect = pygame.Rect(0, 0, int(width * scale), int(height * scale))
+        self.rect.center = display.get_rect().center
+        self.frame = pygame.Surface(size, 0, display)
+        self.target = display.subsurface(self.rect)
+        display.fill((0, 0, 0))  # Letterbox bars, drawn once
+
+    def present(self):
+        pygame.transform.scale(self.frame, self.rect.size, self.target)
+
+def native_view(display_size, world_size, cell_size):
+    """(scale, origin) that fits a world_size play area onto the display at its own resolution.
+
+    The scale is rounded down to a whole number of pixels per cell, so tiles
+    stay crisp and line up, and the play area is centred.
+    """
+    tile = int(cell_size * min(display_size[0] / world_size[0], display_size[1] / world_size[1]))
+    scale = max(tile, 1) / cell_size
+    return scale, ((display_size[0] - int(world_size[0] * scale)) // 2,
+                   (display_size[1] - int(world_size[1] * scale)) // 2)
+
+class Renderer:
+    """Draws the game's plain-data objects (maze, snake, enemies, bullets) with pygame.
+
+    World coordinates (the simulation's pixels) are mapped onto the screen
+    through set_view()'s scale and origin, so fullscreen draws at the
+    display's resolution. Maze cells and snake segments are blitted from a
+    tile atlas drawn at that scale; nothing is scaled after the fact.
+
+    With a viewport smaller than the maze, follow() scrolls a camera over it.
+    Only the cells in view are painted, and snake segments, enemies and
+    bullets outside them are skipped, so a frame costs the same however big
+    the maze is.
+
+    Owns a screen-sized background surface holding the maze cells in view,
+    painted on first draw, patched tile by tile from the maze's dirty_tiles
+    and scrolled along with the camera, repainting only the uncovered strips.
+
+    Between begin_frame() and present() it runs a dirty-rectangle frame: every
+    draw records the rect it touched, draw_maze() only puts the background
+    back under last frame's rects, and present() pushes just those regions
+    with pygame.display.update() instead of flipping the whole screen.
+    """
+
+    # Atlas slots, one tile wide each
+    WALL, PATH, FOOD, HEAD, BODY = range(5)
+
+    def __init__(self, viewport=None):
+        self.maze = None        # Maze the background was baked from
+        self.background = None
+        self.atlas = None       # Tiles for the current scale, drawn with the background
+        self.scale = 1          # Screen pixels per world pixel
+        self.origin = (0, 0)    # Screen position of the viewport's top-left corner
+        self.viewport = viewport  # World pixels shown (width, height); None shows the whole maze
+        self.scroll = (0, 0)      # Camera offset into the world, in screen pixels
+        self.background_scroll = (0, 0)  # Camera offset the background was painted at
+        self.view_rect = None   # Screen rect the maze is shown in
+        self.cull = None        # Column and row ranges of the cells anything drawn may show in
+        self.touched = None     # Rects drawn this frame while a dirty-rect frame is open, else None
+        self.restored = []      # Rects repainted from the background this frame
+        self.on_screen = None   # Rects drawn last dirty frame; None when the screen is out of sync
+        self.full_update = True
+
+    def set_view(self, scale, origin):
+        """Draw at `scale` screen pixels per world pixel with the world's corner at `origin`"""
+        if (scale, origin) != (self.scale, self.origin):
+            self.scale, self.origin = scale, origin
+            self.maze = None  # Re-bake the atlas and background at the new size
+            self.on_screen = None
+
+    def to_screen(self, x, y):
+        """Screen position of a world point"""
+        return (self.origin[0] + int(x * self.scale) - self.scroll[0],
+                self.origin[1] + int(y * self.scale) - self.scroll[1])
+
+    def hud_point(self, x, y):
+        """Screen position of a point in the 800x600 HUD layout, which does not scroll"""
+        return (self.origin[0] + int(x * self.scale), self.origin[1] + int(y * self.scale))
+
+    def follow(self, maze, x, y):
+        """Scroll the camera so the world point (x, y) is centred, without showing past the maze's edges"""
+        if self.viewport is None:
+            return
+        scroll = []
+        for centre, view, world in ((x, self.viewport[0], maze.cols * maze.CELL_SIZE),
+                                    (y, self.viewport[1], maze.rows * maze.CELL_SIZE)):
+            scroll.append(int(max(0, min(centre - view // 2, world - view)) * self.scale))
+        self.scroll = tuple(scroll)
+
+    def visible_cells(self, maze, area):
+        """Column and row ranges of the maze cells inside a screen rect"""
+        tile = self.tile
+        left = area.left - self.origin[0] + self.scroll[0]
+        top = area.top - self.origin[1] + self.scroll[1]
+        return (range(max(0, left // tile), min(maze.cols, -(-(left + area.width) // tile))),
+                range(max(0, top // tile), min(maze.rows, -(-(top + area.height) // tile))))
+
+    def visible(self, x, y):
+        """Whether something at world point (x, y) may show this frame"""
+        cell_size = self.maze.CELL_SIZE
+        return int(x) // cell_size in self.cull[0] and int(y) // cell_size in self.cull[1]
+
+    def begin_frame(self):
+        """Start a dirty-rectangle frame; draw the maze first, then everything else, then present()"""
+        self.touched = []
+        self.restored = []
+
+    def touch(self, rect):
+        """Record a rect drawn this frame (pygame.draw and blit return them) and pass it through"""
+        if self.touched is not None:
+            self.touched.append(rect)
+        return rect
+
+    def blit(self, screen, surface, dest):
+        return self.touch(screen.blit(surface, dest))
+
+    def text(self, screen, text, size, color, pos=None, center=None):
+        """Draw HUD text laid out in world coordinates, rendered at the view's scale"""
+        surface = TEXT.render(text, round(size * self.scale), color)
+        if center:
+            return self.blit(screen, surface, surface.get_rect(center=self.hud_point(*center)))
+        return self.blit(screen, surface, self.hud_point(*pos))
+
+    def present(self):
+        if self.full_update:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.restored + self.touched)
+        self.on_screen, self.touched = self.touched, None
+
+    def invalidate(self):
+        """The screen was drawn without us: the next dirty frame repaints all of it"""
+        self.on_screen = None
+
+    def build_atlas(self, maze):
+        """Draw the maze tiles once at the current scale into one Surface; snake tiles follow on first use"""
+        tile = round(maze.CELL_SIZE * self.scale)
+        self.tile = tile
+        self.atlas = pygame.Surface((tile * 5, tile))
+        if pygame.display.get_surface():
+            self.atlas = self.atlas.convert()
+        self.atlas.fill(maze.WALL_COLOR, self.atlas_rect(self.WALL))
+        self.atlas.fill(maze.PATH_COLOR, self.atlas_rect(self.PATH))
+        food = self.atlas_rect(self.FOOD)
+        self.atlas.fill(maze.PATH_COLOR, food)
+        pygame.draw.circle(self.atlas, maze.FOOD_COLOR, food.center, round(6 * self.scale))
+        self.segment = None  # Rect of a snake segment within its slot
+
+    def build_segments(self, snake):
+        """Head (with eyes) and body tiles, 2 * size square, at the start of their slots"""
+        scale, size = self.scale, snake.size
+        self.segment = pygame.Rect(0, 0, round(size * 2 * scale), round(size * 2 * scale))
+        head = self.segment.move(self.atlas_rect(self.HEAD).x, 0)
+        self.atlas.fill(snake.head_color, head)
+        for side in (-3, 3):
+            eye = (head.x + round((size + side) * scale), round((size - 3) * scale))
+            pygame.draw.circle(self.atlas, (255, 255, 255), eye, round(2 * scale))
+            pygame.draw.circle(self.atlas, (0, 0, 0), eye, round(scale))
+        self.atlas.fill(snake.body_color, self.segment.move(self.atlas_rect(self.BODY).x, 0))
+
+    def atlas_rect(self, slot):
+        return pygame.Rect(slot * self.tile, 0, self.tile, self.tile)
+
+    def tile_rect(self, col, row):
+        """Screen rect of a maze cell"""
+        return pygame.Rect(self.origin[0] + col * self.tile - self.scroll[0],
+                           self.origin[1] + row * self.tile - self.scroll[1], self.tile, self.tile)
+
+    def render_background(self, maze, size=None):
+        """Paint walls, paths, entrance/exit labels and food in view into a new background Surface.
+
+        The background lines up with the screen, origin and camera included;
+        size makes it that many pixels (the screen's) instead of the maze's
+        extent. Outside the maze it is black, so restoring from it also clears
+        HUD text drawn past the maze's edge.
+        """
+        self.maze = maze
+        self.build_atlas(maze)
+        if not size:
+            size = (self.origin[0] + maze.cols * self.tile, self.origin[1] + maze.rows * self.tile)
+        self.background = pygame.Surface(size)
+        if pygame.display.get_surface():
+            self.background = self.background.convert()
+        if self.viewport:
+            self.view_rect = pygame.Rect(self.origin, (int(self.viewport[0] * self.scale),
+                                                       int(self.viewport[1] * self.scale)))
+        else:
+            self.view_rect = self.background.get_rect()
+
+        # Labels are rendered once and re-blitted whenever their tiles are redrawn
+        self.start_label = TEXT.render("START", round(16 * self.scale), (255, 255, 255))
+        self.exit_label = TEXT.render("EXIT", round(16 * self.scale), (255, 255, 255))
+
+        self.background.fill((0, 0, 0))
+        self.background_scroll = self.scroll
+        self.paint(maze, self.view_rect)
+        maze.dirty_tiles.clear()
+
+    def paint(self, maze, area):
+        """Repaint the background inside a screen rect from the atlas, visiting only the cells that show there"""
+        area = area.clip(self.view_rect)
+        if not area:
+            return
+        background = self.background
+        background.set_clip(area)
+        background.fill((0, 0, 0), area)
+        atlas, cells, cols, food_cells = self.atlas, maze.cells, maze.cols, maze.food_cells
+        tiles = (self.atlas_rect(self.PATH), self.atlas_rect(self.WALL))
+        food = self.atlas_rect(self.FOOD)
+        columns, rows = self.visible_cells(maze, area)
+        for row in rows:
+            for col in columns:
+                tile = food if (col, row) in food_cells else tiles[cells[row * cols + col] == 1]
+                background.blit(atlas, self.tile_rect(col, row), tile)
+
+        # Labels spill over neighbouring cells, so they are redrawn clipped to the area
+        self.draw_markers(background, maze)
+        background.set_clip(None)
+
+    def draw_markers(self, surface, maze):
+        border = round(2 * self.scale)
+        for (col, row), color, label in ((maze.entrance_pos, maze.ENTRANCE_COLOR, self.start_label),  # Green
+                                         (maze.exit_pos, maze.EXIT_COLOR, self.exit_label)):          # Purple
+            rect = self.tile_rect(col, row)
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, (255, 255, 255), rect, border)
+            surface.blit(label, (rect.x + border, rect.y + border))
+
+    def scroll_background(self, maze):
+        """Move the background along with the camera and paint the strips it uncovered"""
+        dx = self.background_scroll[0] - self.scroll[0]
+        dy = self.background_scroll[1] - self.scroll[1]
+        self.background_scroll = self.scroll
+        view = self.view_rect
+        self.background.set_clip(view)
+        self.background.scroll(dx, dy)
+        self.background.set_clip(None)
+        if dx:
+            self.paint(maze, pygame.Rect(view.right + dx if dx < 0 else view.left, view.top, abs(dx), view.height))
+        if dy:
+            self.paint(maze, pygame.Rect(view.left, view.bottom + dy if dy < 0 else view.top, view.width, abs(dy)))
+
+    def draw_maze(self, screen, maze):
+        in_sync = self.touched is not None and self.on_screen is not None
+        if maze is not self.maze:
+            self.render_background(maze, screen.get_size())
+            in_sync = False
+        elif self.scroll != self.background_scroll:
+            self.scroll_background(maze)
+            in_sync = False
+        if maze.dirty_tiles:
+            for col, row in maze.dirty_tiles:
+                tile_rect = self.tile_rect(col, row)
+                self.paint(maze, tile_rect)
+                if in_sync:
+                    self.restored.append(screen.blit(self.background, tile_rect, tile_rect))
+            maze.dirty_tiles.clear()
+
+        # Entities are culled by cell, with margin for sprites and health bars overlapping the edge
+        columns, rows = self.visible_cells(maze, self.view_rect)
+        self.cull = (range(columns.start - 2, columns.stop + 2), range(rows.start - 2, rows.stop + 2))
+
+        if in_sync:
+            # Only put the background back under what was drawn last frame
+            background = self.background
+            for rect in self.on_screen:
+                self.restored.append(screen.blit(background, rect, rect))
+            self.full_update = False
+        else:
+            screen.blit(self.background, (0, 0))
+            self.full_update = True
+            if self.touched is None:
+                self.on_screen = None
+
+    def draw_snake(self, screen, snake, alpha=1.0):
+        # Segments snap from cell to cell by design, so only bullets are interpolated
+        if self.segment is None:
+            self.build_segments(snake)
+        atlas, to_screen, touch = self.atlas, self.to_screen, self.touch
+        size = snake.size
+        head = self.segment.move(self.atlas_rect(self.HEAD).x, 0)
+        body = self.segment.move(self.atlas_rect(self.BODY).x, 0)
+        cell_size, columns, rows = self.maze.CELL_SIZE, *self.cull
+        x, y = snake.body[0]
+        touch(screen.blit(atlas, to_screen(x - size, y - size), head))
+        for x, y in islice(snake.body, 1, None):
+            if int(x) // cell_size in columns and int(y) // cell_size in rows:
+                touch(screen.blit(atlas, to_screen(x - size, y - size), body))
+
+        self.draw_bullets(screen, snake.bullets, (255, 255, 0), 4, alpha)
+
+        self.text(screen, f"Ammo: {snake.ammo}", 36, (255, 255, 255), (10, 10))
+        self.text(screen, "WASD/Arrows: Move | SPACE: Shoot", 24, (200, 200, 200), (10, 50))
+
+    def draw_enemy(self, screen, enemy, alpha=1.0):
+        if self.visible(enemy.x, enemy.y):
+            self.draw_enemy_body(screen, enemy, alpha)
+        # Bullets fly on their own, so they are culled separately
+        self.draw_bullets(screen, enemy.bullets, (255, 100, 100), 3, alpha)
+
+    def draw_enemy_body(self, screen, enemy, alpha):
+        # Interpolate between the last two ticks so movement stays smooth between them
+        scale = self.scale
+        size = enemy.SIZE
+        x = enemy.prev_x + (enemy.x - enemy.prev_x) * alpha
+        y = enemy.prev_y + (enemy.y - enemy.prev_y) * alpha
+        body = (*self.to_screen(x - size, y - size), round(size * 2 * scale), round(size * 2 * scale))
+        if enemy.stunned:
+            # Flash white when stunned
+            flash_color = (255, 255, 255) if (pygame.time.get_ticks() // 200) % 2 else (100, 100, 100)
+            self.touch(pygame.draw.rect(screen, flash_color, body))
+        else:
+            # Always red, darker when damaged
+            health_ratio = enemy.health / enemy.MAX_HEALTH
+            red_intensity = int(255 * (0.6 + 0.4 * health_ratio))
+            enemy_color = (red_intensity, 0, 0)
+
+            self.touch(pygame.draw.rect(screen, enemy_color, body))
+
+        # Health bar
+        if not enemy.stunned:
+            bar_width = 30
+            bar_height = 4
+            bar_x, bar_y = self.to_screen(x - bar_width // 2, y - size - 10)
+
+            health_ratio = enemy.health / enemy.MAX_HEALTH
+            self.touch(pygame.draw.rect(screen, (255, 0, 0),
+                                        (bar_x, bar_y, round(bar_width * scale), round(bar_height * scale))))
+            health_width = int(bar_width * health_ratio * scale)
+            self.touch(pygame.draw.rect(screen, (0, 255, 0), (bar_x, bar_y, health_width, round(bar_height * scale))))
+
+    def draw_bullets(self, screen, pool, color, radius, alpha=1.0):
+        # Bullets move one step per tick, so the previous tick's position is one step back
+        back = 1.0 - alpha
+        x, y, dx, dy, alive = pool.x, pool.y, pool.dx, pool.dy, pool.alive
+        touch, to_screen = self.touch, self.to_screen
+        cell_size, columns, rows = self.maze.CELL_SIZE, *self.cull
+        radius = round(radius * self.scale)
+        for slot in range(pool.high):
+            if alive[slot] and int(x[slot]) // cell_size in columns and int(y[slot]) // cell_size in rows:
+                touch(pygame.draw.circle(screen, color, to_screen(int(x[slot] - dx[slot] * back),
+                                                                  int(y[slot] - dy[slot] * back)), radius))
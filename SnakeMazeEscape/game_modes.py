@@ -1,11 +1,12 @@
 import pygame
+from text_cache import TEXT
 
 class ModeSelector:
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 64)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 36)
+        self.size_large = 64  # Font sizes; text goes through the shared TEXT cache
+        self.size_medium = 48
+        self.size_small = 36
         
         self.selected_mode = 0
         self.modes = ['EASY', 'NORMAL', 'ADVANCED']
@@ -55,7 +56,7 @@ class ModeSelector:
         self.screen.fill(self.BLACK)
         
         # Title
-        title_text = self.font_large.render("SELECT DIFFICULTY", True, self.GREEN)
+        title_text = TEXT.render("SELECT DIFFICULTY", self.size_large, self.GREEN)
         title_rect = title_text.get_rect(center=(400, 150))
         self.screen.blit(title_text, title_rect)
         
@@ -71,13 +72,13 @@ class ModeSelector:
             else:
                 mode_text = mode
             
-            mode_surface = self.font_medium.render(mode_text, True, color)
+            mode_surface = TEXT.render(mode_text, self.size_medium, color)
             mode_rect = mode_surface.get_rect(center=(400, y_start + i * 80))
             self.screen.blit(mode_surface, mode_rect)
             
             # Description
             desc_color = self.YELLOW if i == self.selected_mode else self.GRAY
-            desc_surface = self.font_small.render(self.mode_descriptions[i], True, desc_color)
+            desc_surface = TEXT.render(self.mode_descriptions[i], self.size_small, desc_color)
             desc_rect = desc_surface.get_rect(center=(400, y_start + i * 80 + 30))
             self.screen.blit(desc_surface, desc_rect)
             
@@ -86,6 +87,6 @@ class ModeSelector:
                 pygame.draw.rect(self.screen, self.BLUE, mode_rect, 3)
         
         # Instructions
-        inst_text = self.font_small.render("↑↓ Navigate | ENTER/SPACE Select | ESC Back", True, self.WHITE)
+        inst_text = TEXT.render("↑↓ Navigate | ENTER/SPACE Select | ESC Back", self.size_small, self.WHITE)
         inst_rect = inst_text.get_rect(center=(400, 520))
         self.screen.blit(inst_text, inst_rect)
\ No newline at end of file
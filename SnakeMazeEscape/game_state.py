@@ -0,0 +1,235 @@
+import importlib
+import random
+from maze import Maze
+from snake import Snake
+from enemy import Enemy
+from ai_scheduler import AIScheduler
+from broadphase import Broadphase
+from sim_clock import SimClock
+
+# Actions: one direction, optionally or-ed with SHOOT
+NOOP, LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3, 4
+SHOOT = 8
+DIRECTION_NAMES = (None, 'LEFT', 'RIGHT', 'UP', 'DOWN', None, None, None)
+
+def load_difficulty(name):
+    """The settings module difficulties/<name>/config.py ('easy', 'normal' or 'advanced').
+
+    SNAKE_SPEED and ENEMY_SPEED are milliseconds per move (the MOVE_DELAY
+    they set), so a higher value is slower.
+    """
+    return importlib.import_module(f'difficulties.{name}.config')
+
+class GameState:
+    """One match of the game as plain data plus a step function, with no pygame.
+
+    step() takes an action, advances the simulation one fixed tick and returns
+    the names of the events that happened during it ('food', 'snake_hit',
+    'stun', 'game_over', ...). Front ends turn actions into key presses and
+    events into sounds; batch runs just call step() in a loop.
+
+    mode 'classic' is the single-enemy base game, 'normal' adds the second
+    enemy, stun and shield fruits and the ping alert. A difficulty name
+    applies that profile's snake, enemy, head start and food settings.
+    """
+
+    ENEMY_SPAWN_DELAY = 5000  # ms before the first enemy appears
+    ENEMY_HEAD_START = 10000  # ms an enemy waits after spawning before it moves
+    SECOND_ENEMY_DELAY = 30000  # ms after the first enemy until the second ('normal')
+    SHIELD_DURATION = 15000
+
+    def __init__(self, mode='normal', timer_minutes=3, seed=None, width=800, height=600, tick_rate=None,
+                 difficulty=None):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.width = width
+        self.height = height
+        # A concrete seed even when none is given, so the match can be recorded and replayed
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+        self.clock = SimClock(tick_rate)
+        self.status = 'playing'  # 'playing', 'game_over', 'time_up' or 'victory'
+        self.timer_minutes = timer_minutes
+        self.timer_enabled = timer_minutes > 0
+        self.start_time = self.clock.now
+
+        self.settings = load_difficulty(difficulty) if difficulty else None
+        food_spawn_rate = self.settings.FOOD_SPAWN_RATE if self.settings else 0.08
+        self.maze = Maze(width, height, self.rng, food_spawn_rate)
+        self.snake = Snake(1 * 20 + 10, 1 * 20 + 10)  # Centre of the entrance cell
+
+        if self.settings:
+            self.ENEMY_HEAD_START = self.settings.ENEMY_HEAD_START
+            self.snake.MOVE_DELAY = self.settings.SNAKE_SPEED
+            self.snake.ammo = self.settings.SNAKE_START_AMMO
+
+        self.enemies = []
+        self.enemy_start_time = 0
+        self.second_enemy_spawned = False
+        self.ai_scheduler = AIScheduler()  # Enemy updates and replans within a per-frame budget
+        self.broadphase = Broadphase()     # Collision buckets, rebuilt every tick
+
+        # NORMAL MODE: special fruits, shield and ping alert
+        self.stun_fruit = None
+        self.shield_fruit = None
+        self.shield_active = False
+        self.shield_start_time = 0
+        self.stun_shot_ready = False
+        self.ping_alert = False
+
+    @property
+    def tick(self):
+        return self.clock.tick
+
+    def time_left(self):
+        """Milliseconds until the timer runs out, or None without a timer"""
+        if not self.timer_enabled:
+            return None
+        return max(0, self.timer_minutes * 60000 - (self.clock.now - self.start_time))
+
+    def head_start_left(self):
+        """Milliseconds until the enemies start moving, 0 once they have"""
+        if not self.enemies:
+            return 0
+        return max(0, self.ENEMY_HEAD_START - (self.clock.now - self.enemy_start_time))
+
+    def step(self, action=NOOP):
+        """Advance one tick with the given action and return the events it produced"""
+        events = []
+        if self.status == 'playing':
+            self.update(action, events)
+            events.extend(self.snake.events)
+            self.snake.events.clear()
+            for enemy in self.enemies:
+                events.extend(enemy.events)
+                enemy.events.clear()
+        self.clock.advance()
+        return events
+
+    def end(self, status, events):
+        self.status = status
+        events.append(status)
+
+    def update(self, action, events):
+        current_time = self.clock.now
+        snake, maze, normal = self.snake, self.maze, self.mode == 'normal'
+        shoot = bool(action & SHOOT)
+
+        if self.timer_enabled and current_time - self.start_time >= self.timer_minutes * 60000:
+            self.end('time_up', events)
+            return
+
+        snake.update(maze, self.clock, DIRECTION_NAMES[action & 7], shoot)
+
+        # Spawn the first enemy after a delay (and in normal mode a second one later)
+        if not self.enemies and current_time - self.start_time > self.ENEMY_SPAWN_DELAY:
+            if normal:
+                spawn_x, spawn_y = self.width - 100, self.height - 100
+            else:
+                spawn_x, spawn_y = 100 + current_time % 200, 100 + current_time % 150
+            self.spawn_enemy(spawn_x, spawn_y, events)
+            self.enemy_start_time = current_time
+        if (normal and len(self.enemies) == 1 and not self.second_enemy_spawned and
+                current_time - self.enemy_start_time > self.SECOND_ENEMY_DELAY):
+            self.spawn_enemy(100, 100, events)
+            self.second_enemy_spawned = True
+
+        # Enemies only move once their head start is over
+        started = self.enemies and current_time - self.enemy_start_time > self.ENEMY_HEAD_START
+        if started:
+            self.ai_scheduler.update(self.enemies, snake.head_x, snake.head_y, maze, self.clock)
+        else:
+            for enemy in self.enemies:
+                enemy.update_bullets_only(maze)
+
+        # Bin everything that can collide this tick
+        grid = self.broadphase
+        grid.clear()
+        for enemy in self.enemies:
+            grid.insert('enemy', enemy, enemy.x, enemy.y)
+            grid.insert_bullets('enemy_bullet', enemy.bullets)
+        grid.insert_bullets('snake_bullet', snake.bullets)
+        for name, fruit in (('stun', self.stun_fruit), ('shield', self.shield_fruit)):
+            if fruit:
+                grid.insert('fruit', name, fruit['x'], fruit['y'])
+
+        # Enemy bullets cost the snake ammo, unless shielded
+        for pool, slot in grid.query('enemy_bullet', snake.head_x, snake.head_y, 15):
+            pool.kill(slot)
+            if not self.shield_active and snake.ammo > 0:
+                snake.ammo -= 1
+                events.append('snake_hit')
+
+        # Caught by an enemy: in classic mode any active one, in normal mode any
+        # one once the head start is over (unless shielded)
+        touching = grid.query('enemy', snake.head_x, snake.head_y, 20)
+        if normal:
+            caught = started and touching and not self.shield_active
+        else:
+            caught = any(not enemy.stunned for enemy in touching)
+        if caught:
+            self.end('game_over', events)
+            return
+
+        # Snake bullets damage enemies
+        for enemy in self.enemies:
+            for pool, slot in grid.query('snake_bullet', enemy.x, enemy.y, 15):
+                if pool.alive[slot]:  # Not already spent on another enemy
+                    pool.kill(slot)
+                    enemy.take_damage(self.clock)
+
+        if normal:
+            self.update_power_ups(current_time, shoot, grid, events)
+
+        if maze.is_exit(snake.head_x, snake.head_y):
+            self.end('victory', events)
+
+    def spawn_enemy(self, x, y, events):
+        enemy = Enemy(x, y)
+        if self.settings:
+            enemy.MAX_HEALTH = enemy.health = self.settings.ENEMY_HEALTH
+            enemy.MOVE_DELAY = self.settings.ENEMY_SPEED
+            enemy.SHOOT_DELAY = self.settings.ENEMY_SHOOT_DELAY
+        self.enemies.append(enemy)
+        events.append('enemy_spawn')
+
+    def update_power_ups(self, current_time, shoot, grid, events):
+        snake, rng = self.snake, self.rng
+
+        # Fire the stun shot: stun every enemy
+        if shoot and self.stun_shot_ready:
+            for enemy in self.enemies:
+                enemy.stunned = True
+                enemy.stun_timer = current_time
+                enemy.STUN_DURATION = 10000  # 10 seconds
+            self.stun_shot_ready = False
+            events.append('stun_shot')
+
+        if self.shield_active and current_time - self.shield_start_time > self.SHIELD_DURATION:
+            self.shield_active = False
+
+        # Fruits appear at random open cells off the snake
+        if not self.stun_fruit and rng.randint(1, 1000) == 1:
+            x = rng.randint(100, self.width - 100)
+            y = rng.randint(100, self.height - 100)
+            if not self.maze.is_wall(x, y) and not snake.occupies(x, y):
+                self.stun_fruit = {'x': x, 'y': y}
+        if not self.shield_fruit and rng.randint(1, 800) == 1:
+            x = rng.randint(100, self.width - 100)
+            y = rng.randint(100, self.height - 100)
+            if not self.maze.is_wall(x, y) and not snake.occupies(x, y):
+                self.shield_fruit = {'x': x, 'y': y}
+
+        collected = grid.query('fruit', snake.head_x, snake.head_y, 20)
+        if self.stun_fruit and 'stun' in collected:
+            self.stun_shot_ready = True
+            self.stun_fruit = None
+        if self.shield_fruit and 'shield' in collected:
+            self.shield_active = True
+            self.shield_start_time = current_time
+            self.shield_fruit = None
+            events.append('shield')
+
+        # Warn when an active enemy is close
+        self.ping_alert = any(not enemy.stunned for enemy in
+                              grid.query('enemy', snake.head_x, snake.head_y, 120))
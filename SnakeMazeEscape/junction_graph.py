@@ -0,0 +1,360 @@
+import heapq
+from array import array
+from collections import deque
+
+# Number of open neighbours for each 4-bit open-direction mask
+DEGREE = bytes(bin(mask).count('1') for mask in range(16)) + bytes(240)
+
+class JunctionGraph:
+    """Maze corridors contracted into a weighted graph of junctions and dead ends.
+
+    Every open cell with other than two open neighbours becomes a node, and each
+    corridor of two-neighbour cells between nodes becomes one weighted edge, so a
+    search visits junctions instead of every path cell. Large mazes also get a
+    HierarchicalGraph over square regions for long-range queries.
+    """
+
+    HIERARCHY_MIN_NODES = 20000  # Build the region layer above this many nodes
+    REGION_SIZE = 32             # Region width/height in cells for the region layer
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.edits_seen = len(maze.cell_edits)
+        self.expanded = 0  # Nodes expanded so far, for benchmarking
+        self.build()
+        self.hierarchy = None
+        if len(self.node_cells) > self.HIERARCHY_MIN_NODES:
+            self.hierarchy = HierarchicalGraph(self, self.REGION_SIZE)
+
+    def build(self):
+        maze = self.maze
+        cells, cols = maze.cells, maze.cols
+        open_directions, neighbor_steps = maze.open_directions, maze.neighbor_steps
+        degrees = open_directions.translate(DEGREE)
+        size = len(cells)
+
+        # Nodes: open cells that are junctions or dead ends
+        self.cell_node = array('i', [-1]) * size
+        self.node_cells = array('i')
+        for cell in range(size):
+            if not cells[cell] and degrees[cell] != 2:
+                self.cell_node[cell] = len(self.node_cells)
+                self.node_cells.append(cell)
+        self.node_cols = array('i', [cell % cols for cell in self.node_cells])
+        self.node_rows = array('i', [cell // cols for cell in self.node_cells])
+
+        # Edges: walk each corridor once, remembering where every corridor cell sits on it
+        self.cell_edge = array('i', [-1]) * size
+        self.cell_offset = array('i', [0]) * size
+        self.edge_nodes = []   # (node_a, node_b)
+        self.edge_length = array('i')
+        self.edge_cells = []   # Corridor cells from node_a toward node_b, endpoints excluded
+        self.node_edges = [[] for _ in self.node_cells]  # node -> [(neighbor, length, edge)]
+        cell_node, cell_edge = self.cell_node, self.cell_edge
+
+        for node_a, start_cell in enumerate(self.node_cells):
+            for step in neighbor_steps[open_directions[start_cell]]:
+                previous, current = start_cell, start_cell + step
+                if cell_node[current] < 0 and cell_edge[current] >= 0:
+                    continue  # Corridor already walked from its other end
+                corridor = array('i')
+                while cell_node[current] < 0:
+                    corridor.append(current)
+                    for next_step in neighbor_steps[open_directions[current]]:
+                        if current + next_step != previous:
+                            break
+                    previous, current = current, current + next_step
+                node_b = cell_node[current]
+                if not corridor and node_b < node_a:
+                    continue  # Direct node-to-node edge, recorded from the lower node
+
+                edge = len(self.edge_nodes)
+                for offset, cell in enumerate(corridor):
+                    cell_edge[cell] = edge
+                    self.cell_offset[cell] = offset
+                self.edge_nodes.append((node_a, node_b))
+                self.edge_length.append(len(corridor) + 1)
+                self.edge_cells.append(corridor)
+                if node_a != node_b:  # Self-loops never shorten a path
+                    self.node_edges[node_a].append((node_b, len(corridor) + 1, edge))
+                    self.node_edges[node_b].append((node_a, len(corridor) + 1, edge))
+
+    def attachments(self, cell):
+        """Return [(node, distance)] for the graph nodes a cell connects to"""
+        node = self.cell_node[cell]
+        if node >= 0:
+            return [(node, 0)]
+        edge = self.cell_edge[cell]
+        if edge < 0:
+            return []  # Wall, or a cell off every junction (closed loop)
+        node_a, node_b = self.edge_nodes[edge]
+        offset = self.cell_offset[cell]
+        if node_a == node_b:
+            return [(node_a, min(offset + 1, self.edge_length[edge] - offset - 1))]
+        return [(node_a, offset + 1), (node_b, self.edge_length[edge] - offset - 1)]
+
+    def corridor_cells(self, cell, node):
+        """Cells walked from a corridor cell (exclusive) to one of its edge's nodes (inclusive)"""
+        if self.cell_node[cell] >= 0:
+            return []
+        edge = self.cell_edge[cell]
+        offset = self.cell_offset[cell]
+        corridor = self.edge_cells[edge]
+        node_a, node_b = self.edge_nodes[edge]
+        # For a self-loop both directions end at the same node; take the shorter one
+        if node == node_a and (node != node_b or offset + 1 <= self.edge_length[edge] - offset - 1):
+            return list(reversed(corridor[:offset])) + [self.node_cells[node_a]]
+        return list(corridor[offset + 1:]) + [self.node_cells[node_b]]
+
+    def edge_path(self, edge, from_node):
+        """Cells along an edge leaving from_node, excluding from_node itself"""
+        node_a, node_b = self.edge_nodes[edge]
+        if from_node == node_a:
+            return list(self.edge_cells[edge]) + [self.node_cells[node_b]]
+        return list(reversed(self.edge_cells[edge])) + [self.node_cells[node_a]]
+
+    def search(self, sources, goals, goal_cell=None, region=None, region_of=None):
+        """A* (Dijkstra without goal_cell) over junction nodes.
+
+        sources maps node -> starting cost and goals maps node -> cost to finish.
+        When region is given only nodes with region_of[node] == region are
+        visited. Returns (best_cost, best_node, g, parent) where parent maps
+        node -> (previous_node, edge).
+        """
+        if goal_cell is not None:
+            goal_row, goal_col = divmod(goal_cell, self.maze.cols)
+        node_cols, node_rows, node_edges = self.node_cols, self.node_rows, self.node_edges
+        g = {}
+        parent = {}
+        open_set = []
+        for node, cost in sources.items():
+            g[node] = cost
+            parent[node] = None
+            h = abs(node_cols[node] - goal_col) + abs(node_rows[node] - goal_row) if goal_cell is not None else 0
+            heapq.heappush(open_set, (cost + h, cost, node))
+
+        best_cost, best_node = float('inf'), None
+        closed = set()
+        while open_set:
+            f, cost, node = heapq.heappop(open_set)
+            if f >= best_cost:
+                break
+            if node in closed or cost > g[node]:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            if node in goals and cost + goals[node] < best_cost:
+                best_cost, best_node = cost + goals[node], node
+            for neighbor, length, edge in node_edges[node]:
+                if region is not None and region_of[neighbor] != region:
+                    continue
+                new_cost = cost + length
+                if new_cost < g.get(neighbor, float('inf')):
+                    g[neighbor] = new_cost
+                    parent[neighbor] = (node, edge)
+                    h = (abs(node_cols[neighbor] - goal_col) + abs(node_rows[neighbor] - goal_row)
+                         if goal_cell is not None else 0)
+                    heapq.heappush(open_set, (new_cost + h, new_cost, neighbor))
+        return best_cost, best_node, g, parent
+
+    def node_path_cells(self, parent, node):
+        """Unwind search parents into the cells walked from the source node to node"""
+        steps = []
+        while parent[node] is not None:
+            previous, edge = parent[node]
+            steps.append((edge, previous))
+            node = previous
+        cells = []
+        for edge, from_node in reversed(steps):
+            cells.extend(self.edge_path(edge, from_node))
+        return node, cells
+
+    def find_path(self, start_col, start_row, target_col, target_row):
+        """Shortest path as a deque of (col, row), start excluded and target included"""
+        cols = self.maze.cols
+        start = start_row * cols + start_col
+        target = target_row * cols + target_col
+        if start == target:
+            return deque()
+        if self.maze.cells[start]:
+            # Spawned inside a wall: step out through the best open neighbour
+            best = None
+            for col, row in [(start_col + 1, start_row), (start_col - 1, start_row),
+                             (start_col, start_row + 1), (start_col, start_row - 1)]:
+                if (0 <= col < cols and 0 <= row < self.maze.rows and not self.maze.grid[row][col]):
+                    path = self.find_path(col, row, target_col, target_row)
+                    if (path or (col, row) == (target_col, target_row)) and (best is None or len(path) < len(best)):
+                        path.appendleft((col, row))
+                        best = path
+            return best or deque()
+        if self.hierarchy and self.hierarchy.is_long_range(start, target):
+            cells = self.hierarchy.find_path_cells(start, target)
+        else:
+            cells = self.find_path_cells(start, target)
+        return deque(divmod(cell, cols)[::-1] for cell in cells)
+
+    def find_path_cells(self, start, target):
+        sources = dict(self.attachments(start))
+        goals = dict(self.attachments(target))
+        if not sources or not goals:
+            return []
+
+        best_cost, best_node, g, parent = self.search(sources, goals, goal_cell=target)
+
+        # Start and target on the same corridor: walking straight along it may win
+        direct = None
+        if (self.cell_node[start] < 0 and self.cell_node[target] < 0 and
+                self.cell_edge[start] == self.cell_edge[target]):
+            corridor = self.edge_cells[self.cell_edge[start]]
+            start_offset, target_offset = self.cell_offset[start], self.cell_offset[target]
+            if abs(start_offset - target_offset) <= best_cost:
+                if start_offset < target_offset:
+                    direct = list(corridor[start_offset + 1:target_offset + 1])
+                else:
+                    direct = list(reversed(corridor[target_offset:start_offset]))
+        if direct is not None:
+            return direct
+        if best_node is None:
+            return []
+
+        first_node, middle = self.node_path_cells(parent, best_node)
+        cells = self.corridor_cells(start, first_node) + middle
+        if self.cell_node[target] < 0:
+            cells += list(reversed(self.corridor_cells(target, best_node)[:-1])) + [target]
+        return cells
+
+
+class HierarchicalGraph:
+    """HPA*-style abstract graph over square regions of a JunctionGraph.
+
+    Border nodes (those with an edge into another region) are linked by the
+    junction edges that cross regions and by precomputed shortest distances
+    inside each region. Long-range queries search this small graph and then
+    refine each abstract hop with a search confined to one region, so paths are
+    near-optimal rather than exact.
+    """
+
+    def __init__(self, graph, region_size):
+        self.graph = graph
+        self.region_size = region_size
+        self.expanded = 0  # Abstract nodes expanded so far, for benchmarking
+        regions_across = (graph.maze.cols + region_size - 1) // region_size
+        self.region_of = array('i', [(row // region_size) * regions_across + col // region_size
+                                     for col, row in zip(graph.node_cols, graph.node_rows)])
+        self.regions_across = regions_across
+
+        # Border nodes per region
+        self.region_borders = {}
+        for node, edges in enumerate(graph.node_edges):
+            region = self.region_of[node]
+            if any(self.region_of[neighbor] != region for neighbor, length, edge in edges):
+                self.region_borders.setdefault(region, []).append(node)
+
+        # Abstract edges: node -> [(neighbor, cost, edge or None for an intra-region hop)]
+        self.abstract_edges = {}
+        for region, borders in self.region_borders.items():
+            for node in borders:
+                links = self.abstract_edges.setdefault(node, [])
+                for neighbor, length, edge in graph.node_edges[node]:
+                    if self.region_of[neighbor] != region:
+                        links.append((neighbor, length, edge))
+                g = graph.search({node: 0}, {}, region=region, region_of=self.region_of)[2]
+                for border in borders:
+                    if border != node and border in g:
+                        links.append((border, g[border], None))
+        graph.expanded = 0  # Don't count construction in query statistics
+
+    def region_coords(self, cell):
+        row, col = divmod(cell, self.graph.maze.cols)
+        return col // self.region_size, row // self.region_size
+
+    def is_long_range(self, start, target):
+        start_x, start_y = self.region_coords(start)
+        target_x, target_y = self.region_coords(target)
+        return max(abs(start_x - target_x), abs(start_y - target_y)) > 1
+
+    def local_costs(self, cell):
+        """Costs from a cell to the border nodes of its region, with the local search parents"""
+        graph = self.graph
+        sources = dict(graph.attachments(cell))
+        if not sources:
+            return None, {}, {}
+        # Attachments of a corridor cell may lie in neighbouring regions; search each one's region
+        costs, parents = {}, {}
+        for node, distance in sources.items():
+            region = self.region_of[node]
+            g, parent = graph.search({node: distance}, {}, region=region, region_of=self.region_of)[2:]
+            for border in self.region_borders.get(region, []):
+                if border in g and g[border] < costs.get(border, float('inf')):
+                    costs[border] = g[border]
+                    parents[border] = (node, parent)
+        return sources, costs, parents
+
+    def find_path_cells(self, start, target):
+        graph = self.graph
+        start_sources, start_costs, start_parents = self.local_costs(start)
+        target_sources, target_costs, target_parents = self.local_costs(target)
+        if not start_costs or not target_costs:
+            return graph.find_path_cells(start, target)
+
+        # Abstract A* from the start's border nodes to the target's border nodes
+        target_row, target_col = divmod(target, graph.maze.cols)
+        g = dict(start_costs)
+        came_from = {node: None for node in start_costs}
+        open_set = []
+        for node, cost in start_costs.items():
+            h = abs(graph.node_cols[node] - target_col) + abs(graph.node_rows[node] - target_row)
+            heapq.heappush(open_set, (cost + h, cost, node))
+        best_cost, best_node = float('inf'), None
+        closed = set()
+        while open_set:
+            f, cost, node = heapq.heappop(open_set)
+            if f >= best_cost:
+                break
+            if node in closed or cost > g[node]:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            if node in target_costs and cost + target_costs[node] < best_cost:
+                best_cost, best_node = cost + target_costs[node], node
+            for neighbor, length, edge in self.abstract_edges.get(node, []):
+                new_cost = cost + length
+                if new_cost < g.get(neighbor, float('inf')):
+                    g[neighbor] = new_cost
+                    came_from[neighbor] = (node, edge)
+                    h = abs(graph.node_cols[neighbor] - target_col) + abs(graph.node_rows[neighbor] - target_row)
+                    heapq.heappush(open_set, (new_cost + h, new_cost, neighbor))
+        if best_node is None:
+            return []
+
+        # Refine: start -> first border, abstract hops, last border -> target
+        hops = []
+        node = best_node
+        while came_from[node] is not None:
+            previous, edge = came_from[node]
+            hops.append((previous, node, edge))
+            node = previous
+        hops.reverse()
+        first_border = node
+
+        attach_node, parent = start_parents[first_border]
+        path_start, cells = graph.node_path_cells(parent, first_border)
+        cells = graph.corridor_cells(start, attach_node) + cells
+
+        for previous, node, edge in hops:
+            if edge is not None:
+                cells += graph.edge_path(edge, previous)
+            else:
+                region = self.region_of[node]
+                parent = graph.search({previous: 0}, {node: 0}, goal_cell=graph.node_cells[node],
+                                      region=region, region_of=self.region_of)[3]
+                cells += graph.node_path_cells(parent, node)[1]
+
+        attach_node, parent = target_parents[best_node]
+        back = graph.node_path_cells(parent, best_node)[1]
+        # back runs attach_node -> best_node; walk it the other way
+        forward = list(reversed(back[:-1])) + ([graph.node_cells[attach_node]] if back else [])
+        cells += forward
+        if graph.cell_node[target] < 0:
+            cells += list(reversed(graph.corridor_cells(target, attach_node)[:-1])) + [target]
+        return cells
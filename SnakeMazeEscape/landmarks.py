@@ -0,0 +1,83 @@
+from array import array
+
+class Landmarks:
+    """Precomputed BFS distances from a few landmark cells, for ALT heuristics.
+
+    By the triangle inequality, |d(L, target) - d(L, cell)| never overestimates the
+    true maze distance from cell to target, and unlike Manhattan distance it knows
+    about walls. Landmarks are picked farthest-first so they sit at the maze's
+    extremities, where the bound is tightest.
+    """
+
+    COUNT = 6  # Landmarks per maze; each costs one BFS and one array of cols * rows
+
+    def __init__(self, maze, count=None):
+        self.maze = maze
+        self.edits_seen = len(maze.cell_edits)
+        size = maze.cols * maze.rows
+        # Smallest unsigned type that can hold every distance plus the unreached marker
+        self.typecode = 'H' if size < 0xFFFF else 'I'
+        self.UNREACHED = 0xFFFF if self.typecode == 'H' else 0xFFFFFFFF
+        self.cells = []      # Flat index of each landmark
+        self.distances = []  # One distance array per landmark, UNREACHED for walls
+        self.choose(count or self.COUNT)
+
+    def choose(self, count):
+        maze = self.maze
+        open_cells = [cell for cell in range(len(maze.cells)) if not maze.cells[cell]]
+        if not open_cells:
+            return
+
+        # Seed with the cell farthest from a random one, then keep adding the
+        # cell farthest from all landmarks chosen so far
+        nearest = self.bfs(maze.rng.choice(open_cells))
+        for _ in range(count):
+            farthest = max(open_cells, key=nearest.__getitem__)
+            if farthest in self.cells:
+                break  # Every open cell is already a landmark
+            distance = self.bfs(farthest)
+            self.cells.append(farthest)
+            self.distances.append(distance)
+            nearest = array(self.typecode, map(min, nearest, distance)) if len(self.cells) > 1 else distance
+
+    def bfs(self, source):
+        maze = self.maze
+        open_directions, neighbor_steps = maze.open_directions, maze.neighbor_steps
+        distance = array(self.typecode, [self.UNREACHED]) * len(maze.cells)
+        distance[source] = 0
+        frontier = [source]
+        step_distance = 0
+        while frontier:
+            step_distance += 1
+            next_frontier = []
+            for current in frontier:
+                for step in neighbor_steps[open_directions[current]]:
+                    neighbor = current + step
+                    if distance[neighbor] == self.UNREACHED:
+                        distance[neighbor] = step_distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distance
+
+    def heuristic_to(self, target):
+        """Return a function giving the ALT lower bound from a flat cell to target.
+
+        The bound changes by exactly 1 per step only between open cells reached from
+        target, so callers must not evaluate it at walls. Returns None when no
+        landmark reaches target (a wall, or a sealed-off pocket).
+        """
+        pairs = [(distance, distance[target]) for distance in self.distances
+                 if distance[target] != self.UNREACHED]
+        if not pairs:
+            return None
+
+        def heuristic(cell):
+            best = 0
+            for distance, to_target in pairs:
+                bound = distance[cell] - to_target
+                if bound < 0:
+                    bound = -bound
+                if bound > best:
+                    best = bound
+            return best
+        return heuristic
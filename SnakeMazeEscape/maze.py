@@ -1,10 +1,14 @@
-import pygame
 import random
+from array import array
 from collections import deque
+from flow_field import FlowField
+from junction_graph import JunctionGraph
+from landmarks import Landmarks
 
 class Maze:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, food_spawn_rate=0.08):
         self.width = width
+        self.rng = rng or random  # Source of randomness, a random.Random for reproducible games
         self.height = height
         self.CELL_SIZE = 20
         self.cols = width // self.CELL_SIZE
@@ -28,135 +32,369 @@ class Maze:
         self.entrance_pos = (1, 1)
         self.exit_pos = (self.cols - 2, self.rows - 2)
         
-        self.food_positions = self.place_food()
+        # Food pellets indexed by (col, row) -> pixel centre for O(1) lookup and removal
+        self.FOOD_SPAWN_RATE = food_spawn_rate
+        self.food_cells = self.place_food()
+        
+        # Log of (col, row) cells opened or closed at runtime, read by planners
+        self.cell_edits = []
+        
+        # Open-neighbour table, plus reusable A* buffers allocated on first search
+        self.build_adjacency()
+        self.search_stamp = None
+        self.search_generation = 0
+        
+        # Corridor-contracted junction graph and ALT landmarks, built on first use
+        self.junction_graph = None
+        self.landmarks = None
+        
+        # Chebyshev distance in cells from each cell to the nearest wall, for swept bullets
+        self.wall_clearance = None
+        self.clearance_edits_seen = 0
+        
+        # Shared BFS field toward the snake, read by every enemy
+        self.flow_field = FlowField(self)
+        
+        # Cells whose wall or food changed since the renderer last repainted them
+        self.dirty_tiles = set()
         
     def generate_complex_maze(self):
-        # Initialize grid - all walls
-        grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
+        cols, rows = self.cols, self.rows
         
-        # Recursive backtracking maze generation
-        def carve_maze(x, y):
-            grid[y][x] = 0  # Mark current cell as path
+        # Initialize grid - all walls, stored as one flat row-major buffer
+        cells = bytearray(b'\x01') * (cols * rows)
+        
+        # Iterative backtracking maze generation (explicit stack, no recursion limit)
+        # Carvable cells sit on odd coordinates; the mask is padded so that
+        # out-of-range neighbours read as already visited without bounds checks
+        unvisited = bytearray(len(cells) + 2 * cols)
+        for y in range(1, rows - 1, 2):
+            unvisited[y * cols + 1:(y + 1) * cols - 1:2] = b'\x01' * (cols // 2)
+        
+        rng = self.rng
+        start_x = rng.randrange(1, cols - 1, 2)
+        start_y = rng.randrange(1, rows - 1, 2)
+        start = start_y * cols + start_x
+        cells[start] = 0  # Mark start cell as path
+        unvisited[start] = 0
+        stack = [start]
+        north, south = -2 * cols, 2 * cols
+        
+        while stack:
+            current = stack[-1]
             
-            # Get all possible directions (N, S, E, W)
-            directions = [(0, -2), (0, 2), (2, 0), (-2, 0)]
-            random.shuffle(directions)
+            # Collect unvisited cells two steps away (N, S, E, W)
+            options = []
+            if unvisited[current + north]:
+                options.append(north)
+            if unvisited[current + south]:
+                options.append(south)
+            if unvisited[current + 2]:
+                options.append(2)
+            if unvisited[current - 2]:
+                options.append(-2)
             
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                
-                # Check if the new position is valid and unvisited
-                if (0 < nx < self.cols - 1 and 0 < ny < self.rows - 1 and 
-                    grid[ny][nx] == 1):
-                    # Carve the wall between current and next cell
-                    grid[y + dy // 2][x + dx // 2] = 0
-                    carve_maze(nx, ny)
-        
-        # Start from random odd position
-        start_x = random.randrange(1, self.cols - 1, 2)
-        start_y = random.randrange(1, self.rows - 1, 2)
-        carve_maze(start_x, start_y)
+            if not options:
+                stack.pop()  # Dead end - backtrack
+                continue
+            
+            step = options[int(rng.random() * len(options))]
+            next_cell = current + step
+            cells[current + step // 2] = 0  # Carve the wall between current and next cell
+            cells[next_cell] = 0
+            unvisited[next_cell] = 0
+            stack.append(next_cell)
         
         # Add some random loops to make it more interesting
-        for _ in range(self.cols * self.rows // 20):
-            x = random.randrange(1, self.cols - 1)
-            y = random.randrange(1, self.rows - 1)
-            if grid[y][x] == 1:  # If it's a wall
+        for _ in range(cols * rows // 20):
+            x = rng.randrange(1, cols - 1)
+            y = rng.randrange(1, rows - 1)
+            index = y * cols + x
+            if cells[index] == 1:  # If it's a wall
                 # Check if removing this wall creates a loop
-                neighbors = 0
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    if (0 <= x + dx < self.cols and 0 <= y + dy < self.rows and 
-                        grid[y + dy][x + dx] == 0):
-                        neighbors += 1
+                neighbors = ((not cells[index + cols]) + (not cells[index + 1]) +
+                             (not cells[index - cols]) + (not cells[index - 1]))
                 if neighbors >= 2:  # Creates a loop
-                    grid[y][x] = 0
+                    cells[index] = 0
         
         # Ensure entrance and exit are accessible with buffer zones
-        # Entrance safe zone (3x3 area)
-        for dy in range(-1, 2):
-            for dx in range(-1, 2):
-                entrance_x, entrance_y = 1 + dx, 1 + dy
-                if 0 <= entrance_x < self.cols and 0 <= entrance_y < self.rows:
-                    grid[entrance_y][entrance_x] = 0
-        
-        # Exit safe zone (3x3 area)
-        for dy in range(-1, 2):
-            for dx in range(-1, 2):
-                exit_x, exit_y = self.cols - 2 + dx, self.rows - 2 + dy
-                if 0 <= exit_x < self.cols and 0 <= exit_y < self.rows:
-                    grid[exit_y][exit_x] = 0
+        # Entrance safe zone (3x3 area) and exit safe zone (3x3 area)
+        for center_x, center_y in ((1, 1), (cols - 2, rows - 2)):
+            for dy in range(-1, 2):
+                for dx in range(-1, 2):
+                    zone_x, zone_y = center_x + dx, center_y + dy
+                    if 0 <= zone_x < cols and 0 <= zone_y < rows:
+                        cells[zone_y * cols + zone_x] = 0
         
         # Ensure path from entrance to main maze
-        grid[1][2] = 0  # Right of entrance
-        grid[2][1] = 0  # Below entrance
-        grid[1][3] = 0  # Further right
-        grid[3][1] = 0  # Further below
+        cells[1 * cols + 2] = 0  # Right of entrance
+        cells[2 * cols + 1] = 0  # Below entrance
+        cells[1 * cols + 3] = 0  # Further right
+        cells[3 * cols + 1] = 0  # Further below
         
-        return grid
+        # grid[row][col] rows are writable views into the flat buffer
+        self.cells = cells
+        view = memoryview(cells)
+        return [view[row * cols:(row + 1) * cols] for row in range(rows)]
         
     def place_food(self):
-        food = []
+        food = {}
         for i in range(self.rows):
             for j in range(self.cols):
-                if self.grid[i][j] == 0 and random.random() < 0.08:
-                    food.append((j * self.CELL_SIZE + self.CELL_SIZE//2, 
-                               i * self.CELL_SIZE + self.CELL_SIZE//2))
+                if self.cells[i * self.cols + j] == 0 and self.rng.random() < self.FOOD_SPAWN_RATE:
+                    food[(j, i)] = (j * self.CELL_SIZE + self.CELL_SIZE//2, 
+                                    i * self.CELL_SIZE + self.CELL_SIZE//2)
         return food
+    
+    @property
+    def food_positions(self):
+        """Iterate over the pixel centres of all remaining food pellets"""
+        return self.food_cells.values()
+        
+    def invalidate_tile(self, col, row):
+        """Mark a cell for re-rendering after its wall or food state changed"""
+        self.dirty_tiles.add((col, row))
         
-    def draw(self, screen):
-        # Draw maze grid
-        for row in range(self.rows):
-            for col in range(self.cols):
-                x = col * self.CELL_SIZE
-                y = row * self.CELL_SIZE
-                
-                if self.grid[row][col] == 1:  # Wall
-                    pygame.draw.rect(screen, self.WALL_COLOR, (x, y, self.CELL_SIZE, self.CELL_SIZE))
-                else:  # Path
-                    pygame.draw.rect(screen, self.PATH_COLOR, (x, y, self.CELL_SIZE, self.CELL_SIZE))
-        
-        # Draw entrance (green)
-        entrance_x = self.entrance_pos[0] * self.CELL_SIZE
-        entrance_y = self.entrance_pos[1] * self.CELL_SIZE
-        pygame.draw.rect(screen, self.ENTRANCE_COLOR, 
-                        (entrance_x, entrance_y, self.CELL_SIZE, self.CELL_SIZE))
-        pygame.draw.rect(screen, (255, 255, 255), 
-                        (entrance_x, entrance_y, self.CELL_SIZE, self.CELL_SIZE), 2)
-        
-        # Draw exit (purple)
-        exit_x = self.exit_pos[0] * self.CELL_SIZE
-        exit_y = self.exit_pos[1] * self.CELL_SIZE
-        pygame.draw.rect(screen, self.EXIT_COLOR, 
-                        (exit_x, exit_y, self.CELL_SIZE, self.CELL_SIZE))
-        pygame.draw.rect(screen, (255, 255, 255), 
-                        (exit_x, exit_y, self.CELL_SIZE, self.CELL_SIZE), 2)
-        
-        # Draw labels
-        font = pygame.font.Font(None, 16)
-        start_text = font.render("START", True, (255, 255, 255))
-        screen.blit(start_text, (entrance_x + 2, entrance_y + 2))
-        
-        exit_text = font.render("EXIT", True, (255, 255, 255))
-        screen.blit(exit_text, (exit_x + 2, exit_y + 2))
-        
-        # Draw food
-        for food_pos in self.food_positions:
-            pygame.draw.circle(screen, self.FOOD_COLOR, 
-                             (int(food_pos[0]), int(food_pos[1])), 6)
-                             
     def is_wall(self, x, y):
         col = int(x) // self.CELL_SIZE
         row = int(y) // self.CELL_SIZE
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.grid[row][col] == 1
+            return self.cells[row * self.cols + col] == 1
         return True
         
+    def build_adjacency(self):
+        """Precompute a 4-bit open-neighbour mask for every cell (W=1, E=2, N=4, S=8).
+        
+        neighbor_steps[open_directions[i]] is then the tuple of flat-index steps
+        from cell i to its open neighbours.
+        """
+        cols, rows = self.cols, self.rows
+        size = cols * rows
+        
+        # Treat the grid as one big integer with a 0/1 byte per cell, so each
+        # direction is a single shift instead of a Python loop over cells
+        open_cells = int.from_bytes(self.cells.translate(bytes([1, 0]) + bytes(254)), 'little')
+        not_first_col = int.from_bytes((b'\x00' + b'\x01' * (cols - 1)) * rows, 'little')
+        not_last_col = int.from_bytes((b'\x01' * (cols - 1) + b'\x00') * rows, 'little')
+        west = (open_cells << 8) & not_first_col
+        east = (open_cells >> 8) & not_last_col
+        north = (open_cells << (8 * cols)) & ((1 << (8 * size)) - 1)
+        south = open_cells >> (8 * cols)
+        masks = west | (east << 1) | (north << 2) | (south << 3)
+        self.open_directions = bytearray(masks.to_bytes(size, 'little'))
+        
+        steps = (-1, 1, -cols, cols)
+        self.neighbor_steps = tuple(tuple(step for bit, step in enumerate(steps) if mask & (1 << bit))
+                                    for mask in range(16))
+    
+    def update_adjacency(self, col, row):
+        """Refresh the open-neighbour masks around a single edited cell"""
+        for dx, dy in [(0, 0), (0, 1), (1, 0), (0, -1), (-1, 0)]:
+            cell_col, cell_row = col + dx, row + dy
+            if not (0 <= cell_col < self.cols and 0 <= cell_row < self.rows):
+                continue
+            index = cell_row * self.cols + cell_col
+            mask = 0
+            if cell_col > 0 and not self.cells[index - 1]:
+                mask |= 1
+            if cell_col < self.cols - 1 and not self.cells[index + 1]:
+                mask |= 2
+            if cell_row > 0 and not self.cells[index - self.cols]:
+                mask |= 4
+            if cell_row < self.rows - 1 and not self.cells[index + self.cols]:
+                mask |= 8
+            self.open_directions[index] = mask
+    
+    def search_buffers(self):
+        """Return shared (g_score, parent, stamp, closed, generation) arrays for one A* search.
+        
+        Entries are only valid where stamp[i] (or closed[i]) == generation, so
+        bumping the generation clears the buffers without touching them.
+        """
+        if self.search_stamp is None or self.search_generation >= 0xFFFFFFFF:
+            size = self.cols * self.rows
+            self.search_g = array('i', [0]) * size
+            self.search_parent = array('i', [-1]) * size
+            self.search_stamp = array('I', [0]) * size
+            self.search_closed = array('I', [0]) * size
+            self.search_generation = 0
+        self.search_generation += 1
+        return (self.search_g, self.search_parent, self.search_stamp, 
+                self.search_closed, self.search_generation)
+    
+    def get_junction_graph(self):
+        """Return the junction graph, rebuilding it if walls were edited since it was built"""
+        if self.junction_graph is None or self.junction_graph.edits_seen != len(self.cell_edits):
+            self.junction_graph = JunctionGraph(self)
+        return self.junction_graph
+    
+    def get_landmarks(self):
+        """Return the A* landmarks, re-choosing them if walls were edited since"""
+        if self.landmarks is None or self.landmarks.edits_seen != len(self.cell_edits):
+            self.landmarks = Landmarks(self)
+        return self.landmarks
+    
+    def get_wall_clearance(self):
+        """Return the wall clearance field, rebuilding it if walls were edited since"""
+        if self.wall_clearance is None or self.clearance_edits_seen != len(self.cell_edits):
+            self.build_wall_clearance()
+        return self.wall_clearance
+    
+    def build_wall_clearance(self):
+        """Chebyshev distance transform of the wall cells (walls = 0, capped at 255).
+        
+        A cell with clearance c has no wall within c - 1 cells in any direction,
+        so anything moving less than c - 1 cells from it cannot reach a wall.
+        Cells outside the grid count as walls.
+        """
+        cols, rows = self.cols, self.rows
+        cells = self.cells
+        clearance = bytearray(len(cells))
+        # Forward pass (W, NW, N, NE), seeded with the distance to the grid edge
+        for row in range(rows):
+            base = row * cols
+            for col in range(cols):
+                index = base + col
+                if cells[index]:
+                    continue
+                best = min(col + 1, row + 1, cols - col, rows - row, 255)
+                if col > 0 and clearance[index - 1] < best:
+                    best = clearance[index - 1] + 1
+                if row > 0:
+                    above = index - cols
+                    for neighbor in ((above - 1, above, above + 1) if 0 < col < cols - 1 else
+                                     (above, above + 1) if col == 0 else (above - 1, above)):
+                        if clearance[neighbor] + 1 < best:
+                            best = clearance[neighbor] + 1
+                clearance[index] = best
+        # Backward pass (E, SE, S, SW)
+        for row in range(rows - 1, -1, -1):
+            base = row * cols
+            for col in range(cols - 1, -1, -1):
+                index = base + col
+                best = clearance[index]
+                if best <= 1:
+                    continue
+                if col < cols - 1 and clearance[index + 1] + 1 < best:
+                    best = clearance[index + 1] + 1
+                if row < rows - 1:
+                    below = index + cols
+                    for neighbor in ((below - 1, below, below + 1) if 0 < col < cols - 1 else
+                                     (below, below + 1) if col == 0 else (below - 1, below)):
+                        if clearance[neighbor] + 1 < best:
+                            best = clearance[neighbor] + 1
+                clearance[index] = best
+        self.wall_clearance = clearance
+        
+        # Open cells between each cell and the nearest wall to its W, E, N and S,
+        # so straight horizontal or vertical sweeps need no grid walk at all
+        west, east = array('H', [0]) * len(cells), array('H', [0]) * len(cells)
+        north, south = array('H', [0]) * len(cells), array('H', [0]) * len(cells)
+        for row in range(rows):
+            base = row * cols
+            for col in range(1, cols):
+                if not cells[base + col] and not cells[base + col - 1]:
+                    west[base + col] = west[base + col - 1] + 1
+            for col in range(cols - 2, -1, -1):
+                if not cells[base + col] and not cells[base + col + 1]:
+                    east[base + col] = east[base + col + 1] + 1
+        for index in range(cols, len(cells)):
+            if not cells[index] and not cells[index - cols]:
+                north[index] = north[index - cols] + 1
+        for index in range(len(cells) - cols - 1, -1, -1):
+            if not cells[index] and not cells[index + cols]:
+                south[index] = south[index + cols] + 1
+        self.open_runs = (west, east, north, south)
+        self.clearance_edits_seen = len(self.cell_edits)
+    
+    def sweep(self, x, y, dx, dy):
+        """Trace the segment from (x, y) to (x + dx, y + dy) through the grid.
+        
+        Returns the fraction t in [0, 1] of the way along where it first enters
+        a wall (or leaves the grid), or None if the whole segment is clear. This
+        is a DDA grid walk that uses wall_clearance to jump over every cell it
+        knows is open instead of stepping one cell at a time.
+        """
+        cols, rows, size = self.cols, self.rows, self.CELL_SIZE
+        cells = self.cells
+        clearance = self.get_wall_clearance()
+        col, row = int(x // size), int(y // size)
+        if not (0 <= col < cols and 0 <= row < rows) or cells[row * cols + col]:
+            return 0.0
+        
+        if not dx or not dy:
+            # Straight along a row or column: the wall is at the end of the open run
+            west, east, north, south = self.open_runs
+            index = row * cols + col
+            if dx > 0:
+                t = ((col + east[index] + 1) * size - x) / dx
+            elif dx < 0:
+                t = ((col - west[index]) * size - x) / dx
+            elif dy > 0:
+                t = ((row + south[index] + 1) * size - y) / dy
+            elif dy < 0:
+                t = ((row - north[index]) * size - y) / dy
+            else:
+                return None  # Not moving
+            return t if t <= 1.0 else None
+        
+        t = 0.0
+        while True:
+            if not (0 <= col < cols and 0 <= row < rows) or cells[row * cols + col]:
+                return t
+            # Every cell within reach of (col, row) is open: jump to the edge of that box
+            reach = clearance[row * cols + col] - 1
+            exit_x = exit_y = 2.0  # Past the end of the segment
+            if dx > 0:
+                exit_x = ((col + reach + 1) * size - x) / dx
+            elif dx < 0:
+                exit_x = ((col - reach) * size - x) / dx
+            if dy > 0:
+                exit_y = ((row + reach + 1) * size - y) / dy
+            elif dy < 0:
+                exit_y = ((row - reach) * size - y) / dy
+            t = min(exit_x, exit_y)
+            if t > 1.0:
+                return None
+            
+            # Step into the cell just beyond the box on the axis (or axes) crossed
+            next_col = int((x + t * dx) // size)
+            next_row = int((y + t * dy) // size)
+            if t == exit_x:
+                next_col = col + reach + 1 if dx > 0 else col - reach - 1
+            if t == exit_y:
+                next_row = row + reach + 1 if dy > 0 else row - reach - 1
+            if exit_x == exit_y:
+                # Crossing exactly through a corner: don't slip between two diagonal walls
+                back_col = next_col - 1 if dx > 0 else next_col + 1
+                back_row = next_row - 1 if dy > 0 else next_row + 1
+                for side_col, side_row in ((next_col, back_row), (back_col, next_row)):
+                    if (not (0 <= side_col < cols and 0 <= side_row < rows) or
+                            cells[side_row * cols + side_col]):
+                        return t
+            col, row = next_col, next_row
+    
+    def set_wall(self, col, row, wall):
+        """Open or close a cell at runtime and notify planners and the renderer"""
+        index = row * self.cols + col
+        if self.cells[index] == int(wall):
+            return
+        self.cells[index] = int(wall)
+        self.cell_edits.append((col, row))
+        self.update_adjacency(col, row)
+        self.invalidate_tile(col, row)
+        
     def check_food_collision(self, x, y, radius):
-        for i, food_pos in enumerate(self.food_positions):
-            distance = ((int(x) - food_pos[0])**2 + (int(y) - food_pos[1])**2)**0.5
-            if distance < radius + 6:
-                self.food_positions.pop(i)
-                return True
+        x, y = int(x), int(y)
+        reach = radius + 6
+        # Only cells overlapping the pickup circle can hold a pellet in range
+        for row in range((y - reach) // self.CELL_SIZE, (y + reach) // self.CELL_SIZE + 1):
+            for col in range((x - reach) // self.CELL_SIZE, (x + reach) // self.CELL_SIZE + 1):
+                food_pos = self.food_cells.get((col, row))
+                if food_pos and (x - food_pos[0])**2 + (y - food_pos[1])**2 < reach * reach:
+                    del self.food_cells[(col, row)]
+                    self.invalidate_tile(col, row)
+                    return True
         return False
         
     def is_exit(self, x, y):
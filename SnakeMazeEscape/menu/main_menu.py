@@ -1,13 +1,14 @@
 import pygame
+from text_cache import TEXT
 import sys
 
 class MainMenu:
     def __init__(self, screen, sound_manager):
         self.screen = screen
         self.sound_manager = sound_manager
-        self.font_large = pygame.font.Font(None, 64)
-        self.font_medium = pygame.font.Font(None, 40)
-        self.font_small = pygame.font.Font(None, 28)
+        self.size_large = 64  # Font sizes; text goes through the shared TEXT cache
+        self.size_medium = 40
+        self.size_small = 28
         
         # Menu state
         self.selected_option = 0
@@ -113,7 +114,7 @@ class MainMenu:
         self.screen.fill(self.BLACK)
         
         # Game Title
-        title_text = self.font_large.render("SNAKEY MAZE", True, self.GREEN)
+        title_text = TEXT.render("SNAKEY MAZE", self.size_large, self.GREEN)
         title_rect = title_text.get_rect(center=(400, 100))
         self.screen.blit(title_text, title_rect)
         
@@ -143,7 +144,7 @@ class MainMenu:
             else:
                 text = option
             
-            option_text = self.font_medium.render(text, True, color)
+            option_text = TEXT.render(text, self.size_medium, color)
             option_rect = option_text.get_rect(center=(400, y_start + i * 50))
             self.screen.blit(option_text, option_rect)
             
@@ -170,16 +171,16 @@ class MainMenu:
         
         instructions_y_start = y_start + len(self.menu_options) * 50 + 30  # 30px gap after menu
         for i, instruction in enumerate(nav_instructions):
-            inst_text = self.font_small.render(instruction, True, self.WHITE)
+            inst_text = TEXT.render(instruction, self.size_small, self.WHITE)
             inst_rect = inst_text.get_rect(center=(400, instructions_y_start + i * 25))
             self.screen.blit(inst_text, inst_rect)
 
 class ControlsScreen:
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 64)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 36)
+        self.size_large = 64  # Font sizes; text goes through the shared TEXT cache
+        self.size_medium = 48
+        self.size_small = 36
         
         self.WHITE = (255, 255, 255)
         self.GREEN = (0, 255, 0)
@@ -196,7 +197,7 @@ class ControlsScreen:
         self.screen.fill(self.BLACK)
         
         # Title
-        title_text = self.font_large.render("HOW TO PLAY", True, self.GREEN)
+        title_text = TEXT.render("HOW TO PLAY", self.size_large, self.GREEN)
         title_rect = title_text.get_rect(center=(400, 80))
         self.screen.blit(title_text, title_rect)
         
@@ -221,16 +222,16 @@ class ControlsScreen:
         for i, control in enumerate(controls):
             if control.endswith(":"):
                 color = self.YELLOW
-                font = self.font_medium
+                size = self.size_medium
             elif control == "":
                 continue
             else:
                 color = self.WHITE
-                font = self.font_small
+                size = self.size_small
             
-            control_text = font.render(control, True, color)
+            control_text = TEXT.render(control, size, color)
             self.screen.blit(control_text, (100, y_start + i * 35))
         
         # Back instruction - moved to top right
-        back_text = self.font_small.render("ESC: Back to Menu", True, self.WHITE)
+        back_text = TEXT.render("ESC: Back to Menu", self.size_small, self.WHITE)
         self.screen.blit(back_text, (600, 20))
\ No newline at end of file
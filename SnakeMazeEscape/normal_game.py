@@ -1,20 +1,25 @@
 import pygame
-import sys
 import random
 from maze import Maze
 from snake import Snake
 from enemy import Enemy
-from sounds import SoundManager
+from ai_scheduler import AIScheduler
+from broadphase import Broadphase
+from sim_clock import SimClock
+from game_state import DIRECTION_NAMES, SHOOT
+from frontend import Renderer, action_from_keys, play_events
+from text_cache import TEXT
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 BLACK = (0, 0, 0)
 
 class NormalGame:
-    def __init__(self, screen, sound_manager, timer_minutes):
+    def __init__(self, screen, sound_manager, timer_minutes, sim_clock=None):
         self.screen = screen
         self.sound_manager = sound_manager
-        self.clock = pygame.time.Clock()
+        self.sim_clock = sim_clock or SimClock()  # Game time, advanced one fixed tick per update()
+        self.renderer = Renderer()
         self.timer_minutes = timer_minutes
         self.reset_game_state()
     
@@ -26,7 +31,7 @@ class NormalGame:
         # Timer settings
         self.session_timer = self.timer_minutes * 60 * 1000 if self.timer_minutes > 0 else 0
         self.timer_start_delay = 2 * 60 * 1000  # 2 minutes delay
-        self.game_start_time = pygame.time.get_ticks()
+        self.game_start_time = self.sim_clock.now
         self.timer_started = False
         self.timer_enabled = self.timer_minutes > 0
         
@@ -37,13 +42,15 @@ class NormalGame:
         # Fresh snake at entrance
         entrance_x = 1 * 20 + 10
         entrance_y = 1 * 20 + 10
-        self.snake = Snake(entrance_x, entrance_y, self.sound_manager)
+        self.snake = Snake(entrance_x, entrance_y)
         
         # Reset enemy system
         self.enemies = []
         self.enemy_spawn_delay = 10000  # 10 seconds
         self.enemies_spawned = False
         self.enemy_spawn_time = 0
+        self.ai_scheduler = AIScheduler()  # Enemy updates and replans within a per-frame budget
+        self.broadphase = Broadphase()     # Collision buckets, rebuilt every tick
         
         # Reset power-ups
         self.stun_fruit = None
@@ -60,37 +67,38 @@ class NormalGame:
         # Enemy 1: Far from snake spawn (entrance is at 30, 30)
         enemy1_x = SCREEN_WIDTH - 100  # Right side
         enemy1_y = 100
-        enemy1 = Enemy(enemy1_x, enemy1_y, self.sound_manager)
+        enemy1 = Enemy(enemy1_x, enemy1_y)
         enemy1.SHOOT_DELAY = 1000  # More frequent shooting
         
         # Enemy 2: Bottom area, far from entrance
         enemy2_x = SCREEN_WIDTH // 2
         enemy2_y = SCREEN_HEIGHT - 100
-        enemy2 = Enemy(enemy2_x, enemy2_y, self.sound_manager)
+        enemy2 = Enemy(enemy2_x, enemy2_y)
         enemy2.SHOOT_DELAY = 1000  # More frequent shooting
         
         self.enemies = [enemy1, enemy2]
         
     def spawn_power_ups(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.now
         
         # Spawn stun fruit (rare) - larger blue fruit
         if not self.stun_fruit and random.randint(1, 500) == 1:
             x = random.randint(100, SCREEN_WIDTH - 100)
             y = random.randint(100, SCREEN_HEIGHT - 100)
-            if not self.maze.is_wall(x, y):
+            if not self.maze.is_wall(x, y) and not self.snake.occupies(x, y):
                 self.stun_fruit = {'x': x, 'y': y, 'spawn_time': current_time}
         
         # Spawn shield fruit (rare) - green fruit
         if not self.shield_fruit and random.randint(1, 400) == 1:
             x = random.randint(100, SCREEN_WIDTH - 100)
             y = random.randint(100, SCREEN_HEIGHT - 100)
-            if not self.maze.is_wall(x, y):
+            if not self.maze.is_wall(x, y) and not self.snake.occupies(x, y):
                 self.shield_fruit = {'x': x, 'y': y, 'spawn_time': current_time}
     
     def check_ping_alert(self):
         self.ping_alert = False
-        for enemy in self.enemies:
+        # Only enemies inside the 150 px box around the snake can pass the distance check
+        for enemy in self.broadphase.query_box('enemy', self.snake.head_x, self.snake.head_y, 150, 150):
             if enemy.stunned:
                 continue
                 
@@ -112,10 +120,15 @@ class NormalGame:
                         break
     
     def update(self):
+        """Run one fixed tick, then advance the game clock past it"""
+        self.simulate()
+        self.sim_clock.advance()
+    
+    def simulate(self):
         if self.game_state != 'playing':
             return
             
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.now
         
         # Enemy spawn logic
         elapsed_time = current_time - self.game_start_time
@@ -123,7 +136,6 @@ class NormalGame:
             self.spawn_enemies()
             self.enemies_spawned = True
             self.enemy_spawn_time = current_time
-            print("Enemies spawned in Normal mode")
         
         # Timer logic (only if enabled)
         if self.timer_enabled:
@@ -139,11 +151,11 @@ class NormalGame:
                     return
         
         # Update snake
-        self.snake.update(self.maze)
+        action = action_from_keys(pygame.key.get_pressed())
+        self.snake.update(self.maze, self.sim_clock, DIRECTION_NAMES[action & 7], bool(action & SHOOT))
         
         # Handle super stun
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE] and self.super_stun_available:
+        if action & SHOOT and self.super_stun_available:
             # Super stun all enemies
             for enemy in self.enemies:
                 enemy.stunned = True
@@ -154,36 +166,43 @@ class NormalGame:
         
         # Update enemies only if spawned and game is playing
         if self.enemies_spawned and self.game_state == 'playing':
+            self.ai_scheduler.update(self.enemies, self.snake.head_x, self.snake.head_y, self.maze,
+                                     self.sim_clock)
+        
+        # Bin everything that can collide this tick
+        grid = self.broadphase
+        grid.clear()
+        for enemy in self.enemies:
+            grid.insert('enemy', enemy, enemy.x, enemy.y)
+            grid.insert_bullets('enemy_bullet', enemy.bullets)
+        grid.insert_bullets('snake_bullet', self.snake.bullets)
+        for name, fruit in (('stun', self.stun_fruit), ('shield', self.shield_fruit)):
+            if fruit:
+                grid.insert('fruit', name, fruit['x'], fruit['y'])
+        
+        # Box overlaps match the old Rect tests: snake head 16x16, enemies 20x20, bullets 8x8
+        head_x, head_y = self.snake.head_x, self.snake.head_y
+        if self.enemies_spawned:
+            # Enemy bullets hitting snake
+            for pool, slot in grid.query_box('enemy_bullet', head_x, head_y, 12, 12):
+                pool.kill(slot)
+                if not self.shield_active and self.snake.ammo > 0:
+                    self.snake.ammo -= 1
+            
+            # Physical collision with snake
+            if not self.shield_active:
+                for enemy in grid.query_box('enemy', head_x, head_y, 18, 18):
+                    if not enemy.stunned:
+                        self.sound_manager.play('game_over')
+                        self.game_state = 'game_over'
+                        return
+            
+            # Snake bullets hitting enemies
             for enemy in self.enemies:
-                if enemy and hasattr(enemy, 'x') and hasattr(enemy, 'y'):
-                    enemy.update(self.snake.head_x, self.snake.head_y, self.maze)
-                    
-                    # Check enemy bullets hitting snake using proper collision
-                    snake_rect = pygame.Rect(self.snake.head_x - 8, self.snake.head_y - 8, 16, 16)
-                    for bullet in enemy.bullets[:]:
-                        if bullet and 'x' in bullet and 'y' in bullet:
-                            bullet_rect = pygame.Rect(bullet['x'] - 4, bullet['y'] - 4, 8, 8)
-                            if snake_rect.colliderect(bullet_rect):
-                                enemy.bullets.remove(bullet)
-                                if not self.shield_active and self.snake.ammo > 0:
-                                    self.snake.ammo -= 1
-                    
-                    # Check physical collision with snake using proper rect collision
-                    if (not enemy.stunned and not self.shield_active):
-                        enemy_rect = pygame.Rect(enemy.x - 10, enemy.y - 10, 20, 20)
-                        if snake_rect.colliderect(enemy_rect):
-                            self.sound_manager.play('game_over')
-                            self.game_state = 'game_over'
-                            return
-                    
-                    # Check snake bullets hitting enemies using proper collision
-                    enemy_rect = pygame.Rect(enemy.x - 10, enemy.y - 10, 20, 20)
-                    for bullet in self.snake.bullets[:]:
-                        if bullet and 'x' in bullet and 'y' in bullet:
-                            bullet_rect = pygame.Rect(bullet['x'] - 4, bullet['y'] - 4, 8, 8)
-                            if enemy_rect.colliderect(bullet_rect):
-                                self.snake.bullets.remove(bullet)
-                                enemy.take_damage()
+                for pool, slot in grid.query_box('snake_bullet', enemy.x, enemy.y, 14, 14):
+                    if pool.alive[slot]:  # Not already spent on another enemy
+                        pool.kill(slot)
+                        enemy.take_damage(self.sim_clock)
         
         # Update shield
         if self.shield_active:
@@ -194,41 +213,44 @@ class NormalGame:
         self.spawn_power_ups()
         
         # Check power-up collection
-        if self.stun_fruit:
-            distance = ((self.stun_fruit['x'] - self.snake.head_x)**2 + (self.stun_fruit['y'] - self.snake.head_y)**2)**0.5
-            if distance < 20:
-                self.super_stun_available = True
-                self.stun_fruit = None
+        collected = grid.query('fruit', head_x, head_y, 20)
+        if self.stun_fruit and 'stun' in collected:
+            self.super_stun_available = True
+            self.stun_fruit = None
         
-        if self.shield_fruit:
-            distance = ((self.shield_fruit['x'] - self.snake.head_x)**2 + (self.shield_fruit['y'] - self.snake.head_y)**2)**0.5
-            if distance < 20:
-                self.shield_active = True
-                self.shield_timer = current_time
-                self.sound_manager.play('shield')
-                self.shield_fruit = None
+        if self.shield_fruit and 'shield' in collected:
+            self.shield_active = True
+            self.shield_timer = current_time
+            self.sound_manager.play('shield')
+            self.shield_fruit = None
         
         # Check ping alert only if enemies spawned
         if self.enemies_spawned:
             self.check_ping_alert()
         
+        # Sounds for what the snake and enemies did this tick
+        for actor in [self.snake] + self.enemies:
+            play_events(self.sound_manager, actor.events)
+            actor.events.clear()
+        
         # Win condition
         if self.maze.is_exit(self.snake.head_x, self.snake.head_y):
             self.sound_manager.play('victory')
             self.game_state = 'victory'
     
-    def draw(self):
+    def draw(self, alpha=1.0):
         self.screen.fill(BLACK)
+        current_time = self.sim_clock.now
         
         if self.game_state == 'playing':
             # Draw maze and game objects
-            self.maze.draw(self.screen)
-            self.snake.draw(self.screen)
+            self.renderer.draw_maze(self.screen, self.maze)
+            self.renderer.draw_snake(self.screen, self.snake, alpha)
             
             # Draw enemies only if spawned
             if self.enemies_spawned:
                 for enemy in self.enemies:
-                    enemy.draw(self.screen)
+                    self.renderer.draw_enemy(self.screen, enemy, alpha)
             
             # Draw power-ups
             if self.stun_fruit:
@@ -247,90 +269,73 @@ class NormalGame:
             
             # Draw timer (if enabled and started)
             if self.timer_enabled and self.timer_started:
-                current_time = pygame.time.get_ticks()
                 remaining_time = max(0, self.session_timer - (current_time - self.timer_start_time))
                 minutes = int(remaining_time // 60000)
                 seconds = int((remaining_time % 60000) // 1000)
-                timer_font = pygame.font.Font(None, 36)
-                timer_text = timer_font.render(f"Time: {minutes:02d}:{seconds:02d}", True, (255, 255, 255))
+                timer_text = TEXT.render(f"Time: {minutes:02d}:{seconds:02d}", 36, (255, 255, 255))
                 self.screen.blit(timer_text, (SCREEN_WIDTH - 150, 10))
             
             # Draw enemy spawn countdown
             if not self.enemies_spawned:
-                current_time = pygame.time.get_ticks()
                 elapsed_time = current_time - self.game_start_time
                 remaining_spawn = max(0, self.enemy_spawn_delay - elapsed_time)
                 spawn_seconds = int(remaining_spawn // 1000) + 1
-                spawn_font = pygame.font.Font(None, 48)
-                spawn_text = spawn_font.render(f"Enemies spawn in: {spawn_seconds}", True, (255, 255, 0))
+                spawn_text = TEXT.render(f"Enemies spawn in: {spawn_seconds}", 48, (255, 255, 0))
                 self.screen.blit(spawn_text, (SCREEN_WIDTH//2 - 150, 80))
             
             # Draw shield indicator
             if self.shield_active:
-                shield_font = pygame.font.Font(None, 32)
-                shield_text = shield_font.render("SHIELD ACTIVE", True, (0, 255, 0))
+                shield_text = TEXT.render("SHIELD ACTIVE", 32, (0, 255, 0))
                 self.screen.blit(shield_text, (10, 80))
             
             # Draw super stun indicator
             if self.super_stun_available:
-                stun_font = pygame.font.Font(None, 32)
-                stun_text = stun_font.render("SUPER STUN READY", True, (0, 0, 255))
+                stun_text = TEXT.render("SUPER STUN READY", 32, (0, 0, 255))
                 self.screen.blit(stun_text, (10, 110))
             
             # Draw ping alert
             if self.ping_alert:
-                current_time = pygame.time.get_ticks()
                 if (current_time // 250) % 2:  # Blink every 250ms
-                    alert_font = pygame.font.Font(None, 64)
-                    alert_text = alert_font.render("!", True, (255, 0, 0))
+                    alert_text = TEXT.render("!", 64, (255, 0, 0))
                     alert_rect = alert_text.get_rect(center=(SCREEN_WIDTH//2, 50))
                     self.screen.blit(alert_text, alert_rect)
         
         elif self.game_state == 'time_up':
-            font = pygame.font.Font(None, 96)
-            time_up_text = font.render("TIME UP!", True, (255, 255, 0))
+            time_up_text = TEXT.render("TIME UP!", 96, (255, 255, 0))
             text_rect = time_up_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
             self.screen.blit(time_up_text, text_rect)
             
-            subtitle_font = pygame.font.Font(None, 72)
-            subtitle_text = subtitle_font.render("YOU LOSE", True, (255, 0, 0))
+            subtitle_text = TEXT.render("YOU LOSE", 72, (255, 0, 0))
             subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
             self.screen.blit(subtitle_text, subtitle_rect)
             
-            restart_font = pygame.font.Font(None, 36)
-            restart_text = restart_font.render("Press R to Restart or ESC to Menu", True, (255, 255, 255))
+            restart_text = TEXT.render("Press R to Restart or ESC to Menu", 36, (255, 255, 255))
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
             self.screen.blit(restart_text, restart_rect)
         
         elif self.game_state == 'game_over':
-            font = pygame.font.Font(None, 96)
-            game_over_text = font.render("YOU LOSE !!!", True, (255, 0, 0))
+            game_over_text = TEXT.render("YOU LOSE !!!", 96, (255, 0, 0))
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
             self.screen.blit(game_over_text, text_rect)
             
-            subtitle_font = pygame.font.Font(None, 72)
-            subtitle_text = subtitle_font.render("GAME OVER", True, (255, 100, 100))
+            subtitle_text = TEXT.render("GAME OVER", 72, (255, 100, 100))
             subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
             self.screen.blit(subtitle_text, subtitle_rect)
             
-            restart_font = pygame.font.Font(None, 36)
-            restart_text = restart_font.render("Press R to Restart or ESC to Menu", True, (255, 255, 255))
+            restart_text = TEXT.render("Press R to Restart or ESC to Menu", 36, (255, 255, 255))
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
             self.screen.blit(restart_text, restart_rect)
         
         elif self.game_state == 'victory':
-            font = pygame.font.Font(None, 96)
-            victory_text = font.render("YOU WIN !!!", True, (0, 255, 0))
+            victory_text = TEXT.render("YOU WIN !!!", 96, (0, 255, 0))
             text_rect = victory_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
             self.screen.blit(victory_text, text_rect)
             
-            subtitle_font = pygame.font.Font(None, 72)
-            subtitle_text = subtitle_font.render("VICTORY!", True, (100, 255, 100))
+            subtitle_text = TEXT.render("VICTORY!", 72, (100, 255, 100))
             subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
             self.screen.blit(subtitle_text, subtitle_rect)
             
-            restart_font = pygame.font.Font(None, 36)
-            restart_text = restart_font.render("Press R to Play Again or ESC to Menu", True, (255, 255, 255))
+            restart_text = TEXT.render("Press R to Play Again or ESC to Menu", 36, (255, 255, 255))
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
             self.screen.blit(restart_text, restart_rect)
     
@@ -0,0 +1,277 @@
+import argparse
+import bisect
+import os
+import struct
+import time
+from array import array
+from game_state import GameState, NOOP
+from snapshot import capture, restore
+from state_hash import StateHasher
+
+# File layout: header, then one varint per input change holding
+# (ticks since the previous change << 4 | new action). Actions fit in 4 bits
+# (a direction 0-4, optionally or-ed with SHOOT = 8), and held keys only
+# change a few times a second, so a 30-minute session is a few kilobytes.
+MAGIC = b'SMRP'
+VERSION = 2
+HEADER = struct.Struct('<4sBBBBQHIHH')  # magic, version, mode, difficulty, timer minutes, seed, tick rate, ticks,
+                                        # world width, world height
+MODES = ('classic', 'normal')
+DIFFICULTIES = (None, 'easy', 'normal', 'advanced')
+ACTION_BITS = 4
+LAST_REPLAY = os.path.join('replays', 'last_game.replay')  # Where the game saves each finished match
+# Sidecar file of state hashes (native uint32 each): the tick interval, then the hash
+# at the start of every interval-th tick. Spaced like ReplayPlayer's keyframes, a
+# 30-minute match needs 360 hashes (under 2 KB) instead of one per tick.
+HASHES_SUFFIX = '.hashes'
+HASH_SECONDS = 5
+
+def load_hashes(path):
+    """Return (tick interval, hashes) from a .hashes sidecar"""
+    hashes = array('I')
+    with open(path, 'rb') as hash_file:
+        hashes.frombytes(hash_file.read())
+    return hashes[0], hashes[1:]
+
+def save_hashes(path, interval, hashes):
+    with open(path, 'wb') as hash_file:
+        array('I', [interval]).tofile(hash_file)
+        hashes.tofile(hash_file)
+
+class ReplayRecorder:
+    """Records the actions fed to a GameState as input changes, and its state hash every hash_interval ticks"""
+
+    def __init__(self, state, hash_interval=None):
+        self.state = state
+        self.hasher = StateHasher()
+        self.hash_interval = hash_interval or HASH_SECONDS * state.clock.tick_rate
+        self.hashes = array('I')  # Hash of the state at the start of every hash_interval-th tick
+        self.changes = bytearray()
+        self.action = NOOP      # Action in effect since the last change
+        self.change_tick = state.tick
+        self.ticks = state.tick  # Ticks recorded so far
+
+    def record(self, action):
+        """Note the action for the tick the state is about to step"""
+        tick = self.state.tick
+        if tick % self.hash_interval == 0:
+            self.hashes.append(self.hasher.hash(self.state))
+        if action != self.action:
+            value = (tick - self.change_tick) << ACTION_BITS | action
+            while value >= 0x80:  # LEB128 varint
+                self.changes.append(value & 0x7F | 0x80)
+                value >>= 7
+            self.changes.append(value)
+            self.action = action
+            self.change_tick = tick
+        self.ticks = tick + 1
+
+    def step(self, action):
+        """Record the action and step the state with it, returning its events"""
+        self.record(action)
+        return self.state.step(action)
+
+    def to_bytes(self):
+        state = self.state
+        header = HEADER.pack(MAGIC, VERSION, MODES.index(state.mode), DIFFICULTIES.index(state.difficulty),
+                             state.timer_minutes, state.seed, state.clock.tick_rate, self.ticks,
+                             state.width, state.height)
+        return header + self.changes
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+        save_hashes(path + HASHES_SUFFIX, self.hash_interval, self.hashes)
+
+class Replay:
+    """A parsed recording: the match settings and the (tick, action) input changes"""
+
+    def __init__(self, data):
+        (magic, version, mode, difficulty, self.timer_minutes, self.seed, self.tick_rate, self.ticks,
+         self.width, self.height) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a SnakeMazeEscape replay (or from another version)")
+        self.mode = MODES[mode]
+        self.difficulty = DIFFICULTIES[difficulty]
+
+        self.changes = []
+        tick = value = shift = 0
+        for byte in memoryview(data)[HEADER.size:]:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                tick += value >> ACTION_BITS
+                self.changes.append((tick, value & ((1 << ACTION_BITS) - 1)))
+                value = shift = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as replay_file:
+            return cls(replay_file.read())
+
+    def new_state(self):
+        return GameState(self.mode, self.timer_minutes, seed=self.seed, width=self.width, height=self.height,
+                         tick_rate=self.tick_rate, difficulty=self.difficulty)
+
+class ReplayPlayer:
+    """Re-simulates a Replay tick by tick, with fast-forward and keyframe seeking.
+
+    A snapshot is kept every KEYFRAME_SECONDS of play the first time playback
+    passes it, so seeking restores the nearest keyframe before the target and
+    re-simulates at most KEYFRAME_SECONDS from there.
+    """
+
+    KEYFRAME_SECONDS = 5
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.change_ticks = [tick for tick, action in replay.changes]
+        self.keyframe_interval = self.KEYFRAME_SECONDS * replay.tick_rate
+        self.keyframes = {}  # tick -> Snapshot
+        self.restart()
+
+    def restart(self):
+        self.state = self.replay.new_state()
+        self.next_change = 0  # Index of the first input change not applied yet
+        self.action = NOOP
+
+    @property
+    def done(self):
+        return self.state.tick >= self.replay.ticks or self.state.status != 'playing'
+
+    def step(self):
+        """Step one recorded tick and return its events"""
+        changes, tick = self.replay.changes, self.state.tick
+        if tick % self.keyframe_interval == 0 and tick not in self.keyframes:
+            self.keyframes[tick] = capture(self.state)
+        while self.next_change < len(changes) and changes[self.next_change][0] <= tick:
+            self.action = changes[self.next_change][1]
+            self.next_change += 1
+        return self.state.step(self.action)
+
+    def hashes(self, interval=1):
+        """Re-simulate from the start and return the state hash of every interval-th tick"""
+        self.seek(0)
+        hasher, hashes = StateHasher(), array('I')
+        while not self.done:
+            if self.state.tick % interval == 0:
+                hashes.append(hasher.hash(self.state))
+            self.step()
+        return hashes
+
+    def advance(self, ticks):
+        """Fast-forward up to `ticks` ticks without drawing; returns their events"""
+        events = []
+        for _ in range(ticks):
+            if self.done:
+                break
+            events.extend(self.step())
+        return events
+
+    def seek(self, tick):
+        """Jump to the given tick via the nearest keyframe at or before it"""
+        keyframe = tick - tick % self.keyframe_interval
+        while keyframe > 0 and keyframe not in self.keyframes:
+            keyframe -= self.keyframe_interval
+        if tick < self.state.tick or keyframe > self.state.tick:
+            if keyframe in self.keyframes:
+                restore(self.state, self.keyframes[keyframe])
+                # Inputs changed on ticks before the keyframe are already in effect
+                self.next_change = bisect.bisect_left(self.change_ticks, keyframe)
+                self.action = self.replay.changes[self.next_change - 1][1] if self.next_change else NOOP
+            else:
+                self.restart()
+        self.advance(tick - self.state.tick)
+
+def watch(player, speed):
+    """Play the replay in a window at `speed` times real time (LEFT/RIGHT seek 10 s)"""
+    import pygame
+    from frontend import Renderer
+    from text_cache import TEXT
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption("SnakeMazeEscape replay")
+    renderer = Renderer(viewport=(800, 600))
+    clock = pygame.time.Clock()
+    seek_ticks = 10 * player.replay.tick_rate
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
+                player.seek(player.state.tick + seek_ticks)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
+                player.seek(max(0, player.state.tick - seek_ticks))
+        player.advance(max(1, round(speed * player.replay.tick_rate / 60)))
+
+        state = player.state
+        renderer.follow(state.maze, state.snake.head_x, state.snake.head_y)
+        renderer.draw_maze(screen, state.maze)
+        renderer.draw_snake(screen, state.snake)
+        for enemy in state.enemies:
+            renderer.draw_enemy(screen, enemy)
+        status = TEXT.render(f"{state.clock.now / 1000:6.1f} s  x{speed}  {state.status}", 24, (255, 255, 255))
+        screen.blit(status, (600, 10))
+        pygame.display.flip()
+        clock.tick(60)
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate a recorded SnakeMazeEscape session")
+    parser.add_argument('path', nargs='?', default=LAST_REPLAY, help="Replay file")
+    parser.add_argument('--seek', type=float, default=0, help="Start this many seconds in")
+    parser.add_argument('--watch', action='store_true', help="Show the replay in a window")
+    parser.add_argument('--speed', type=float, default=1, help="Playback speed when watching")
+    parser.add_argument('--golden', help="Hash file to compare against "
+                                         "(default: the replay's own .hashes file, if any)")
+    parser.add_argument('--write-hashes', metavar='PATH', help="Save this run's hashes as a golden file")
+    parser.add_argument('--hash-interval', type=int, help="Ticks between hashes for --write-hashes "
+                                                           f"(default: {HASH_SECONDS} s)")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    print(f"{replay.mode} match, difficulty {replay.difficulty}, seed {replay.seed}, "
+          f"{replay.width}x{replay.height} world, "
+          f"{replay.ticks / replay.tick_rate:.1f} s, {len(replay.changes)} input changes, "
+          f"{os.path.getsize(args.path)} bytes")
+    player = ReplayPlayer(replay)
+
+    golden = args.golden or (args.path + HASHES_SUFFIX if os.path.exists(args.path + HASHES_SUFFIX) else None)
+    if golden or args.write_hashes:
+        every_tick = player.hashes()
+        if args.write_hashes:
+            interval = args.hash_interval or HASH_SECONDS * replay.tick_rate
+            save_hashes(args.write_hashes, interval, every_tick[::interval])
+        if golden:
+            interval, expected = load_hashes(golden)
+            hashes = every_tick[::interval]
+            diverged = next((index for index, (ours, theirs) in enumerate(zip(hashes, expected)) if ours != theirs),
+                            None if len(hashes) == len(expected) else min(len(hashes), len(expected)))
+            if diverged is None:
+                print(f"State hashes match {golden} at all {len(hashes)} hashed ticks (every {interval})")
+            else:
+                # Hashes are interval ticks apart, so the desync happened since the previous one
+                tick = diverged * interval
+                print(f"DESYNC: state first differs from {golden} at tick {tick} "
+                      f"({tick / replay.tick_rate:.2f} s), after tick {max(0, tick - interval)}")
+
+    player.seek(int(args.seek * replay.tick_rate))
+    if args.watch:
+        watch(player, args.speed)
+        return
+
+    begin = time.perf_counter()
+    start_tick = player.state.tick
+    while not player.done:
+        player.advance(replay.tick_rate)
+    elapsed = time.perf_counter() - begin
+    state = player.state
+    print(f"Ended '{state.status}' at {state.clock.now / 1000:.1f} s, tick {state.tick}; re-simulated "
+          f"{state.tick - start_tick} ticks in {elapsed:.2f} s "
+          f"({(state.tick - start_tick) / replay.tick_rate / max(elapsed, 1e-9):.0f}x real time)")
+
+if __name__ == "__main__":
+    main()
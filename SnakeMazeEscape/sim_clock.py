@@ -0,0 +1,53 @@
+import time
+
+class SimClock:
+    """Simulation time that only moves when the game advances it by a fixed tick.
+
+    Update methods read clock.now (milliseconds, like pygame.time.get_ticks())
+    instead of the wall clock, so a run behaves the same at any frame rate and
+    can be stepped as fast as the CPU allows when nothing is being drawn.
+    """
+
+    TICK_RATE = 60           # Simulation ticks per second
+    MAX_STEPS_PER_FRAME = 5  # Drop time rather than spiral when a frame runs long
+
+    def __init__(self, tick_rate=None):
+        self.tick_rate = tick_rate or self.TICK_RATE
+        self.tick_ms = 1000 / self.tick_rate
+        self.tick = 0
+        self.accumulator = 0.0  # Real milliseconds not yet simulated
+
+    @property
+    def now(self):
+        return int(self.tick * self.tick_ms)
+
+    def advance(self, ticks=1):
+        self.tick += ticks
+
+    def steps_due(self, elapsed_ms):
+        """Bank elapsed real time and return how many fixed ticks to simulate for it"""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.tick_ms)
+        if steps > self.MAX_STEPS_PER_FRAME:
+            steps = self.MAX_STEPS_PER_FRAME
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.tick_ms
+        return steps
+
+    @property
+    def alpha(self):
+        """How far real time has run past the last tick, as a fraction of a tick, for interpolation"""
+        return min(1.0, self.accumulator / self.tick_ms)
+
+class WallClock:
+    """Real milliseconds since start-up, for callers that don't pass a SimClock"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    @property
+    def now(self):
+        return int((time.perf_counter() - self.start) * 1000)
+
+WALL_CLOCK = WallClock()
@@ -1,16 +1,24 @@
-import pygame
+from collections import deque
+from bullet_pool import BulletPool, OWNER_SNAKE
+from sim_clock import WALL_CLOCK
 
 class Snake:
-    def __init__(self, x, y, sound_manager=None):
+    def __init__(self, x, y):
         self.head_x = x
         self.head_y = y
-        self.sound_manager = sound_manager
+        self.events = []  # Names of things that happened ('move', 'food', 'shoot'), drained by the owner
         self.size = 8
         self.head_color = (0, 255, 0)
         self.body_color = (0, 200, 0)
         
-        # Snake body (list of segments) - adjusted for smaller steps
-        self.body = [(x, y), (x-20, y), (x-40, y)]  # 3 segments with proper grid spacing
+        # Snake body (deque of segments, head first) - adjusted for smaller steps
+        self.CELL_SIZE = 20
+        self.body = deque([(x, y), (x-20, y), (x-40, y)])  # 3 segments with proper grid spacing
+        # Segment count per (col, row) cell, so occupancy checks don't walk the body
+        self.occupied = {}
+        for segment_x, segment_y in self.body:
+            self.occupy(segment_x, segment_y, 1)
+        self.pending_growth = 0  # Segments still to add at the tail as the snake moves
         
         self.direction = 'RIGHT'
         self.direction_queue = []  # Queue for smooth corner navigation
@@ -19,24 +27,12 @@ class Snake:
         self.MAX_QUEUE_SIZE = 2  # Allow 2 buffered direction changes
         
         self.ammo = 0
-        self.bullets = []
+        self.bullets = BulletPool()
         self.last_shot = 0
 
-    def update(self, maze):
-        current_time = pygame.time.get_ticks()
-        
-        # Handle direction changes - detect ALL inputs first
-        keys = pygame.key.get_pressed()
-        new_direction = None
-        
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            new_direction = 'LEFT'
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            new_direction = 'RIGHT'
-        elif keys[pygame.K_UP] or keys[pygame.K_w]:
-            new_direction = 'UP'
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            new_direction = 'DOWN'
+    def update(self, maze, clock=WALL_CLOCK, new_direction=None, shoot=False):
+        """Advance one tick with the held direction ('LEFT', 'RIGHT', 'UP', 'DOWN' or None) and fire button"""
+        current_time = clock.now
         
         # Check for smooth reversal when opposite direction is pressed
         if new_direction:
@@ -51,7 +47,7 @@ class Snake:
                 self.direction = new_direction
                 self.head_x, self.head_y = self.body[0]
                 self.direction_queue.clear()
-                print(f"Snake reversed! New direction: {new_direction}")
+                self.events.append('reverse')
                 return  # Skip normal queueing
             
             # Block invalid directions (non-opposite, non-perpendicular)
@@ -71,7 +67,7 @@ class Snake:
             (not self.direction_queue or self.direction_queue[-1] != new_direction)):
             self.direction_queue.append(new_direction)
                 
-        if keys[pygame.K_SPACE] and current_time - self.last_shot > 300 and self.ammo > 0:
+        if shoot and current_time - self.last_shot > 300 and self.ammo > 0:
             self.shoot()
             self.last_shot = current_time
         
@@ -116,34 +112,52 @@ class Snake:
             # Check if new position is valid (not a wall)
             if not maze.is_wall(new_head_x, new_head_y):
                 # Move snake: add new head, remove tail
-                self.body.insert(0, (new_head_x, new_head_y))
-                self.body.pop()  # Remove tail
+                self.advance(new_head_x, new_head_y)
                 
-                # Update head position for other functions
-                self.head_x, self.head_y = new_head_x, new_head_y
-                
-                # Play movement sound
-                if self.sound_manager:
-                    self.sound_manager.play('move')
+                self.events.append('move')
                 
                 # Check food collision
                 if maze.check_food_collision(new_head_x, new_head_y, self.size):
                     self.ammo += 1
-                    if self.sound_manager:
-                        self.sound_manager.play('food')
-                    print(f"Food eaten! Ammo: {self.ammo}")  # Debug
+                    self.events.append('food')
             # Otherwise: snake simply stops (no bounce)
                     
             self.move_timer = current_time
         
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            
-            if (maze.is_wall(bullet['x'], bullet['y']) or
-                bullet['x'] < 0 or bullet['x'] > 800 or 
-                bullet['y'] < 0 or bullet['y'] > 600):
-                self.bullets.remove(bullet)
+        self.bullets.update(maze)
+
+    def occupy(self, x, y, change):
+        cell = (int(x) // self.CELL_SIZE, int(y) // self.CELL_SIZE)
+        count = self.occupied.get(cell, 0) + change
+        if count:
+            self.occupied[cell] = count
+        else:
+            del self.occupied[cell]
+
+    def advance(self, new_head_x, new_head_y):
+        """Push a new head and drop the tail (unless growing), in O(1)"""
+        self.body.appendleft((new_head_x, new_head_y))
+        self.occupy(new_head_x, new_head_y, 1)
+        if self.pending_growth:
+            self.pending_growth -= 1
+        else:
+            tail_x, tail_y = self.body.pop()  # Remove tail
+            self.occupy(tail_x, tail_y, -1)
+        
+        # Update head position for other functions
+        self.head_x, self.head_y = new_head_x, new_head_y
+
+    def grow(self, segments=1):
+        """Lengthen the snake; the new segments unfold at the tail over the next moves"""
+        self.pending_growth += segments
+
+    def occupies(self, x, y):
+        """Whether any segment sits in the maze cell containing pixel (x, y)"""
+        return (int(x) // self.CELL_SIZE, int(y) // self.CELL_SIZE) in self.occupied
+
+    def is_self_intersecting(self):
+        """Whether the head shares its cell with another segment"""
+        return self.occupied.get((int(self.head_x) // self.CELL_SIZE, int(self.head_y) // self.CELL_SIZE), 0) > 1
 
     def shoot(self):
         if self.ammo > 0 and len(self.body) > 0:  # Only shoot if we have ammo and body exists
@@ -161,41 +175,6 @@ class Snake:
             elif self.direction == 'DOWN':
                 dy = -6  # Shoot up from tail when moving down
                 
-            bullet = {'x': tail_x, 'y': tail_y, 'dx': dx, 'dy': dy}
-            self.bullets.append(bullet)
+            self.bullets.spawn(tail_x, tail_y, dx, dy, OWNER_SNAKE)
             self.ammo -= 1  # Decrease ammo after shooting
-            
-            # Play shooting sound
-            if self.sound_manager:
-                self.sound_manager.play('shoot')
-            
-            print(f"Shot fired from tail! Ammo remaining: {self.ammo}")  # Debug
-
-    def draw(self, screen):
-        # Draw snake body
-        for i, (x, y) in enumerate(self.body):
-            if i == 0:  # Head
-                pygame.draw.rect(screen, self.head_color, 
-                                (x - self.size, y - self.size, 
-                                 self.size * 2, self.size * 2))
-                # Draw eyes on head
-                pygame.draw.circle(screen, (255, 255, 255), (x-3, y-3), 2)
-                pygame.draw.circle(screen, (255, 255, 255), (x+3, y-3), 2)
-                pygame.draw.circle(screen, (0, 0, 0), (x-3, y-3), 1)
-                pygame.draw.circle(screen, (0, 0, 0), (x+3, y-3), 1)
-            else:  # Body
-                pygame.draw.rect(screen, self.body_color, 
-                                (x - self.size, y - self.size, 
-                                 self.size * 2, self.size * 2))
-        
-        for bullet in self.bullets:
-            pygame.draw.circle(screen, (255, 255, 0), 
-                             (int(bullet['x']), int(bullet['y'])), 4)
-                             
-        font = pygame.font.Font(None, 36)
-        ammo_text = font.render(f"Ammo: {self.ammo}", True, (255, 255, 255))
-        screen.blit(ammo_text, (10, 10))
-        
-        controls_font = pygame.font.Font(None, 24)
-        controls_text = controls_font.render("WASD/Arrows: Move | SPACE: Shoot", True, (200, 200, 200))
-        screen.blit(controls_text, (10, 50))
\ No newline at end of file
+            self.events.append('shoot')
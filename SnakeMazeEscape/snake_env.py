@@ -0,0 +1,174 @@
+from array import array
+from game_state import GameState, NOOP, LEFT, RIGHT, UP, DOWN, SHOOT
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # Observations fall back to flat array.array buffers
+
+# Grid observation cell codes
+EMPTY, WALL, FOOD, EXIT, BODY, HEAD, BULLET = 0, 1, 2, 3, 4, 5, 6
+# Entity observation kinds, one (kind, x, y, value) row each
+NO_ENTITY, SNAKE_HEAD, ENEMY, STUNNED_ENEMY, STUN_FRUIT, SHIELD_FRUIT = 0, 1, 2, 3, 4, 5
+MAX_ENTITIES = 8
+ENTITY_FIELDS = 4
+GRID_ROWS, GRID_COLS = 29, 39  # Maze of GameState's default 800x600 screen (20px cells, odd counts)
+
+ACTIONS = (NOOP, LEFT, RIGHT, UP, DOWN, SHOOT, LEFT | SHOOT, RIGHT | SHOOT, UP | SHOOT, DOWN | SHOOT)
+
+def observation_buffer(typecode, shape):
+    """Zeroed buffer for one observation field: a NumPy array of that shape, or a flat array.array without NumPy"""
+    if numpy is not None:
+        return numpy.zeros(shape, typecode)
+    count = 1
+    for size in shape:
+        count *= size
+    return array(typecode, [0]) * count
+
+def flat_view(buffer):
+    """Writable 1-D memoryview over an observation buffer"""
+    return memoryview(buffer.reshape(-1) if numpy is not None else buffer)
+
+class SnakeEnv:
+    """Gym-style environment around one GameState: reset() -> observation, step(action) -> (observation, reward, done, info).
+
+    action is a GameState action (a direction, optionally or-ed with SHOOT).
+    Each step holds it for `repeat` ticks. The observation is a dict:
+      'grid'     (rows, cols) uint8 cell codes: walls, food, exit, snake, enemy bullets
+      'entities' (MAX_ENTITIES, 4) float32 rows of (kind, x, y, value) for the
+                 snake head (value = length), enemies (value = health) and fruits
+      'ammo'     the snake's ammo
+    The buffers are reused between steps; copy them to keep an observation.
+    """
+
+    REWARDS = {'food': 0.1, 'enemy_hit': 0.05, 'snake_hit': -0.05,
+               'victory': 1.0, 'game_over': -1.0, 'time_up': -1.0}
+
+    def __init__(self, mode='classic', difficulty=None, timer_minutes=3, seed=None, repeat=1,
+                 grid=None, entities=None):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.timer_minutes = timer_minutes
+        self.seed = seed
+        self.repeat = repeat
+        self.state = None
+
+        # VectorSnakeEnv hands in views of its batch buffers; standalone envs own theirs
+        if grid is None:
+            self.grid = observation_buffer('B', (GRID_ROWS, GRID_COLS))
+            self.entities = observation_buffer('f', (MAX_ENTITIES, ENTITY_FIELDS))
+            grid, entities = flat_view(self.grid), flat_view(self.entities)
+        else:
+            self.grid, self.entities = grid, entities
+        self.grid_view, self.entity_view = grid, entities
+        self.no_entities = array('f', [0.0]) * (MAX_ENTITIES * ENTITY_FIELDS)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.state = GameState(self.mode, self.timer_minutes, seed=self.seed, difficulty=self.difficulty)
+        return self.observe()
+
+    def step(self, action):
+        state, rewards = self.state, self.REWARDS
+        reward = 0.0
+        events = []
+        for _ in range(self.repeat):
+            tick_events = state.step(action)
+            for event in tick_events:
+                reward += rewards.get(event, 0.0)
+            events.extend(tick_events)
+            if state.status != 'playing':
+                break
+        return self.observe(), reward, state.status != 'playing', {'events': events, 'status': state.status}
+
+    def observe(self):
+        state = self.state
+        maze, snake = state.maze, state.snake
+        cols, maze_rows, cell_size = maze.cols, maze.rows, maze.CELL_SIZE
+
+        grid = self.grid_view
+        grid[:] = maze.cells  # Walls and paths, then everything else painted over them
+        for col, row in maze.food_cells:
+            grid[row * cols + col] = FOOD
+        exit_col, exit_row = maze.exit_pos
+        grid[exit_row * cols + exit_col] = EXIT
+        for enemy in state.enemies:
+            pool = enemy.bullets
+            x, y, alive = pool.x, pool.y, pool.alive
+            for slot in range(pool.high):
+                if alive[slot]:
+                    col, row = int(x[slot]) // cell_size, int(y[slot]) // cell_size
+                    if 0 <= col < cols and 0 <= row < maze_rows:
+                        grid[row * cols + col] = BULLET
+        # Bullets and segments off the grid (the starting tail trails off the left edge)
+        # are skipped: a flat index would wrap into the next row or another env's buffer
+        for x, y in snake.body:
+            col, row = int(x) // cell_size, int(y) // cell_size
+            if 0 <= col < cols and 0 <= row < maze_rows:
+                grid[row * cols + col] = BODY
+        col, row = int(snake.head_x) // cell_size, int(snake.head_y) // cell_size
+        if 0 <= col < cols and 0 <= row < maze_rows:
+            grid[row * cols + col] = HEAD
+
+        entities = self.entity_view
+        entities[:] = self.no_entities
+        rows = [(SNAKE_HEAD, snake.head_x, snake.head_y, len(snake.body))]
+        for enemy in state.enemies:
+            rows.append((STUNNED_ENEMY if enemy.stunned else ENEMY, enemy.x, enemy.y, enemy.health))
+        for kind, fruit in ((STUN_FRUIT, state.stun_fruit), (SHIELD_FRUIT, state.shield_fruit)):
+            if fruit:
+                rows.append((kind, fruit['x'], fruit['y'], 0))
+        for start, row in zip(range(0, len(entities), ENTITY_FIELDS), rows[:MAX_ENTITIES]):
+            entities[start:start + ENTITY_FIELDS] = array('f', row)
+
+        return {'grid': self.grid, 'entities': self.entities, 'ammo': snake.ammo}
+
+class VectorSnakeEnv:
+    """N independent SnakeEnvs stepped together, with batched observation buffers.
+
+    step(actions) takes one action per env and returns
+    (observations, rewards, dones, infos) where observations holds
+    'grid' (N, rows, cols), 'entities' (N, MAX_ENTITIES, 4) and 'ammo' (N,).
+    Finished envs reset themselves on the next seed; their info carries
+    the final status.
+    """
+
+    def __init__(self, num_envs, mode='classic', difficulty=None, timer_minutes=3, seed=0, repeat=1):
+        self.num_envs = num_envs
+        self.next_seed = seed  # Seeds are handed out in order, one per match
+        self.grid = observation_buffer('B', (num_envs, GRID_ROWS, GRID_COLS))
+        self.entities = observation_buffer('f', (num_envs, MAX_ENTITIES, ENTITY_FIELDS))
+        self.ammo = observation_buffer('i', (num_envs,))
+        self.rewards = observation_buffer('f', (num_envs,))
+        self.dones = observation_buffer('B', (num_envs,))
+
+        grid, entities = flat_view(self.grid), flat_view(self.entities)
+        grid_size, entity_size = GRID_ROWS * GRID_COLS, MAX_ENTITIES * ENTITY_FIELDS
+        self.envs = [SnakeEnv(mode, difficulty, timer_minutes, repeat=repeat,
+                              grid=grid[index * grid_size:(index + 1) * grid_size],
+                              entities=entities[index * entity_size:(index + 1) * entity_size])
+                     for index in range(num_envs)]
+        self.observations = {'grid': self.grid, 'entities': self.entities, 'ammo': self.ammo}
+
+    def take_seed(self):
+        seed = self.next_seed
+        self.next_seed += 1
+        return seed
+
+    def reset(self):
+        for index, env in enumerate(self.envs):
+            self.ammo[index] = env.reset(self.take_seed())['ammo']
+        return self.observations
+
+    def step(self, actions):
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, reward, done, info = env.step(action)
+            if done:
+                observation = env.reset(self.take_seed())
+            self.ammo[index] = observation['ammo']
+            self.rewards[index] = reward
+            self.dones[index] = done
+            infos.append(info)
+        return self.observations, self.rewards, self.dones, infos
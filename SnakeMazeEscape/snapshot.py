@@ -0,0 +1,229 @@
+import struct
+from array import array
+from collections import deque
+from enemy import Enemy
+from sim_clock import SimClock
+
+# Snapshot layout (little-endian), written with struct.pack_into into a reused bytearray:
+#   STATE header, snake body (x, y) pairs, food cell indices, maze cells,
+#   Random state, then per enemy ENEMY + path cells + bullet pool, then the
+#   snake's bullet pool. A bullet pool is POOL followed by its raw columns
+#   and free list. Positions are whole pixels everywhere but in bullets.
+STATE = struct.Struct('<IBqq?'     # tick, status, start time, enemy start time, second enemy spawned
+                      '?ii?ii'     # stun fruit (present, x, y), shield fruit
+                      '?q??I'      # shield active, shield start, stun shot ready, ping alert, scheduler frame
+                      'iiIBBBBqiiq'  # snake head, growth, direction, queue (length, 2 slots), move timer,
+                                     # move delay, ammo, last shot
+                      'IIBI?d')    # body length, food count, enemy count, cell count, gauss_next (present, value)
+ENEMY = struct.Struct('<iiiiii?qqqqqqiII')  # x, y, prev x, prev y, health, max health, stunned, stun timer,
+                                           # stun duration, shoot timer, shoot delay, path timer, move timer,
+                                           # move delay, update interval, path length
+POOL = struct.Struct('<IIIII')  # capacity, high, count, maze edits seen, free slots
+RANDOM_WORDS = 625  # Mersenne Twister state: 624 words plus the position
+
+STATUSES = ('playing', 'game_over', 'time_up', 'victory')
+DIRECTIONS = (None, 'LEFT', 'RIGHT', 'UP', 'DOWN')
+
+class Snapshot:
+    """One captured GameState in a reusable buffer that only grows"""
+
+    def __init__(self, size=16384):
+        self.buffer = bytearray(size)
+        self.size = 0   # Bytes in use
+        self.tick = -1  # Tick it was taken at, -1 while empty
+
+    def to_bytes(self):
+        return bytes(self.buffer[:self.size])
+
+def pool_size(pool):
+    capacity = len(pool.alive)
+    return POOL.size + capacity * (5 * 8 + 2) + len(pool.free) * 4
+
+def pack_pool(buffer, offset, pool):
+    capacity = len(pool.alive)
+    POOL.pack_into(buffer, offset, capacity, pool.high, pool.count, pool.edits_seen, len(pool.free))
+    offset += POOL.size
+    for column in (pool.x, pool.y, pool.dx, pool.dy, pool.steps_left, pool.owner, pool.alive):
+        end = offset + capacity * column.itemsize if isinstance(column, array) else offset + capacity
+        buffer[offset:end] = column
+        offset = end
+    struct.pack_into(f'<{len(pool.free)}I', buffer, offset, *pool.free)
+    return offset + len(pool.free) * 4
+
+def unpack_pool(view, offset, pool, maze):
+    capacity, pool.high, pool.count, pool.edits_seen, free = POOL.unpack_from(view, offset)
+    offset += POOL.size
+    if len(pool.alive) != capacity:
+        # Different size: new columns (the pool only grows, so this is rare)
+        for name in ('x', 'y', 'dx', 'dy', 'steps_left', 'owner'):
+            setattr(pool, name, array(getattr(pool, name).typecode, [0]) * capacity)
+        pool.alive = bytearray(capacity)
+    for column in (pool.x, pool.y, pool.dx, pool.dy, pool.steps_left, pool.owner, pool.alive):
+        end = offset + capacity * (column.itemsize if isinstance(column, array) else 1)
+        memoryview(column).cast('B')[:] = view[offset:end]
+        offset = end
+    pool.free = list(struct.unpack_from(f'<{free}I', view, offset))
+    pool.maze = maze
+    return offset + free * 4
+
+def capture(state, snapshot=None):
+    """Serialise a GameState into a Snapshot (reused if given) and return it.
+
+    Enemies must use the 'flow_field' pathfinding GameState gives them: a
+    paused A* search in the AI scheduler is a generator and is not captured.
+    """
+    snake, maze, scheduler = state.snake, state.maze, state.ai_scheduler
+    if scheduler.active or scheduler.pending:
+        raise ValueError("Cannot snapshot while A* searches are in flight")
+    if snapshot is None:
+        snapshot = Snapshot()
+    body, food, cells, enemies = snake.body, maze.food_cells, maze.cells, state.enemies
+    version, words, gauss = state.rng.getstate()
+
+    size = (STATE.size + len(body) * 8 + len(food) * 4 + len(cells) + RANDOM_WORDS * 4 +
+            sum(ENEMY.size + len(enemy.path) * 4 + pool_size(enemy.bullets) for enemy in enemies) +
+            pool_size(snake.bullets))
+    if len(snapshot.buffer) < size:
+        snapshot.buffer = bytearray(size * 2)
+    buffer = snapshot.buffer
+
+    stun, shield, queue = state.stun_fruit, state.shield_fruit, snake.direction_queue
+    STATE.pack_into(buffer, 0, state.clock.tick, STATUSES.index(state.status), state.start_time,
+                    state.enemy_start_time, state.second_enemy_spawned,
+                    stun is not None, stun['x'] if stun else 0, stun['y'] if stun else 0,
+                    shield is not None, shield['x'] if shield else 0, shield['y'] if shield else 0,
+                    state.shield_active, state.shield_start_time, state.stun_shot_ready, state.ping_alert,
+                    scheduler.frame,
+                    snake.head_x, snake.head_y, snake.pending_growth, DIRECTIONS.index(snake.direction),
+                    len(queue), DIRECTIONS.index(queue[0]) if queue else 0,
+                    DIRECTIONS.index(queue[1]) if len(queue) > 1 else 0,
+                    snake.move_timer, snake.MOVE_DELAY, snake.ammo, snake.last_shot,
+                    len(body), len(food), len(enemies), len(cells), gauss is not None, gauss or 0.0)
+    offset = STATE.size
+    struct.pack_into(f'<{len(body) * 2}i', buffer, offset, *[value for segment in body for value in segment])
+    offset += len(body) * 8
+    cols = maze.cols
+    struct.pack_into(f'<{len(food)}I', buffer, offset, *[row * cols + col for col, row in food])
+    offset += len(food) * 4
+    buffer[offset:offset + len(cells)] = cells
+    offset += len(cells)
+    struct.pack_into(f'<{RANDOM_WORDS}I', buffer, offset, *words)
+    offset += RANDOM_WORDS * 4
+
+    for enemy in enemies:
+        path = enemy.path
+        ENEMY.pack_into(buffer, offset, enemy.x, enemy.y, enemy.prev_x, enemy.prev_y, enemy.health,
+                        enemy.MAX_HEALTH, enemy.stunned, enemy.stun_timer, enemy.STUN_DURATION,
+                        enemy.shoot_timer, enemy.SHOOT_DELAY, enemy.path_timer, enemy.move_timer,
+                        enemy.MOVE_DELAY, enemy.update_interval, len(path))
+        offset += ENEMY.size
+        struct.pack_into(f'<{len(path) * 2}H', buffer, offset, *[value for cell in path for value in cell])
+        offset += len(path) * 4
+        offset = pack_pool(buffer, offset, enemy.bullets)
+    offset = pack_pool(buffer, offset, snake.bullets)
+
+    snapshot.size = offset
+    snapshot.tick = state.clock.tick
+    return snapshot
+
+def restore(state, snapshot):
+    """Put a GameState back exactly as it was when the snapshot was taken.
+
+    The state must have been created with the same mode, difficulty and seed
+    (usually it is the very state the snapshot came from).
+    """
+    view = memoryview(snapshot.buffer)
+    snake, maze = state.snake, state.maze
+    (tick, status, state.start_time, state.enemy_start_time, state.second_enemy_spawned,
+     stun, stun_x, stun_y, shield, shield_x, shield_y,
+     state.shield_active, state.shield_start_time, state.stun_shot_ready, state.ping_alert, frame,
+     snake.head_x, snake.head_y, snake.pending_growth, direction, queue_length, queued_first, queued_second,
+     snake.move_timer, snake.MOVE_DELAY, snake.ammo, snake.last_shot,
+     body_length, food_count, enemy_count, cell_count, has_gauss, gauss) = STATE.unpack_from(view, 0)
+    state.clock.tick = tick
+    state.status = STATUSES[status]
+    state.stun_fruit = {'x': stun_x, 'y': stun_y} if stun else None
+    state.shield_fruit = {'x': shield_x, 'y': shield_y} if shield else None
+    state.ai_scheduler.frame = frame
+    snake.direction = DIRECTIONS[direction]
+    snake.direction_queue = [DIRECTIONS[queued_first], DIRECTIONS[queued_second]][:queue_length]
+    snake.events.clear()
+    offset = STATE.size
+
+    values = struct.unpack_from(f'<{body_length * 2}i', view, offset)
+    offset += body_length * 8
+    snake.body = deque(zip(values[::2], values[1::2]))
+    snake.occupied = {}
+    for segment_x, segment_y in snake.body:
+        snake.occupy(segment_x, segment_y, 1)
+
+    cols, cell_size, half = maze.cols, maze.CELL_SIZE, maze.CELL_SIZE // 2
+    food_cells = [divmod(index, cols)[::-1] for index in struct.unpack_from(f'<{food_count}I', view, offset)]
+    offset += food_count * 4
+    if food_cells != list(maze.food_cells):
+        for cell in set(food_cells).symmetric_difference(maze.food_cells):
+            maze.invalidate_tile(*cell)
+        maze.food_cells = {(col, row): (col * cell_size + half, row * cell_size + half) for col, row in food_cells}
+
+    cells = view[offset:offset + cell_count]
+    if cells != maze.cells:
+        # Walls changed since: go through set_wall so planners and renderer hear about it
+        for index in range(cell_count):
+            if cells[index] != maze.cells[index]:
+                maze.set_wall(index % cols, index // cols, cells[index])
+    offset += cell_count
+    words = struct.unpack_from(f'<{RANDOM_WORDS}I', view, offset)
+    offset += RANDOM_WORDS * 4
+    state.rng.setstate((3, words, gauss if has_gauss else None))
+
+    enemies = state.enemies
+    del enemies[enemy_count:]
+    while len(enemies) < enemy_count:
+        enemies.append(Enemy(0, 0))
+    for enemy in enemies:
+        (enemy.x, enemy.y, enemy.prev_x, enemy.prev_y, enemy.health, enemy.MAX_HEALTH, enemy.stunned,
+         enemy.stun_timer, enemy.STUN_DURATION, enemy.shoot_timer, enemy.SHOOT_DELAY, enemy.path_timer,
+         enemy.move_timer, enemy.MOVE_DELAY, enemy.update_interval, path_length) = ENEMY.unpack_from(view, offset)
+        offset += ENEMY.size
+        values = struct.unpack_from(f'<{path_length * 2}H', view, offset)
+        offset += path_length * 4
+        enemy.path = deque(zip(values[::2], values[1::2]))
+        enemy.events.clear()
+        offset = unpack_pool(view, offset, enemy.bullets, maze)
+    unpack_pool(view, offset, snake.bullets, maze)
+
+class RewindBuffer:
+    """Ring buffer holding a snapshot of the last `seconds` of play, every `interval` ticks.
+
+    Slots are allocated once and overwritten in place, so recording every
+    tick costs one capture() and no allocation.
+    """
+
+    def __init__(self, seconds=10, tick_rate=None, interval=1):
+        self.interval = interval
+        self.slots = [Snapshot() for _ in range(seconds * (tick_rate or SimClock.TICK_RATE) // interval)]
+        self.newest = -1  # Slot of the latest snapshot
+        self.count = 0    # Slots holding snapshots
+
+    def record(self, state):
+        """Snapshot the state if this tick is on the interval"""
+        if state.tick % self.interval:
+            return
+        self.newest = (self.newest + 1) % len(self.slots)
+        capture(state, self.slots[self.newest])
+        self.count = min(self.count + 1, len(self.slots))
+
+    def rewind(self, state, ticks):
+        """Restore the newest snapshot at least `ticks` ticks old and forget the ones after it.
+
+        Returns the tick restored to, or None if the buffer does not reach back that far.
+        """
+        target = state.tick - ticks
+        for back in range(self.count):
+            index = (self.newest - back) % len(self.slots)
+            if self.slots[index].tick <= target:
+                restore(state, self.slots[index])
+                self.newest = index
+                self.count -= back
+                return state.tick
+        return None
@@ -0,0 +1,52 @@
+import struct
+import zlib
+
+STATUSES = ('playing', 'game_over', 'time_up', 'victory')
+DIRECTIONS = (None, 'LEFT', 'RIGHT', 'UP', 'DOWN')
+
+class StateHasher:
+    """CRC32 of a GameState's simulation state, cheap enough to take every tick.
+
+    Covers the clock, status and timers, fruits and shield, the snake (body,
+    direction, queue, ammo, timers), food, maze cells, every enemy's position,
+    health, stun and timers, and all bullets. Components are chained through
+    zlib.crc32; maze cells are only rehashed when the maze reports an edit.
+    The Random state is left out: a desync there shows up in fruit spawns.
+    """
+
+    def __init__(self):
+        self.maze = None
+        self.edits_seen = 0
+        self.cells_crc = 0
+
+    def hash(self, state):
+        snake, maze = state.snake, state.maze
+        if maze is not self.maze or self.edits_seen != len(maze.cell_edits):
+            self.maze, self.edits_seen = maze, len(maze.cell_edits)
+            self.cells_crc = zlib.crc32(maze.cells)
+
+        stun, shield, queue = state.stun_fruit, state.shield_fruit, snake.direction_queue
+        values = [state.clock.tick, STATUSES.index(state.status), state.enemy_start_time,
+                  stun['x'] if stun else -1, stun['y'] if stun else -1,
+                  shield['x'] if shield else -1, shield['y'] if shield else -1,
+                  state.shield_active, state.shield_start_time, state.stun_shot_ready,
+                  DIRECTIONS.index(snake.direction), len(queue), *[DIRECTIONS.index(name) for name in queue],
+                  snake.pending_growth, snake.move_timer, snake.ammo, snake.last_shot, len(snake.body)]
+        for segment in snake.body:
+            values.extend(segment)
+        values.append(len(maze.food_cells))
+        for col, row in maze.food_cells:
+            values.append(row * maze.cols + col)
+        pools = [snake.bullets]
+        for enemy in state.enemies:
+            values += (enemy.x, enemy.y, enemy.health, enemy.stunned, enemy.stun_timer,
+                       enemy.shoot_timer, enemy.move_timer)
+            pools.append(enemy.bullets)
+
+        crc = zlib.crc32(struct.pack(f'<{len(values)}q', *values), self.cells_crc)
+        for pool in pools:
+            high = pool.high
+            crc = zlib.crc32(pool.alive[:high], crc)
+            crc = zlib.crc32(memoryview(pool.x)[:high], crc)
+            crc = zlib.crc32(memoryview(pool.y)[:high], crc)
+        return crc
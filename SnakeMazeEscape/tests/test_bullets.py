@@ -0,0 +1,94 @@
+import math
+import random
+
+import pytest
+
+from bullet_pool import BulletPool
+from maze import Maze
+
+SAMPLES = 2000  # Points tested along each segment by the brute-force sweep
+
+def blocked(maze, x, y):
+    col, row = math.floor(x / maze.CELL_SIZE), math.floor(y / maze.CELL_SIZE)
+    return not (0 <= col < maze.cols and 0 <= row < maze.rows) or maze.cells[row * maze.cols + col] == 1
+
+def brute_sweep(maze, x, y, dx, dy):
+    """Fraction along the segment of the first sampled point in a wall, or None"""
+    for sample in range(SAMPLES + 1):
+        t = sample / SAMPLES
+        if blocked(maze, x + t * dx, y + t * dy):
+            return t
+    return None
+
+def near_wall(maze, x, y, slack=0.01):
+    return any(blocked(maze, x + ox, y + oy) for ox in (-slack, slack) for oy in (-slack, slack))
+
+def segments(maze, seed, count=300):
+    rng = random.Random(seed)
+    size = maze.CELL_SIZE
+    open_cells = [(col, row) for row in range(maze.rows) for col in range(maze.cols)
+                  if not maze.cells[row * maze.cols + col]]
+    for _ in range(count):
+        col, row = rng.choice(open_cells)
+        x, y = col * size + rng.uniform(1, size - 1), row * size + rng.uniform(1, size - 1)
+        angle = rng.choice([0, 90, 180, 270, 45, 135, 225, 315, rng.uniform(0, 360)])
+        length = rng.uniform(5, 300)
+        yield x, y, length * math.cos(math.radians(angle)), length * math.sin(math.radians(angle))
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_sweep_matches_brute_force(seed):
+    maze = Maze(800, 600, random.Random(seed))
+    for x, y, dx, dy in segments(maze, seed):
+        t = maze.sweep(x, y, dx, dy)
+        expected = brute_sweep(maze, x, y, dx, dy)
+        if expected is not None:
+            # Never misses a wall the samples hit, and never stops after it
+            assert t is not None and t <= expected + 1e-9
+        if t is not None:
+            # Stops where the segment enters a wall (or grazes a corner), not before
+            assert not blocked(maze, x + max(0.0, t - 1e-6) * dx, y + max(0.0, t - 1e-6) * dy)
+            assert near_wall(maze, x + (t + 1e-6) * dx, y + (t + 1e-6) * dy)
+
+def test_slots_are_reused_and_the_pool_grows():
+    pool = BulletPool(capacity=4)
+    slots = [pool.spawn(10, 10, 1, 0) for _ in range(4)]
+    assert slots == [0, 1, 2, 3] and len(pool) == 4
+    pool.kill(1)
+    pool.kill(1)  # Killing twice is harmless
+    assert len(pool) == 3 and pool.live_slots() == [0, 2, 3]
+    assert pool.spawn(10, 10, 1, 0) == 1
+    assert pool.spawn(10, 10, 1, 0) == 4  # Full: the columns doubled
+    assert len(pool.alive) == 8 and len(pool) == 5
+    pool.clear()
+    assert len(pool) == 0 and pool.live_slots() == []
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_bullets_stop_at_walls(seed):
+    maze = Maze(800, 600, random.Random(seed))
+    rng = random.Random(seed)
+    pool = BulletPool()
+    for x, y, dx, dy in segments(maze, seed, 200):
+        scale = rng.uniform(2, 30) / math.hypot(dx, dy)  # 2 to 30 px per step: fast ones must not tunnel
+        pool.spawn(x, y, dx * scale, dy * scale)
+    for _ in range(400):
+        before = {slot: (pool.x[slot], pool.y[slot]) for slot in pool.live_slots()}
+        pool.update(maze)
+        # Every bullet still flying moved along a segment clear of walls
+        for slot in pool.live_slots():
+            x, y = before[slot]
+            assert maze.sweep(x, y, pool.x[slot] - x, pool.y[slot] - y) is None
+    assert len(pool) == 0
+
+def test_flights_are_retraced_when_walls_change():
+    maze = Maze(800, 600, random.Random(4))
+    row = next(row for row in range(1, maze.rows - 1)
+               if not maze.cells[row * maze.cols + 1] and not maze.cells[row * maze.cols + 2])
+    pool = BulletPool()
+    slot = pool.spawn(30, row * 20 + 10, 1, 0)
+    pool.update(maze)
+    assert pool.alive[slot]
+    maze.set_wall(3, row, 1)  # Close the corridor just ahead
+    for _ in range(40):
+        pool.update(maze)
+    assert not pool.alive[slot]
+    assert pool.x[slot] <= 3 * maze.CELL_SIZE
@@ -0,0 +1,37 @@
+import pytest
+
+from snake_env import SnakeEnv, VectorSnakeEnv, WALL, FOOD, EXIT, BODY, HEAD, GRID_COLS
+
+def expected_grid(state):
+    """Observation grid painted cell by cell, skipping anything off the maze"""
+    maze, snake = state.maze, state.snake
+    cols, rows, size = maze.cols, maze.rows, maze.CELL_SIZE
+    grid = [[WALL if maze.cells[row * cols + col] else 0 for col in range(cols)] for row in range(rows)]
+    for col, row in maze.food_cells:
+        grid[row][col] = FOOD
+    exit_col, exit_row = maze.exit_pos
+    grid[exit_row][exit_col] = EXIT
+    for x, y in list(snake.body) + [(snake.head_x, snake.head_y)]:
+        col, row = int(x) // size, int(y) // size
+        if 0 <= col < cols and 0 <= row < rows:
+            grid[row][col] = HEAD if (x, y) == (snake.head_x, snake.head_y) else BODY
+    return [code for row in grid for code in row]
+
+@pytest.mark.parametrize('mode', ['classic', 'normal'])
+@pytest.mark.parametrize('seed', [1, 2])
+def test_reset_observation_matches_the_maze(mode, seed):
+    env = SnakeEnv(mode, seed=seed)
+    observation = env.reset()
+    grid = list(bytes(observation['grid']))
+    assert grid == expected_grid(env.state)
+    # The starting tail hangs off the left edge and must not wrap onto the right border
+    assert any(x < 0 for x, y in env.state.snake.body)
+    assert grid[GRID_COLS - 1] == WALL
+
+def test_vector_envs_do_not_paint_into_each_other():
+    vector = VectorSnakeEnv(3, seed=7)
+    observations = vector.reset()
+    grids = bytes(observations['grid'])
+    size = len(grids) // 3
+    for index, env in enumerate(vector.envs):
+        assert list(grids[index * size:(index + 1) * size]) == expected_grid(env.state)
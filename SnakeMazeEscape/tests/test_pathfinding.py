@@ -0,0 +1,161 @@
+import random
+from collections import deque
+
+import pytest
+
+from enemy import Enemy, IncrementalPlanner
+from junction_graph import JunctionGraph
+from maze import Maze
+
+SIZE = 41  # Cells per side
+QUERIES = 40
+
+def loopy_maze(seed, openings=60):
+    """Generated maze with extra walls knocked out, so shortest paths are not unique"""
+    maze = Maze(SIZE * 20, SIZE * 20, random.Random(seed))
+    rng = random.Random(seed)
+    cols, cells = maze.cols, maze.cells
+    opened = 0
+    while opened < openings:
+        col, row = rng.randrange(1, maze.cols - 1), rng.randrange(1, maze.rows - 1)
+        index = row * cols + col
+        across = not cells[index - 1] and not cells[index + 1]
+        down = not cells[index - cols] and not cells[index + cols]
+        if cells[index] and (across or down):
+            maze.set_wall(col, row, 0)
+            opened += 1
+    return maze
+
+def distances_from(maze, start):
+    """Breadth-first step counts from a cell to every open cell"""
+    cols = maze.cols
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        col, row = queue.popleft()
+        for next_cell in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+            next_col, next_row = next_cell
+            if (next_cell not in distance and 0 <= next_col < cols and 0 <= next_row < maze.rows and
+                    not maze.cells[next_row * cols + next_col]):
+                distance[next_cell] = distance[(col, row)] + 1
+                queue.append(next_cell)
+    return distance
+
+def open_cells(maze):
+    return [(col, row) for row in range(maze.rows) for col in range(maze.cols)
+            if not maze.cells[row * maze.cols + col]]
+
+def queries(maze, seed):
+    rng = random.Random(seed)
+    cells = open_cells(maze)
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(QUERIES)]
+
+def assert_walkable(maze, start, target, path):
+    """path is a chain of open, adjacent cells from next to start up to target"""
+    previous = start
+    for col, row in path:
+        assert not maze.cells[row * maze.cols + col], f"path crosses wall {(col, row)}"
+        assert abs(col - previous[0]) + abs(row - previous[1]) == 1, f"path jumps {previous} -> {(col, row)}"
+        previous = (col, row)
+    assert previous == target
+
+def centre(maze, cell):
+    return cell[0] * maze.CELL_SIZE + maze.CELL_SIZE // 2, cell[1] * maze.CELL_SIZE + maze.CELL_SIZE // 2
+
+@pytest.mark.parametrize('use_landmarks', [False, True], ids=['manhattan', 'landmarks'])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_astar_finds_shortest_paths(seed, use_landmarks):
+    maze = loopy_maze(seed)
+    enemy = Enemy(0, 0)
+    enemy.USE_LANDMARKS = use_landmarks
+    for start, target in queries(maze, seed):
+        enemy.x, enemy.y = centre(maze, start)
+        path = enemy.find_path_to_target(*centre(maze, target), maze)
+        assert len(path) == distances_from(maze, start)[target]
+        assert_walkable(maze, start, target, path)
+
+@pytest.mark.parametrize('use_landmarks', [False, True], ids=['manhattan', 'landmarks'])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_astar_from_a_wall_cell_finds_shortest_paths(seed, use_landmarks):
+    # Enemies can spawn inside walls; the search then leaves through an open neighbour
+    maze = loopy_maze(seed)
+    enemy = Enemy(0, 0)
+    enemy.USE_LANDMARKS = use_landmarks
+    rng = random.Random(seed)
+    cols = maze.cols
+    walls = [(col, row) for row in range(maze.rows) for col in range(cols)
+             if maze.cells[row * cols + col] and maze.open_directions[row * cols + col]]
+    cells = open_cells(maze)
+    for _ in range(QUERIES):
+        start, target = rng.choice(walls), rng.choice(cells)
+        distance = distances_from(maze, target)
+        col, row = start
+        exits = [(col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)]
+        enemy.x, enemy.y = centre(maze, start)
+        path = enemy.find_path_to_target(*centre(maze, target), maze)
+        assert len(path) == 1 + min(distance[cell] for cell in exits if cell in distance)
+        assert_walkable(maze, start, target, path)
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_sliced_astar_matches_unsliced(seed):
+    maze = loopy_maze(seed)
+    enemy = Enemy(0, 0)
+    for start, target in queries(maze, seed):
+        enemy.x, enemy.y = centre(maze, start)
+        whole = enemy.find_path_to_target(*centre(maze, target), maze)
+        sliced = [result for result in enemy.search_path(*centre(maze, target), maze, slice_size=7)
+                  if result is not None]
+        assert sliced == [whole]
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_junction_graph_finds_shortest_paths(seed):
+    maze = loopy_maze(seed)
+    graph = maze.get_junction_graph()
+    assert graph.hierarchy is None  # Too few nodes for the region layer: every search is exact
+    for start, target in queries(maze, seed):
+        path = graph.find_path(*start, *target)
+        assert len(path) == distances_from(maze, start)[target]
+        if start != target:
+            assert_walkable(maze, start, target, path)
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_region_layer_finds_near_shortest_paths(seed, monkeypatch):
+    # Force the HPA* region layer onto the small test maze, with regions small enough
+    # that most queries are long range
+    monkeypatch.setattr(JunctionGraph, 'HIERARCHY_MIN_NODES', 0)
+    monkeypatch.setattr(JunctionGraph, 'REGION_SIZE', 8)
+    maze = loopy_maze(seed)
+    graph = maze.get_junction_graph()
+    assert graph.hierarchy is not None
+    long_range = 0
+    for start, target in queries(maze, seed):
+        if graph.hierarchy.is_long_range(start[1] * maze.cols + start[0], target[1] * maze.cols + target[0]):
+            long_range += 1
+        path = graph.find_path(*start, *target)
+        shortest = distances_from(maze, start)[target]
+        assert shortest <= len(path) <= 1.25 * shortest
+        if start != target:
+            assert_walkable(maze, start, target, path)
+    assert long_range > QUERIES // 2
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_planner_steps_along_shortest_paths(seed):
+    maze = loopy_maze(seed)
+    planner = IncrementalPlanner(maze)
+    rng = random.Random(seed)
+    cells = open_cells(maze)
+    enemy, snake = maze.exit_pos, maze.entrance_pos
+    for step in range(120):
+        if step % 40 == 20:
+            # Open a wall mid-chase: the planner must repair around the new edge
+            col, row = rng.randrange(1, maze.cols - 1), rng.randrange(1, maze.rows - 1)
+            maze.set_wall(col, row, 0)
+        if step % 10 == 0:
+            snake = rng.choice(cells)
+        if enemy == snake:
+            continue
+        distance = distances_from(maze, snake)
+        next_pos = planner.next_step(*enemy, *snake)
+        assert next_pos is not None
+        assert distance[next_pos] == distance[enemy] - 1, "step does not shorten the distance to the snake"
+        enemy = next_pos
@@ -0,0 +1,50 @@
+import pytest
+
+from game_state import GameState
+from replay import HASHES_SUFFIX, Replay, ReplayPlayer, ReplayRecorder, load_hashes
+from state_hash import StateHasher
+from test_snapshot import scripted_actions
+
+def record(mode, seed, ticks, hash_interval=None, **settings):
+    state = GameState(mode, 3, seed=seed, **settings)
+    recorder = ReplayRecorder(state, hash_interval)
+    for action in scripted_actions(seed, ticks):
+        if state.status != 'playing':
+            break
+        recorder.step(action)
+    return recorder
+
+@pytest.mark.parametrize('mode, settings', [
+    ('classic', {}),
+    ('normal', {}),
+    ('classic', {'difficulty': 'easy'}),
+    ('normal', {'width': 1600, 'height': 1200}),
+])
+def test_replay_reproduces_recorded_hashes(mode, settings):
+    recorder = record(mode, 8, 2400, **settings)
+    replay = Replay(recorder.to_bytes())
+    assert (replay.mode, replay.seed, replay.ticks) == (mode, 8, recorder.ticks)
+    assert len(recorder.hashes) == (recorder.ticks - 1) // recorder.hash_interval + 1
+    assert list(ReplayPlayer(replay).hashes(recorder.hash_interval)) == list(recorder.hashes)
+
+def test_seek_lands_on_the_recorded_state():
+    recorder = record('normal', 9, 2400, hash_interval=1)
+    player = ReplayPlayer(Replay(recorder.to_bytes()))
+    player.hashes()  # Plays through once, leaving a keyframe every KEYFRAME_SECONDS
+    for tick in (1300, 310, 2000, 0, 1299):
+        player.seek(tick)
+        assert player.state.tick == tick
+        assert StateHasher().hash(player.state) == recorder.hashes[tick]
+
+def test_golden_hashes_catch_a_desync(tmp_path):
+    recorder = record('normal', 10, 1800)
+    path = str(tmp_path / 'match.replay')
+    recorder.save(path)
+    interval, golden = load_hashes(path + HASHES_SUFFIX)
+    assert interval == recorder.hash_interval and len(golden) == 6  # Every 5 s of a 30 s match
+    assert list(ReplayPlayer(Replay.load(path)).hashes(interval)) == list(golden)
+
+    # Same inputs on another seed: the hashes must disagree from the first tick
+    other = Replay.load(path)
+    other.seed += 1
+    assert ReplayPlayer(other).hashes(interval)[0] != golden[0]
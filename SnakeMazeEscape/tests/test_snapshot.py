@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from game_state import GameState, NOOP, LEFT, RIGHT, UP, DOWN, SHOOT
+from snapshot import RewindBuffer, Snapshot, capture, restore
+from state_hash import StateHasher
+
+def scripted_actions(seed, ticks):
+    """Held directions that change every few ticks, with bursts of shooting"""
+    rng = random.Random(seed)
+    actions = []
+    while len(actions) < ticks:
+        action = rng.choice((NOOP, LEFT, RIGHT, UP, DOWN)) | (SHOOT if rng.random() < 0.3 else 0)
+        actions.extend([action] * rng.randrange(5, 40))
+    return actions[:ticks]
+
+def run(state, actions):
+    """Step through the actions and return the state hash before each tick"""
+    hasher, hashes = StateHasher(), []
+    for action in actions:
+        hashes.append(hasher.hash(state))
+        state.step(action)
+    return hashes
+
+@pytest.mark.parametrize('mode', ['classic', 'normal'])
+@pytest.mark.parametrize('seed', [4, 5])
+def test_restore_replays_the_same_future(mode, seed):
+    actions = scripted_actions(seed, 2400)
+    state = GameState(mode, 3, seed=seed)
+    run(state, actions[:900])  # Past the first enemy's spawn and head start
+    snapshot = capture(state)
+    future = run(state, actions[900:])
+
+    restore(state, snapshot)
+    assert run(state, actions[900:]) == future
+
+@pytest.mark.parametrize('seed', [4, 5])
+def test_restore_into_a_fresh_state(seed):
+    actions = scripted_actions(seed, 2400)
+    state = GameState('normal', 3, seed=seed)
+    run(state, actions[:1200])
+    snapshot = capture(state)
+
+    fresh = GameState('normal', 3, seed=seed)
+    restore(fresh, snapshot)
+    assert StateHasher().hash(fresh) == StateHasher().hash(state)
+    assert capture(fresh).to_bytes() == snapshot.to_bytes()
+    assert run(fresh, actions[1200:]) == run(state, actions[1200:])
+
+def test_snapshot_buffer_is_reused():
+    state = GameState('normal', 3, seed=6)
+    snapshot = Snapshot()
+    buffer = snapshot.buffer
+    for action in scripted_actions(6, 600):
+        state.step(action)
+        assert capture(state, snapshot) is snapshot
+    assert snapshot.buffer is buffer
+    assert snapshot.tick == state.tick
+
+def test_rewind_returns_to_an_earlier_tick():
+    actions = scripted_actions(7, 1500)
+    state = GameState('normal', 3, seed=7)
+    rewind = RewindBuffer(seconds=10, interval=5)
+    hashes = []
+    hasher = StateHasher()
+    for action in actions:
+        rewind.record(state)
+        hashes.append(hasher.hash(state))
+        state.step(action)
+
+    tick = rewind.rewind(state, 200)
+    assert tick is not None and tick <= len(actions) - 200
+    assert hasher.hash(state) == hashes[tick]
+    assert run(state, actions[tick:]) == hashes[tick:]
+    assert rewind.rewind(state, 100 * 60) is None  # Beyond the buffer's 10 seconds
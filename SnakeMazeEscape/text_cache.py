@@ -0,0 +1,38 @@
+import pygame
+from collections import OrderedDict
+
+class TextCache:
+    """Fonts keyed by size and rendered text Surfaces keyed by (text, size, colour).
+
+    Drawing code asks for the Surface of a string every frame; it is only
+    rasterised the first time (or after falling out of the cache), so a HUD
+    line re-renders when its value changes and never otherwise. The least
+    recently used Surfaces are evicted past MAX_SURFACES.
+    """
+
+    MAX_SURFACES = 256
+
+    def __init__(self, max_surfaces=None):
+        self.max_surfaces = max_surfaces or self.MAX_SURFACES
+        self.fonts = {}                  # size -> default pygame Font
+        self.surfaces = OrderedDict()    # (text, size, color) -> Surface, oldest first
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, size, color):
+        """Antialiased Surface of text in the default font"""
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.surfaces[key] = self.font(size).render(text, True, color)
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+TEXT = TextCache()  # Shared by the HUD, end screens and menus